@@ -0,0 +1,161 @@
+"""
+Ball list container for AutoBGA
+
+Created on: Oct 18, 2026
+Author: Tennessee Carmel-Veilleux (tcv -at- ro.boto.ca)
+Revision: $Rev$
+
+Copyright 2026 Tennessee Carmel-Veilleux
+
+Description:
+BallArray class holding the list of balls of a footprint (name, position
+and pad diameter of each ball) in NumPy columns, instead of a list of
+tuples. Rotated and filtered ball arrays share the columns they do not
+modify with the original, so the ball data is not copied at every stage
+between the naming/geometry stage and the plotters.
+
+License:
+Copyright (c) 2026, Tennessee Carmel-Veilleux
+All rights reserved.
+
+Redistribution and use in source and binary forms, with or without
+modification, are permitted provided that the following conditions are
+met:
+
+    * Redistributions of source code must retain the above copyright
+notice, this list of conditions and the following disclaimer.
+    * Redistributions in binary form must reproduce the above
+copyright notice, this list of conditions and the following disclaimer
+in the documentation and/or other materials provided with the
+distribution.
+    * Neither the name of SONIA AUV nor the names of its contributors
+may be used to endorse or promote products derived from this software
+without specific prior written permission.
+
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+"AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+(INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+"""
+import itertools
+import numpy
+
+class BallArray:
+    # Number of balls converted at once to Python objects when iterating
+    ITERATION_CHUNK = 1024
+    
+    def __init__(self, names, xPos, yPos, diameters):
+        """
+        Ball list built from sequences of ball "names", "xPos" and "yPos"
+        positions (mm) and pad "diameters" (mm). "diameters" may be a single
+        value shared by all balls, which is then stored without a
+        per-ball copy.
+        
+        Sequences that are already NumPy arrays of the right type are
+        used as-is (not copied).
+        """
+        self.names = numpy.asarray(names, dtype = str)
+        self.x = numpy.asarray(xPos, dtype = numpy.float64)
+        self.y = numpy.asarray(yPos, dtype = numpy.float64)
+        self.diameters = numpy.asarray(diameters, dtype = numpy.float64)
+        if self.diameters.ndim == 0:
+            self.diameters = numpy.broadcast_to(self.diameters, self.names.shape)
+            
+        if not (self.names.shape == self.x.shape == self.y.shape == self.diameters.shape):
+            raise ValueError("Ball array columns must all have the same length")
+    
+    @staticmethod
+    def fromTuples(balls):
+        """
+        Returns a BallArray built from a sequence of (name, x, y, diameter)
+        tuples.
+        """
+        balls = list(balls)
+        return BallArray([ball[0] for ball in balls], [ball[1] for ball in balls],
+                         [ball[2] for ball in balls], [ball[3] for ball in balls])
+    
+    def __len__(self):
+        return len(self.names)
+    
+    def __iter__(self):
+        """
+        Iterate over the balls as (name, x, y, diameter) tuples of Python
+        objects. Columns are converted in small chunks, so iterating does not
+        duplicate the whole ball list.
+        """
+        for start in xrange(0, len(self), self.ITERATION_CHUNK):
+            end = start + self.ITERATION_CHUNK
+            for ball in itertools.izip(self.names[start:end].tolist(), self.x[start:end].tolist(),
+                                       self.y[start:end].tolist(), self.diameters[start:end].tolist()):
+                yield ball
+    
+    def __getitem__(self, key):
+        """
+        Returns ball "key" as a (name, x, y, diameter) tuple if "key" is an
+        integer. Otherwise, "key" is a slice, index array or boolean mask
+        and a BallArray of the selected balls is returned (slices are views).
+        """
+        if isinstance(key, (int, long, numpy.integer)):
+            return (str(self.names[key]), float(self.x[key]), float(self.y[key]), float(self.diameters[key]))
+        
+        return BallArray(self.names[key], self.x[key], self.y[key], self.diameters[key])
+    
+    def __repr__(self):
+        return "BallArray(%s)" % repr(list(self))
+    
+    def equals(self, other):
+        """
+        Returns True if BallArray "other" holds the same balls, in the same order.
+        """
+        return (numpy.array_equal(self.names, other.names) and numpy.array_equal(self.x, other.x) and
+                numpy.array_equal(self.y, other.y) and numpy.array_equal(self.diameters, other.diameters))
+    
+    def rotated(self, rotation):
+        """
+        Returns a BallArray with all positions rotated by 2x2 "rotation"
+        matrix (around the origin). Names and diameters are shared with
+        this BallArray.
+        """
+        positions = numpy.dot(rotation, numpy.vstack((self.x, self.y)))
+        
+        # Adding 0.0 turns negative zeros into positive zeros, for cleaner output
+        return BallArray(self.names, positions[0] + 0.0, positions[1] + 0.0, self.diameters)
+    
+    def inserted(self, index, name, xPos, yPos, diameter):
+        """
+        Returns a BallArray with a new ball inserted before ball "index".
+        """
+        names = self.names
+        if len(name) > names.dtype.itemsize:
+            names = names.astype("S%d" % len(name))
+            
+        return BallArray(numpy.insert(names, index, name), numpy.insert(self.x, index, xPos),
+                         numpy.insert(self.y, index, yPos), numpy.insert(self.diameters, index, diameter))
+    
+    def deleted(self, index):
+        """
+        Returns a BallArray without ball "index".
+        """
+        return BallArray(numpy.delete(self.names, index), numpy.delete(self.x, index),
+                         numpy.delete(self.y, index), numpy.delete(self.diameters, index))
+    
+    def toRecords(self):
+        """
+        Returns a copy of the ball list as a NumPy structured array of
+        (name, x, y, diameter) records.
+        """
+        records = numpy.empty(len(self), dtype = [("name", self.names.dtype), ("x", numpy.float64),
+                                                  ("y", numpy.float64), ("diameter", numpy.float64)])
+        records["name"] = self.names
+        records["x"] = self.x
+        records["y"] = self.y
+        records["diameter"] = self.diameters
+        
+        return records
@@ -0,0 +1,333 @@
+"""
+Connected components ball detection for AutoBGA
+
+Created on: Oct 18, 2026
+Author: Tennessee Carmel-Veilleux (tcv -at- ro.boto.ca)
+Revision: $Rev$
+
+Copyright 2026 Tennessee Carmel-Veilleux
+
+Description:
+Alternative ball detection engine for GridLoader. Instead of measuring
+the fill of every bin and thresholding it, the dark pixels of the image are
+grouped in connected components (8-connectivity), each component's area,
+centroid and bounding box are computed, and the components are snapped to
+the bins of the ball grid they are centered in. A bin holds a ball if the
+components snapped to it are ball-sized and not line-like.
+
+Long horizontal and vertical lines (center lines, package outline) are
+removed before labeling, so that they don't merge the balls they cross.
+Components still spanning several bins (balls joined by short line
+segments, touching crossed balls) are split at the bin boundaries.
+
+Components are labeled with scipy.ndimage.label() when scipy is available.
+Otherwise, the image is run-length encoded and the runs touching each other
+on consecutive rows are merged with a vectorized union-find (hooking and
+pointer jumping), which never builds a label image. Both give the same
+components. All measurements are done on the runs, with numpy.
+
+License:
+Copyright (c) 2026, Tennessee Carmel-Veilleux
+All rights reserved.
+
+Redistribution and use in source and binary forms, with or without
+modification, are permitted provided that the following conditions are
+met:
+
+    * Redistributions of source code must retain the above copyright
+notice, this list of conditions and the following disclaimer.
+    * Redistributions in binary form must reproduce the above
+copyright notice, this list of conditions and the following disclaimer
+in the documentation and/or other materials provided with the
+distribution.
+    * Neither the name of SONIA AUV nor the names of its contributors
+may be used to endorse or promote products derived from this software
+without specific prior written permission.
+
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+"AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+(INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+"""
+import numpy
+
+try:
+    from scipy import ndimage
+except ImportError:
+    # Optional: components are then labeled by label_runs()
+    ndimage = None
+
+# Lines longer than this (in pitches) are removed before labeling
+MAX_LINE_LENGTH = 1.5
+
+# Smallest component kept, as a fraction of the pitch on both axis
+MIN_COMPONENT_SIZE = 0.15
+
+# Smallest ball, as a fraction of the pitch on both axis
+MIN_BALL_SIZE = 0.25
+
+# Smallest fraction of the rows of a ball that must span at least half of
+# its width. This rejects crosses and line segments, whose rows are narrow.
+MIN_WIDE_ROWS = 0.4
+
+def find_runs(binaryImage):
+    """
+    Run-length encode the True pixels of 2D boolean array "binaryImage".
+
+    Returns (rows, starts, ends) integer arrays: run i covers columns
+    starts[i] to ends[i] - 1 of row rows[i]. Runs are in row-major order.
+    """
+    sy, sx = binaryImage.shape
+    padded = numpy.zeros((sy, sx + 2), numpy.int8)
+    padded[:, 1:-1] = binaryImage
+
+    # Starts and ends of runs alternate along every row. Searching the
+    # flattened array is much faster than a 2D numpy.nonzero().
+    changes = numpy.flatnonzero(numpy.diff(padded, axis = 1))
+    rows, columns = numpy.divmod(changes, sx + 1)
+
+    return (rows[0::2], columns[0::2], columns[1::2])
+
+def remove_lines(binaryImage, maxWidth, maxHeight):
+    """
+    Clear, in place, the vertical runs of "binaryImage" longer than
+    "maxHeight" pixels and then the horizontal runs longer than "maxWidth"
+    pixels.
+
+    Returns the runs of the cleaned image (see find_runs()).
+    """
+    columns, starts, ends = find_runs(numpy.ascontiguousarray(binaryImage.T))
+    for idx in numpy.nonzero((ends - starts) > maxHeight)[0]:
+        binaryImage[starts[idx]:ends[idx], columns[idx]] = False
+
+    rows, starts, ends = find_runs(binaryImage)
+    isLine = (ends - starts) > maxWidth
+    for idx in numpy.nonzero(isLine)[0]:
+        binaryImage[rows[idx], starts[idx]:ends[idx]] = False
+
+    return (rows[~isLine], starts[~isLine], ends[~isLine])
+
+def link_runs(rows, starts, ends, width):
+    """
+    Returns (a, b), the indices of all pairs of runs (see find_runs()) of
+    an image "width" pixels wide that touch each other (8-connectivity),
+    run b being on the row above run a.
+
+    Runs are sorted, so the runs of the row above touching a run are a
+    contiguous range, found by binary search for all runs at once.
+    """
+    rowKeys = rows * (width + 2)
+    startKeys = rowKeys + starts
+    endKeys = rowKeys + ends
+
+    # Run b touches run a if start(b) <= end(a) and end(b) >= start(a),
+    # with exclusive ends
+    aboveKeys = rowKeys - (width + 2)
+    first = numpy.searchsorted(endKeys, aboveKeys + starts, "left")
+    last = numpy.searchsorted(startKeys, aboveKeys + ends, "right")
+    counts = numpy.maximum(last - first, 0)
+
+    a = numpy.repeat(numpy.arange(len(rows)), counts)
+    offsets = numpy.arange(len(a)) - numpy.repeat(numpy.cumsum(counts) - counts, counts)
+    b = first[a] + offsets
+
+    return (a, b)
+
+def label_runs(rows, starts, ends, width):
+    """
+    Group the runs (see find_runs()) of an image "width" pixels wide in
+    connected components (8-connectivity), with a vectorized union-find.
+
+    Every run starts as its own tree. Until all touching runs have the
+    same root, the roots of each touching pair are hooked, the larger
+    under the smaller, and all paths are compressed by pointer jumping.
+
+    Returns an array of the component number (0 to nComponents - 1) of
+    every run.
+    """
+    a, b = link_runs(rows, starts, ends, width)
+    labels = numpy.arange(len(rows))
+
+    while True:
+        labelA = labels[a]
+        labelB = labels[b]
+        different = labelA != labelB
+        if not numpy.any(different):
+            break
+
+        # Hook every root to the smallest root it touches
+        high = numpy.maximum(labelA, labelB)[different]
+        low = numpy.minimum(labelA, labelB)[different]
+        order = numpy.lexsort((low, high))
+        high = high[order]
+        low = low[order]
+        isFirst = numpy.concatenate(([True], high[1:] != high[:-1]))
+        labels[high[isFirst]] = numpy.minimum(labels[high[isFirst]], low[isFirst])
+
+        # Pointer jumping, until every run points to its root
+        while True:
+            parents = labels[labels]
+            if numpy.array_equal(parents, labels):
+                break
+            labels = parents
+
+    return numpy.unique(labels, return_inverse = True)[1]
+
+def label_components(binaryImage, rows, starts, ends):
+    """
+    Label the connected components (8-connectivity) of "binaryImage",
+    whose runs are "rows", "starts" and "ends" (see find_runs()).
+
+    Returns the component number (0 to nComponents - 1) of every run.
+    scipy.ndimage is used if available, else label_runs().
+    """
+    if len(rows) == 0:
+        return rows
+
+    if ndimage is not None:
+        labels, nComponents = ndimage.label(binaryImage, numpy.ones((3, 3), bool))
+        return labels[rows, starts] - 1
+
+    return label_runs(rows, starts, ends, binaryImage.shape[1])
+
+def split_runs(rows, starts, ends, xEdges):
+    """
+    Split the runs (see find_runs()) crossing the bin boundaries "xEdges".
+
+    Returns (runIdx, starts, ends, xIdx): the index of the original run
+    of every piece, the extent of the piece and the column of bins it
+    lies in.
+    """
+    first = numpy.searchsorted(xEdges, starts, "right") - 1
+    last = numpy.searchsorted(xEdges, ends - 1, "right") - 1
+    counts = last - first + 1
+
+    runIdx = numpy.repeat(numpy.arange(len(rows)), counts)
+    offsets = numpy.arange(len(runIdx)) - numpy.repeat(numpy.cumsum(counts) - counts, counts)
+    xIdx = first[runIdx] + offsets
+    pieceStarts = numpy.maximum(starts[runIdx], xEdges[xIdx])
+    pieceEnds = numpy.minimum(ends[runIdx], xEdges[xIdx + 1])
+
+    return (runIdx, pieceStarts, pieceEnds, xIdx)
+
+def measure_groups(groups, nGroups, rows, starts, ends):
+    """
+    Returns (area, centerX, centerY, xmin, xmax, ymin, ymax) arrays of the
+    area, centroid and inclusive bounding box of the runs (see
+    find_runs()) of each of "nGroups" groups, "groups" being the group
+    number of every run. Empty groups have a null area and xmin > xmax.
+    """
+    lengths = (ends - starts).astype(numpy.float64)
+    area = numpy.bincount(groups, lengths, nGroups)
+    safeArea = numpy.maximum(area, 1)
+    centerX = numpy.bincount(groups, lengths * (starts + ends) / 2.0, nGroups) / safeArea
+    centerY = numpy.bincount(groups, lengths * (rows + 0.5), nGroups) / safeArea
+
+    xmin = numpy.zeros(nGroups, numpy.intp)
+    xmax = numpy.zeros(nGroups, numpy.intp) - 1
+    ymin = numpy.zeros(nGroups, numpy.intp)
+    ymax = numpy.zeros(nGroups, numpy.intp) - 1
+    if len(groups):
+        order = numpy.argsort(groups, kind = "mergesort")
+        groups = groups[order]
+        present = numpy.nonzero(numpy.concatenate(([True], groups[1:] != groups[:-1])))[0]
+        xmin[groups[present]] = numpy.minimum.reduceat(starts[order], present)
+        xmax[groups[present]] = numpy.maximum.reduceat(ends[order], present) - 1
+        ymin[groups[present]] = numpy.minimum.reduceat(rows[order], present)
+        ymax[groups[present]] = numpy.maximum.reduceat(rows[order], present)
+
+    return (area, centerX, centerY, xmin, xmax, ymin, ymax)
+
+def detect_balls(binaryImage, xEdges, yEdges):
+    """
+    Find the balls of "binaryImage" (True for dark pixels), whose bins have
+    pixel boundaries "xEdges" and "yEdges" (see GridUtils.BinGrid) within
+    the image. "binaryImage" is modified: lines are removed from it.
+
+    Components are snapped to the bin containing their centroid. Components
+    spanning more than MAX_LINE_LENGTH pitches (balls joined by a line
+    segment, or touching crossed balls) are first split at the bin
+    boundaries, each piece being snapped to its own bin.
+
+    Returns (bgaArray, contents, xSpread, ySpread, score), (ny, nx) arrays
+    holding the detected balls, and for every bin the fraction of its pixels
+    and of its width and height covered by the components snapped to it,
+    and its ball score: the smallest ratio of the bin's measurements to
+    their minimum for a ball (MIN_BALL_SIZE and MIN_WIDE_ROWS). Balls have
+    a score of 1 or more.
+    """
+    nx = len(xEdges) - 1
+    ny = len(yEdges) - 1
+    nBins = nx * ny
+    binWidths = numpy.diff(xEdges).astype(numpy.float64)
+    binHeights = numpy.diff(yEdges).astype(numpy.float64)
+    pitchX = numpy.median(binWidths)
+    pitchY = numpy.median(binHeights)
+
+    rows, starts, ends = remove_lines(binaryImage, MAX_LINE_LENGTH * pitchX, MAX_LINE_LENGTH * pitchY)
+    components = label_components(binaryImage, rows, starts, ends)
+    nComponents = int(numpy.max(components)) + 1 if len(components) else 0
+
+    # Split oversized components at the bin boundaries: their pieces
+    # become groups of their own, numbered after the components
+    area, centerX, centerY, xmin, xmax, ymin, ymax = measure_groups(components, nComponents, rows, starts, ends)
+    oversized = (((xmax - xmin + 1) > MAX_LINE_LENGTH * pitchX) |
+                 ((ymax - ymin + 1) > MAX_LINE_LENGTH * pitchY))
+    isSplit = oversized[components] if len(components) else components.astype(bool)
+    runIdx, pieceStarts, pieceEnds, pieceX = split_runs(rows[isSplit], starts[isSplit], ends[isSplit], xEdges)
+    pieceRows = rows[isSplit][runIdx]
+    pieceY = numpy.searchsorted(yEdges, pieceRows, "right") - 1
+    pieceKeys = components[isSplit][runIdx] * nBins + pieceY * nx + pieceX
+    pieceIds, pieceGroups = numpy.unique(pieceKeys, return_inverse = True)
+
+    isWhole = ~isSplit
+    groups = numpy.concatenate((components[isWhole], nComponents + pieceGroups))
+    rows = numpy.concatenate((rows[isWhole], pieceRows))
+    starts = numpy.concatenate((starts[isWhole], pieceStarts))
+    ends = numpy.concatenate((ends[isWhole], pieceEnds))
+    nGroups = nComponents + len(pieceIds)
+
+    # Snap groups to the bin containing their centroid, dropping specks
+    # and groups outside of the grid. Oversized components have no runs
+    # left, so they are dropped as well.
+    area, centerX, centerY, xmin, xmax, ymin, ymax = measure_groups(groups, nGroups, rows, starts, ends)
+    xIdx = numpy.searchsorted(xEdges, centerX, "right") - 1
+    yIdx = numpy.searchsorted(yEdges, centerY, "right") - 1
+    kept = ((xIdx >= 0) & (xIdx < nx) & (yIdx >= 0) & (yIdx < ny) &
+            ((xmax - xmin + 1) >= MIN_COMPONENT_SIZE * pitchX) &
+            ((ymax - ymin + 1) >= MIN_COMPONENT_SIZE * pitchY))
+    groupBins = numpy.where(kept, numpy.clip(yIdx, 0, ny - 1) * nx + numpy.clip(xIdx, 0, nx - 1), -1)
+
+    # Measure the runs of every bin
+    runBins = groupBins[groups]
+    isKept = runBins >= 0
+    runBins = runBins[isKept]
+    rows, starts, ends = rows[isKept], starts[isKept], ends[isKept]
+    binArea, centerX, centerY, xmin, xmax, ymin, ymax = measure_groups(runBins, nBins, rows, starts, ends)
+    binBallWidth = numpy.maximum(xmax - xmin + 1, 0)
+    binBallHeight = numpy.maximum(ymax - ymin + 1, 0)
+
+    # Count the rows of every bin spanning at least half of its width
+    rowIds, rowGroups = numpy.unique(runBins.astype(numpy.int64) * binaryImage.shape[0] + rows, return_inverse = True)
+    rowArea, rowX, rowY, rowXmin, rowXmax, rowYmin, rowYmax = measure_groups(rowGroups, len(rowIds), rows, starts, ends)
+    rowBins = rowIds // binaryImage.shape[0]
+    isWide = (rowXmax - rowXmin + 1) >= 0.5 * binBallWidth[rowBins]
+    wideRows = numpy.bincount(rowBins, isWide, nBins) / numpy.maximum(binBallHeight, 1)
+
+    xSpread = binBallWidth.reshape(ny, nx) / binWidths[numpy.newaxis, :]
+    ySpread = binBallHeight.reshape(ny, nx) / binHeights[:, numpy.newaxis]
+    contents = binArea.reshape(ny, nx) / numpy.outer(binHeights, binWidths)
+    wideRows = wideRows.reshape(ny, nx)
+    bgaArray = ((xSpread >= MIN_BALL_SIZE) & (ySpread >= MIN_BALL_SIZE) &
+                (wideRows >= MIN_WIDE_ROWS))
+    score = numpy.minimum(numpy.minimum(xSpread, ySpread) / MIN_BALL_SIZE, wideRows / MIN_WIDE_ROWS)
+
+    return (bgaArray, contents.astype(numpy.float32), xSpread.astype(numpy.float32), ySpread.astype(numpy.float32),
+            score.astype(numpy.float32))
@@ -1,58 +1,58 @@
-#!/bin/env python
-# -*- coding: cp1252 -*-
-"""
-Simple HtmlWindow that redirects all web links (http://)
-to a new browser instance.
-
-Created on: 7/09/2010
-Author: Tennessee Carmel-Veilleux (tcv -at- ro.boto.ca)
-Revision: $Rev$
-
-Copyright 2010 Tennessee Carmel-Veilleux
-
-Description: 
-Simple HtmlWindow that redirects all web links (http://)
-to a new browser instance.
-
-License:
-Copyright (c) 2010, Tennessee Carmel-Veilleux
-All rights reserved.
-
-Redistribution and use in source and binary forms, with or without 
-modification, are permitted provided that the following conditions are 
-met:
-
-    * Redistributions of source code must retain the above copyright 
-notice, this list of conditions and the following disclaimer.
-    * Redistributions in binary form must reproduce the above 
-copyright notice, this list of conditions and the following disclaimer 
-in the documentation and/or other materials provided with the 
-distribution.
-    * Neither the name of SONIA AUV nor the names of its contributors 
-may be used to endorse or promote products derived from this software 
-without specific prior written permission.
-
-THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS 
-"AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT 
-LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR 
-A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT 
-HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, 
-SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT 
-LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, 
-DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY 
-THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT 
-(INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE 
-OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
-"""
-import wx.html as html
-import webbrowser
-
-class ExternalBrowserHtmlWindow(html.HtmlWindow):
-    def __init__(self, parent, id, pos, size, style):
-        html.HtmlWindow.__init__(self, parent, id, pos, size, style)
-    
-    def OnLinkClicked(self, link):
-        if link.GetHref().startswith("http://"):
-            webbrowser.open_new_tab(link.GetHref())
-        else:
-            html.HtmlWindow.OnLinkClicked(self, link)
+#!/bin/env python
+# -*- coding: cp1252 -*-
+"""
+Simple HtmlWindow that redirects all web links (http://)
+to a new browser instance.
+
+Created on: 7/09/2010
+Author: Tennessee Carmel-Veilleux (tcv -at- ro.boto.ca)
+Revision: $Rev$
+
+Copyright 2010 Tennessee Carmel-Veilleux
+
+Description: 
+Simple HtmlWindow that redirects all web links (http://)
+to a new browser instance.
+
+License:
+Copyright (c) 2010, Tennessee Carmel-Veilleux
+All rights reserved.
+
+Redistribution and use in source and binary forms, with or without 
+modification, are permitted provided that the following conditions are 
+met:
+
+    * Redistributions of source code must retain the above copyright 
+notice, this list of conditions and the following disclaimer.
+    * Redistributions in binary form must reproduce the above 
+copyright notice, this list of conditions and the following disclaimer 
+in the documentation and/or other materials provided with the 
+distribution.
+    * Neither the name of SONIA AUV nor the names of its contributors 
+may be used to endorse or promote products derived from this software 
+without specific prior written permission.
+
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS 
+"AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT 
+LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR 
+A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT 
+HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, 
+SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT 
+LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, 
+DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY 
+THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT 
+(INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE 
+OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+"""
+import wx.html as html
+import webbrowser
+
+class ExternalBrowserHtmlWindow(html.HtmlWindow):
+    def __init__(self, parent, id, pos, size, style):
+        html.HtmlWindow.__init__(self, parent, id, pos, size, style)
+    
+    def OnLinkClicked(self, link):
+        if link.GetHref().startswith("http://"):
+            webbrowser.open_new_tab(link.GetHref())
+        else:
+            html.HtmlWindow.OnLinkClicked(self, link)
@@ -1,308 +1,730 @@
-#!/usr/bin/python
-# -*- coding: cp1252 -*-
-"""
-Image processing core library for AutoBGA
-
-Created on: 7/09/2010
-Author: Tennessee Carmel-Veilleux (tcv -at- ro.boto.ca)
-Revision: $Rev$
-
-Copyright 2010 Tennessee Carmel-Veilleux
-
-Description: 
-This module contains the GridLoader class which does the bulk of the
-image processing necessary to extract the grid of balls that are
-actually present on a BGA.
-
-License:
-Copyright (c) 2010, Tennessee Carmel-Veilleux
-All rights reserved.
-
-Redistribution and use in source and binary forms, with or without 
-modification, are permitted provided that the following conditions are 
-met:
-
-    * Redistributions of source code must retain the above copyright 
-notice, this list of conditions and the following disclaimer.
-    * Redistributions in binary form must reproduce the above 
-copyright notice, this list of conditions and the following disclaimer 
-in the documentation and/or other materials provided with the 
-distribution.
-    * Neither the name of SONIA AUV nor the names of its contributors 
-may be used to endorse or promote products derived from this software 
-without specific prior written permission.
-
-THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS 
-"AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT 
-LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR 
-A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT 
-HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, 
-SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT 
-LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, 
-DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY 
-THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT 
-(INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE 
-OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
-"""
-
-import Image
-import ImageChops
-import ImageDraw
-import os
-from numpy import array,zeros,dtype,sum,reshape,histogram,max,nonzero
-from numpy import nonzero,logical_and,arange,round,mean,asarray, isnan
-import math
-import warnings
-from GridUtils import *
-
-class GridLoader:
-    def __init__(self, nx, ny, filename):
-        self.nx = nx
-        self.ny = ny
-        self.filename = filename
-        self.contents = zeros((ny, nx),dtype("Float32"))
-        self.xSpread = zeros((ny, nx),dtype("Float32"))
-        self.ySpread = zeros((ny, nx),dtype("Float32"))
-        self.bgaArray = zeros((ny, nx),dtype("Float32"))
-
-    def analyzeBin(self, binData):
-        """
-        Calculates pixel contents, x spread and y spread based on a single bin
-        of data.
-        """
-
-        binaryBin = binData > 127
-
-        height, width = binData.shape
-        nPixels = width * height
-
-        # Calculate spread by "flattening" in each axis
-        xSpread = 0
-        ySpread = 0
-        xSpreadMask = zeros((1,width))
-        ySpreadMask = zeros((height,1))
-
-        for y in range(height):
-            xSpreadMask[0,:] += binaryBin[y,:]
-
-        for x in range(width):
-            ySpreadMask[:,0] += binaryBin[:,x]
-
-        xSpread = float(sum(xSpreadMask[0,:] > 1)) / width
-        ySpread = float(sum(ySpreadMask[:,0] > 1)) / height
-
-        # Find number of pixels enabled in bin
-        contents = float(sum(sum(binaryBin))) / nPixels
-
-        return (xSpread, ySpread, contents)
-        #print "xSpread=%d, ySpread=%d, contents=%d" % (xSpread, ySpread, contents)
-
-    def eliminateCross(self, binData):
-        """
-        Blank-out horizontal and vertical crosslines by
-        detecting rows or columns with more than 80% of their
-        pixels lit and clearing them. When the dimension being
-        checked has more than 20 pixels, turn the threshold down to
-        50%.
-        
-        Returns: a new clean bin data array
-        """
-        height, width = binData.shape
-        
-        hThreshold = height >= 20 and 0.5 or 0.8
-        wThreshold = width >= 20 and 0.5 or 0.8
-        
-        newBinData = binData.copy()
-        binaryBin = newBinData > 127
-        
-        for vLineIdx in range(width):
-            if sum(binaryBin[:,vLineIdx]) > (float(height) * hThreshold):
-                newBinData[:,vLineIdx] = 0
-
-        for hLineIdx in range(height):
-            if sum(binaryBin[hLineIdx,:]) > (float(width) * wThreshold):
-                newBinData[hLineIdx,:] = 0
-                
-        return newBinData
-
-    def extractBins(self):
-        """
-        Extract the data for all bins. Bins are rectangles whose
-        sizes are approximately (imageSize / nBalls) in each dimension.
-
-        For each bin, we determine the "spread" in X and Y and the number
-        of black pixels (contents). The spread is the extent of black pixel
-        within the bin, inconsiderate of the shape.
-
-        All values extracted are normalized so that bins of different sizes
-        (because of non-integer pixels/bin) don't affect the result.
-        """
-        # Analyze all bins
-        for xIdx in range(self.nx):
-            for yIdx in range(self.ny):
-                # Extract bin from image
-                xmin, ymin, xmax, ymax = get_bin_bounds(self.image, self.nx, self.ny, xIdx, yIdx)                
-                binData = asarray(self.image.crop((xmin, ymin, xmax+1, ymax+1)))
-
-                # Calculate spread and contents (number of black pixels)
-                xSpread, ySpread, contents = self.analyzeBin(binData)
-                
-                # Eliminate center alignment crosses that could be in
-                # empty bin
-                #if xSpread >= 0.8 or ySpread >= 0.8:
-                binData = self.eliminateCross(binData)
-                
-                # Recalculate values
-                xSpread, ySpread, contents = self.analyzeBin(binData)
-
-                # Eliminate bins containing only either horizontal or 
-                # vertical line segments
-                if xSpread < 0.2 or ySpread < 0.2:
-                    contents = 0
-                                        
-                # Save data
-                self.contents[yIdx, xIdx] = contents
-                self.xSpread[yIdx, xIdx] = xSpread
-                self.ySpread[yIdx, xIdx] = ySpread
-
-    def getThresholdOtsu(self, contents):
-        """
-        Optimal thresholding using Otsu's method.
-        Algorithm described in Gonzalez and Woods, "Digital Image Processing, 3rd ed",
-        Prentice Hall, p742-746.
-        """
-        N, M = contents.shape	
-        flatContents = reshape(contents, (1,(N * M)))
-        n = N * M
-
-        (H, bins) = histogram(flatContents[0,:],64)
-        H = H * 1.0
-
-        lmax = max(flatContents[0,:])
-
-        # tape 1: calcul de l'histogramme normalis
-        hist_pi = (H / (M * N))
-
-        # tape 4: Calcul de m_g (eq 10.3-9)
-        m_g = sum(arange(64) * hist_pi)
-
-        p1_k = zeros((1,64), dtype("Float32"))
-        m_k = zeros((1,64), dtype("Float32"))
-        var_B = zeros((1,64), dtype("Float32"))
-
-        for k in range(64):
-            # tape 2: Calcul de p1(k) (eq 10.3-4)
-            a = sum(hist_pi[0:k])
-            p1_k[0,k] = a
-
-            # tape 3: Calcul de m(k) (eq 10.3-8)
-            m_k[0,k] = sum(arange(k) * hist_pi[0:k])
-
-        # tape 5: Calcul de var_B(k) (eq 10.3-17)
-        denom = (p1_k * (1-p1_k))
-        denom[nonzero(denom == 0)] = 1 # limination des dnominateurs nuls
-        var_B = ((m_g * p1_k - m_k) ** 2.0) / denom
-
-
-        # tape 6: Calcul de k*  partir des maxima de var_B
-        maxval = max(max(var_B));
-        maxidx = nonzero(logical_and(var_B >= (maxval * 0.99999), var_B <= (maxval * 1.00001)))[1]
-
-        k_star = round(mean(maxidx-1))/n;
-        return k_star
-    
-    def getThresholdGonz(self, contents):
-        """
-        Basic Global Thresholding.
-        
-        Algorithm described in Gonzalez and Woods, Digital Image Processing, 2nd ed,
-        Prentice Hall, p599-600.
-        """
-        N, M = contents.shape
-        #print contents
-        delta = 1000000.0
-        nTrials = 0
-        previous = 1000000.0
-
-        # Step 1: Select an initial estimate for threshold
-        threshold = 0.5
-        
-        flatContents = reshape(contents, (1,(N * M)))
-        
-        while delta > 0.01 and nTrials < 100:
-            # Step 2: Segment image yusng threshold in two groups G1 and G2
-            G1 = flatContents[nonzero(flatContents > threshold)]
-            G2 = flatContents[nonzero(flatContents <= threshold)]
-            
-            # Step 3: Compute average levels mu1 and mu2
-            mu1 = mean(G1)
-            mu2 = mean(G2)
-            
-            if isnan(mu1): mu1 = 0.0
-            if isnan(mu2): mu2 = 0.0
-            
-            # Step 4: Compute new threshold
-            newThreshold = 0.5 * (mu1 + mu2)
-            
-            # Determine new loop conditions for continued iteration of estimation
-            nTrials += 1
-            delta = abs(newThreshold - threshold)
-            #print nTrials, mu1, mu2, threshold, newThreshold, delta
-            threshold = newThreshold
-            
-        return newThreshold
-
-    def extractArrayFromBins(self):
-        """
-        Convert the pixel-counting bins to a BGA array by thresholding
-        the bins to figure-out which ones have balls and which don't.
-        
-        A heuristic (described below) is used to select one of two
-        thresholding method. A boolean numpy array is returned, with
-        True values being the positions occupied by balls.
-        """
-        sx, sy = self.image.size
-        nBinsX, nBinsY = self.contents.shape
-        
-        # For images with less than 10 pixels of width or height per bin,
-        # we use Otsu's method. It usually leads to better results in that
-        # case. For more pixels, we use global thresholding, as described by
-        # Gonzalez and Woods (see getThresholdGonz method for ref).
-        if ((float(sx) / nBinsX) <= 10) or ((float(sy) / nBinsY) <= 10):
-            threshold = self.getThresholdOtsu(self.contents)
-        else:
-            threshold = self.getThresholdGonz(self.contents)
-        
-        # Binarize bins array according to threshold
-        self.bgaArray = self.contents >= threshold
-                
-    def process(self):
-        # Try to open image and convert it to black and white
-        try:
-            self.image = ImageChops.invert(Image.open(self.filename).convert("L"))
-        except IOError(e):
-            return (False, str(e), None, None)
-        
-        sx, sy = self.image.size
-        
-        # Extract bins to internal data structures
-        self.extractBins()
-
-        # Extract BGA array geometry from bins
-        self.extractArrayFromBins()
-        
-        return (True, "", self.bgaArray.copy(), self.image)
-
-                #print "Bin (%d, %d): (%d %d)-(%d %d), w=%d, h=%d, n=%d" % (xIdx, yIdx, xmin, ymin, xmax, ymax, width, height, (width * height))
-                #if xIdx == yIdx == 0:
-                    #for py in range(height):
-                        #for px in range(width):
-                            #if binData[py,px] > 127:
-                                #print " ",
-                            #else:
-                                #print "#",
-                        #print
-
-if __name__ == "__main__":
-    loader = GridLoader(45,45,"C:\\Users\\veilleux\\Desktop\\Dossiers Ouverts\\autobga\\bga2.png")
+#!/usr/bin/python
+# -*- coding: cp1252 -*-
+"""
+Image processing core library for AutoBGA
+
+Created on: 7/09/2010
+Author: Tennessee Carmel-Veilleux (tcv -at- ro.boto.ca)
+Revision: $Rev$
+
+Copyright 2010 Tennessee Carmel-Veilleux
+
+Description: 
+This module contains the GridLoader class which does the bulk of the
+image processing necessary to extract the grid of balls that are
+actually present on a BGA.
+
+License:
+Copyright (c) 2010, Tennessee Carmel-Veilleux
+All rights reserved.
+
+Redistribution and use in source and binary forms, with or without 
+modification, are permitted provided that the following conditions are 
+met:
+
+    * Redistributions of source code must retain the above copyright 
+notice, this list of conditions and the following disclaimer.
+    * Redistributions in binary form must reproduce the above 
+copyright notice, this list of conditions and the following disclaimer 
+in the documentation and/or other materials provided with the 
+distribution.
+    * Neither the name of SONIA AUV nor the names of its contributors 
+may be used to endorse or promote products derived from this software 
+without specific prior written permission.
+
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS 
+"AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT 
+LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR 
+A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT 
+HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, 
+SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT 
+LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, 
+DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY 
+THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT 
+(INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE 
+OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+"""
+
+import Image
+import ImageChops
+import ImageDraw
+import hashlib
+import os
+import StringIO
+from numpy import array,zeros,dtype,sum,reshape,histogram,max,nonzero
+from numpy import nonzero,logical_and,arange,round,mean,asarray, isnan
+from numpy import add,diff,outer,newaxis,int32,logical_or,where,repeat
+import math
+import warnings
+import Instrumentation
+from GridUtils import *
+from GridRegistration import register_grid
+from ConnectedComponents import detect_balls
+from Thresholding import histograms, iterative_mean_thresholds, otsu_histograms, otsu_multilevel, threshold_confidence
+
+class ProcessingCancelled(Exception):
+    """
+    Raised internally when processing is cancelled through the
+    GridLoader's cancelEvent.
+    """
+    pass
+
+class GridLoader:
+    # Version of the analysis results. Increment it whenever a change to
+    # the analysis changes its results, to invalidate cached results.
+    ANALYSIS_VERSION = 5
+    
+    # Images with more pixels than this are memory-mapped from a raw
+    # grayscale file instead of being decoded in memory (see decodeImage())
+    MAPPED_IMAGE_PIXELS = 4096 * 4096
+    
+    # Images with at least twice this many pixels per bin are downscaled
+    # before analysis (see prescaleImage())
+    MIN_PIXELS_PER_BIN = 20
+    
+    # Crosslines are at most this fraction of a bin wide (or high). Wider
+    # runs of dark columns (or rows) in a bin are a solid ball, which
+    # eliminateCross() must not blank-out.
+    MAX_CROSSLINE_FRACTION = 0.25
+    
+    # Analysis engines: "bins" thresholds the fill of every bin (see
+    # extractBins()), "components" measures the connected components of
+    # dark pixels (see extractBallsFromComponents())
+    ENGINES = ("bins", "components")
+    
+    def __init__(self, nx, ny, filename, progressCallback = None, cancelEvent = None, cache = None,
+                 autoRegister = True, engine = "bins", prescale = True):
+        """
+        Loader for a "nx" x "ny" BGA ball array in image "filename".
+        
+        If "progressCallback" is given, it is called as
+        progressCallback(rowsDone, nRows) after every row of bins is analyzed.
+        If "cancelEvent" is given (ie: a threading.Event), processing stops
+        as soon as possible once it is set, and process() reports failure.
+        If "cache" is given (a ResultCache), analysis results are looked-up
+        in and saved to it.
+        If "autoRegister" is True, the ball grid is located in the image
+        (see registerGrid()), so that images not cropped exactly to the
+        ball array can be analyzed. Otherwise, the image is split evenly.
+        "engine" is the analysis engine, one of GridLoader.ENGINES.
+        If "prescale" is True, images with more pixels per bin than the
+        analysis needs are downscaled first (see prescaleImage()).
+        """
+        if engine not in self.ENGINES:
+            raise ValueError("Unknown analysis engine '%s', expected one of %s" % (engine, ", ".join(self.ENGINES)))
+        
+        self.nx = nx
+        self.ny = ny
+        self.filename = filename
+        self.progressCallback = progressCallback
+        self.cancelEvent = cancelEvent
+        self.cache = cache
+        self.autoRegister = autoRegister
+        self.engine = engine
+        self.prescale = prescale
+        self.scale = 1
+        self.contents = zeros((ny, nx),dtype("Float32"))
+        self.xSpread = zeros((ny, nx),dtype("Float32"))
+        self.ySpread = zeros((ny, nx),dtype("Float32"))
+        self.bgaArray = zeros((ny, nx),dtype("Float32"))
+        self.confidence = zeros((ny, nx),dtype("Float32"))
+        self.image = None
+        self.pixels = None
+
+    def analyzeBin(self, binData):
+        """
+        Calculates pixel contents, x spread and y spread based on a single bin
+        of data.
+        """
+
+        binaryBin = binData > 127
+
+        height, width = binData.shape
+        nPixels = width * height
+
+        # Calculate spread by "flattening" in each axis
+        xSpread = 0
+        ySpread = 0
+        xSpreadMask = zeros((1,width))
+        ySpreadMask = zeros((height,1))
+
+        for y in range(height):
+            xSpreadMask[0,:] += binaryBin[y,:]
+
+        for x in range(width):
+            ySpreadMask[:,0] += binaryBin[:,x]
+
+        xSpread = float(sum(xSpreadMask[0,:] > 1)) / width
+        ySpread = float(sum(ySpreadMask[:,0] > 1)) / height
+
+        # Find number of pixels enabled in bin
+        contents = float(sum(sum(binaryBin))) / nPixels
+
+        return (xSpread, ySpread, contents)
+        #print "xSpread=%d, ySpread=%d, contents=%d" % (xSpread, ySpread, contents)
+
+    def eliminateCross(self, binData):
+        """
+        Blank-out horizontal and vertical crosslines by
+        detecting rows or columns with more than 80% of their
+        pixels lit and clearing them. When the dimension being
+        checked has more than 20 pixels, turn the threshold down to
+        50%. Columns (or rows) are only cleared if there are at most
+        MAX_CROSSLINE_FRACTION of the bin's width (or height) of them:
+        more are a solid ball (ie: a large disc), not a crossline.
+        
+        Returns: a new clean bin data array
+        """
+        height, width = binData.shape
+        
+        hThreshold = height >= 20 and 0.5 or 0.8
+        wThreshold = width >= 20 and 0.5 or 0.8
+        
+        newBinData = binData.copy()
+        binaryBin = newBinData > 127
+        
+        vLines = [vLineIdx for vLineIdx in range(width) if sum(binaryBin[:,vLineIdx]) > (float(height) * hThreshold)]
+        hLines = [hLineIdx for hLineIdx in range(height) if sum(binaryBin[hLineIdx,:]) > (float(width) * wThreshold)]
+        
+        if len(vLines) <= width * self.MAX_CROSSLINE_FRACTION:
+            for vLineIdx in vLines:
+                newBinData[:,vLineIdx] = 0
+
+        if len(hLines) <= height * self.MAX_CROSSLINE_FRACTION:
+            for hLineIdx in hLines:
+                newBinData[hLineIdx,:] = 0
+                
+        return newBinData
+
+    def analyzeBins(self, binaryImage, xEdges, yEdges):
+        """
+        Calculates pixel contents, x spread and y spread of every bin at
+        once, from a boolean image of lit pixels. This is the vectorized
+        equivalent of calling analyzeBin() on every bin.
+
+        The bins are described by their pixel boundaries "xEdges" and
+        "yEdges" (see get_bin_edges()). Row and column occupancy within each
+        bin are obtained with segmented sums (numpy's add.reduceat) over
+        those boundaries, so the image is only traversed a few times,
+        whatever the number of bins.
+
+        Returns: (xSpread, ySpread, contents), each a (ny, nx) float array.
+        """
+        xStarts = xEdges[:-1]
+        yStarts = yEdges[:-1]
+        widths = diff(xEdges).astype("Float64")
+        heights = diff(yEdges).astype("Float64")
+
+        # Number of lit pixels in every column of every row of bins: (ny, sx)
+        binColumns = add.reduceat(binaryImage, yStarts, axis = 0, dtype = int32)
+        # Number of lit pixels in every row of every column of bins: (sy, nx)
+        binRows = add.reduceat(binaryImage, xStarts, axis = 1, dtype = int32)
+
+        # Spread is the fraction of columns (or rows) of a bin with more
+        # than one lit pixel
+        xSpread = add.reduceat(binColumns > 1, xStarts, axis = 1, dtype = int32) / widths[newaxis, :]
+        ySpread = add.reduceat(binRows > 1, yStarts, axis = 0, dtype = int32) / heights[:, newaxis]
+
+        # Find fraction of pixels enabled in every bin
+        contents = add.reduceat(binRows, yStarts, axis = 0, dtype = int32) / outer(heights, widths)
+
+        return (xSpread, ySpread, contents)
+
+    def eliminateCrossesAndAnalyze(self, binaryImage, xEdges, yEdges):
+        """
+        Vectorized equivalent of running eliminateCross() and then
+        analyzeBin() on every bin, working on the whole boolean image
+        "binaryImage" at once.
+
+        Row and column occupancy of every bin is computed with segmented
+        sums over the bin boundaries "xEdges" and "yEdges". The same
+        80% / 50% thresholds and MAX_CROSSLINE_FRACTION limit as
+        eliminateCross() are then applied as masks to blank-out crosslines
+        in all bins together, without copying any bin, and the spreads and
+        contents of the cleaned bins are computed.
+
+        Returns: (xSpread, ySpread, contents), each a (ny, nx) float array.
+        """
+        xStarts = xEdges[:-1]
+        yStarts = yEdges[:-1]
+        widths = diff(xEdges)
+        heights = diff(yEdges)
+
+        # Bins of 20 pixels or more in a dimension use a 50% threshold
+        # instead of 80% in that dimension
+        hThreshold = where(heights >= 20, 0.5, 0.8) * heights
+        wThreshold = where(widths >= 20, 0.5, 0.8) * widths
+
+        # Find vertical crosslines: (ny, sx) mask of cleared columns in every row of bins
+        binColumns = add.reduceat(binaryImage, yStarts, axis = 0, dtype = int32)
+        clearedColumns = binColumns > hThreshold[:, newaxis]
+
+        # Find horizontal crosslines: (sy, nx) mask of cleared rows in every column of bins
+        binRows = add.reduceat(binaryImage, xStarts, axis = 1, dtype = int32)
+        clearedRows = binRows > wThreshold[newaxis, :]
+        
+        # Keep the columns (rows) of bins with too many of them to be crosslines
+        solidX = add.reduceat(clearedColumns, xStarts, axis = 1, dtype = int32) > widths[newaxis, :] * self.MAX_CROSSLINE_FRACTION
+        clearedColumns &= ~repeat(solidX, widths, axis = 1)
+        solidY = add.reduceat(clearedRows, yStarts, axis = 0, dtype = int32) > heights[:, newaxis] * self.MAX_CROSSLINE_FRACTION
+        clearedRows &= ~repeat(solidY, heights, axis = 0)
+
+        # Blank-out crosslines and analyze the clean bins
+        cleanImage = binaryImage & ~repeat(clearedColumns, heights, axis = 0)
+        cleanImage &= ~repeat(clearedRows, widths, axis = 1)
+
+        return self.analyzeBins(cleanImage, xEdges, yEdges)
+
+    def extractBins(self):
+        """
+        Extract the data for all bins. Bins are rectangles whose
+        sizes are approximately (imageSize / nBalls) in each dimension.
+
+        For each bin, we determine the "spread" in X and Y and the number
+        of black pixels (contents). The spread is the extent of black pixel
+        within the bin, inconsiderate of the shape.
+
+        All values extracted are normalized so that bins of different sizes
+        (because of non-integer pixels/bin) don't affect the result.
+
+        The image is analyzed one strip (row of bins) at a time: all bins
+        of a strip are analyzed together by eliminateCrossesAndAnalyze(),
+        so memory use is bounded by the size of a strip, and a
+        memory-mapped image (see decodeImage()) is only read strip by strip.
+        Dark pixels (< 128) are the lit pixels of the analysis, so the
+        image never needs to be inverted. Only the columns within the bin
+        grid (see registerGrid()) are analyzed. Progress is reported, and
+        cancellation checked, after every row of bins.
+        """
+        xEdges, yEdges = get_bin_edges(self.image, self.nx, self.ny)
+        if self.pixels is not None:
+            pixels = self.pixels
+        else:
+            pixels = asarray(self.image)
+        
+        xmin, xmax = xEdges[0], xEdges[-1]
+        xEdges = xEdges - xmin
+
+        for yIdx in range(self.ny):
+            self._checkCancelled()
+            
+            ymin, ymax = yEdges[yIdx], yEdges[yIdx + 1]
+            binaryStrip = pixels[ymin:ymax, xmin:xmax] < 128
+
+            # Eliminate center alignment crosses that could be in empty bins
+            # and calculate spread and contents (number of black pixels)
+            xSpread, ySpread, contents = self.eliminateCrossesAndAnalyze(binaryStrip, xEdges, array([0, ymax - ymin]))
+
+            # Eliminate bins containing only either horizontal or
+            # vertical line segments
+            contents[logical_or(xSpread < 0.2, ySpread < 0.2)] = 0
+
+            # Save data
+            self.contents[yIdx, :] = contents[0, :]
+            self.xSpread[yIdx, :] = xSpread[0, :]
+            self.ySpread[yIdx, :] = ySpread[0, :]
+
+            if self.progressCallback:
+                self.progressCallback(yIdx + 1, self.ny)
+
+    def _checkCancelled(self):
+        """
+        Raise ProcessingCancelled if the cancel event was set.
+        """
+        if self.cancelEvent is not None and self.cancelEvent.is_set():
+            raise ProcessingCancelled()
+
+    def extractBinsPerBin(self):
+        """
+        Extract the data for all bins. Bins are rectangles whose
+        sizes are approximately (imageSize / nBalls) in each dimension.
+
+        For each bin, we determine the "spread" in X and Y and the number
+        of black pixels (contents). The spread is the extent of black pixel
+        within the bin, inconsiderate of the shape.
+
+        All values extracted are normalized so that bins of different sizes
+        (because of non-integer pixels/bin) don't affect the result.
+
+        This is the original bin-by-bin implementation of extractBins(). It
+        is much slower and is only kept to validate and benchmark the
+        vectorized version.
+        """
+        # Analyze all bins
+        for xIdx in range(self.nx):
+            for yIdx in range(self.ny):
+                # Extract bin from image, inverted so that dark pixels are lit
+                xmin, ymin, xmax, ymax = get_bin_bounds(self.image, self.nx, self.ny, xIdx, yIdx)                
+                binData = asarray(ImageChops.invert(self.image.crop((xmin, ymin, xmax+1, ymax+1))))
+
+                # Calculate spread and contents (number of black pixels)
+                xSpread, ySpread, contents = self.analyzeBin(binData)
+                
+                # Eliminate center alignment crosses that could be in
+                # empty bin
+                #if xSpread >= 0.8 or ySpread >= 0.8:
+                binData = self.eliminateCross(binData)
+                
+                # Recalculate values
+                xSpread, ySpread, contents = self.analyzeBin(binData)
+
+                # Eliminate bins containing only either horizontal or 
+                # vertical line segments
+                if xSpread < 0.2 or ySpread < 0.2:
+                    contents = 0
+                                        
+                # Save data
+                self.contents[yIdx, xIdx] = contents
+                self.xSpread[yIdx, xIdx] = xSpread
+                self.ySpread[yIdx, xIdx] = ySpread
+
+    def getThresholdOtsu(self, contents, nBins = 64):
+        """
+        Optimal thresholding using Otsu's method.
+        Algorithm described in Gonzalez and Woods, "Digital Image Processing, 3rd ed",
+        Prentice Hall, p742-746.
+        
+        See getThresholdOtsuWithVariance() for details.
+        """
+        threshold, varB = self.getThresholdOtsuWithVariance(contents, nBins)
+        return threshold
+
+    def getThresholdOtsuWithVariance(self, contents, nBins = 64):
+        """
+        Optimal thresholding using Otsu's method, on a histogram of "nBins"
+        bins of the "contents" array. Runs in O(nBins) (see
+        getThresholdsOtsuBatch()).
+        
+        The threshold keeps the scale historically returned by this method
+        (optimal histogram index divided by the number of bins in "contents"),
+        which the heuristic in extractArrayFromBins() relies upon.
+        
+        Returns: (threshold, varB) where varB is the maximum between-class
+        variance (in squared histogram bins), so callers can judge how well
+        separated the two classes are.
+        """
+        thresholds, varB = self.getThresholdsOtsuBatch([contents], nBins)
+        return (thresholds[0], varB[0])
+
+    @staticmethod
+    def getThresholdsOtsuBatch(contentsList, nBins = 64):
+        """
+        Otsu thresholding of all the arrays of "contentsList" at once (see
+        Thresholding.histograms() and Thresholding.otsu_histograms()),
+        with the same results as getThresholdOtsuWithVariance() on each.
+        
+        Returns: (thresholds, varB) arrays.
+        """
+        hists, edges = histograms(contentsList, nBins)
+        kStar, varB = otsu_histograms(hists)
+        sizes = array([contents.size for contents in contentsList])
+        
+        return (round(kStar - 1) / sizes, varB)
+
+    def getThresholdsOtsuMultilevel(self, contents, nLevels = 3, nBins = 64):
+        """
+        Multi-level Otsu thresholding of the "contents" array, for images
+        with both faint and strong pad shading.
+        
+        Returns: (thresholds, varB), a list of (nLevels - 1) increasing
+        thresholds on the contents scale and the between-class variance.
+        See Thresholding.otsu_multilevel().
+        """
+        return otsu_multilevel(contents, nLevels, nBins)
+    
+    def getThresholdGonz(self, contents):
+        """
+        Basic Global Thresholding.
+        
+        Algorithm described in Gonzalez and Woods, Digital Image Processing, 2nd ed,
+        Prentice Hall, p599-600. See Thresholding.iterative_mean_thresholds().
+        """
+        return iterative_mean_thresholds([contents])[0]
+
+    def extractArrayFromBins(self):
+        """
+        Convert the pixel-counting bins to a BGA array by thresholding
+        the bins to figure-out which ones have balls and which don't.
+        
+        A heuristic (described in getBinThresholds()) is used to select one
+        of two thresholding method. Sets the BGA array, a boolean numpy
+        array with True values being the positions occupied by balls, and
+        the confidence of every bin (see Thresholding.threshold_confidence()):
+        bins with a confidence below 1 are worth a look.
+        """
+        xEdges, yEdges = get_bin_edges(self.image, self.nx, self.ny)
+        sx = xEdges[-1] - xEdges[0]
+        sy = yEdges[-1] - yEdges[0]
+        nBinsX, nBinsY = self.contents.shape
+        
+        threshold = self.getBinThresholds([self.contents], [(float(sx) / nBinsX, float(sy) / nBinsY)])[0]
+        self.bgaArray = self.contents >= threshold
+        self.confidence = threshold_confidence(self.contents, threshold)
+    
+    @staticmethod
+    def getBinThresholds(contentsList, binSizes):
+        """
+        Thresholds of the pixel-counting bins of many images, computed at
+        once (see thresholdBins() for the parameters).
+        
+        Returns an array of thresholds, one per contents array.
+        """
+        # For images with less than 10 pixels of width or height per bin,
+        # we use Otsu's method. It usually leads to better results in that
+        # case. For more pixels, we use global thresholding, as described by
+        # Gonzalez and Woods (see getThresholdGonz method for ref).
+        useOtsu = [width <= 10 or height <= 10 for width, height in binSizes]
+        otsuIdx = [idx for idx in range(len(contentsList)) if useOtsu[idx]]
+        gonzIdx = [idx for idx in range(len(contentsList)) if not useOtsu[idx]]
+        
+        thresholds = zeros(len(contentsList))
+        if otsuIdx:
+            thresholds[otsuIdx] = GridLoader.getThresholdsOtsuBatch([contentsList[idx] for idx in otsuIdx])[0]
+        if gonzIdx:
+            thresholds[gonzIdx] = iterative_mean_thresholds([contentsList[idx] for idx in gonzIdx])
+        
+        return thresholds
+    
+    @staticmethod
+    def thresholdBins(contentsList, binSizes):
+        """
+        Convert the pixel-counting bins of many images to BGA arrays at
+        once. "contentsList" is a sequence of bin contents arrays (see
+        extractBins()) and "binSizes" the matching sequence of (width,
+        height) bin sizes, in pixels.
+        
+        Thresholds are computed for all arrays together (see
+        Thresholding.otsu_histograms() and
+        Thresholding.iterative_mean_thresholds()), so thresholding the bins
+        of thousands of images (ie: cached results in batch mode) costs
+        little more than thresholding a few.
+        
+        Returns a list of boolean numpy arrays, with True values being the
+        positions occupied by balls.
+        """
+        thresholds = GridLoader.getBinThresholds(contentsList, binSizes)
+        
+        # Binarize bins arrays according to their threshold
+        return [contents >= threshold for contents, threshold in zip(contentsList, thresholds)]
+                
+    def extractBallsFromComponents(self):
+        """
+        Find the balls with the connected components engine (see
+        ConnectedComponents.detect_balls()): dark pixels are grouped in
+        connected components, which are snapped to the bins of the grid
+        (see registerGrid()). Sets the bins data, the BGA array and the
+        confidence of every bin at once, so extractArrayFromBins() is not
+        needed. The confidence is that of the ball score of the bins (see
+        Thresholding.threshold_confidence()).
+        
+        Unlike extractBins(), the whole grid area is binarized at once.
+        """
+        xEdges, yEdges = get_bin_edges(self.image, self.nx, self.ny)
+        if self.pixels is not None:
+            pixels = self.pixels
+        else:
+            pixels = asarray(self.image)
+        
+        self._checkCancelled()
+        binaryImage = pixels[yEdges[0]:yEdges[-1], xEdges[0]:xEdges[-1]] < 128
+        (self.bgaArray, self.contents, self.xSpread, self.ySpread,
+         score) = detect_balls(binaryImage, xEdges - xEdges[0], yEdges - yEdges[0])
+        self.confidence = threshold_confidence(score, 1.0)
+        
+        if self.progressCallback:
+            self.progressCallback(self.ny, self.ny)
+    
+    def registerGrid(self):
+        """
+        Locate the ball grid in the image with GridRegistration and attach
+        the resulting BinGrid to the image (see GridUtils.set_image_bin_grid()),
+        so that the bins follow the balls even if the image is a few pixels
+        off, or has some margin around the ball array.
+        
+        The image is split evenly, as before, if "autoRegister" is False or
+        if no regular ball grid is found.
+        
+        Returns the BinGrid used.
+        """
+        grid = None
+        if self.autoRegister:
+            grid, periodicity = register_grid(self.pixels, self.nx, self.ny)
+        
+        if grid is None:
+            grid = get_bin_grid(self.image.size, self.nx, self.ny)
+        
+        set_image_bin_grid(self.image, grid)
+        return grid
+    
+    def decodeImage(self, imageData):
+        """
+        Decode image file data "imageData" to the grayscale source image.
+        
+        Images of up to MAPPED_IMAGE_PIXELS pixels are decoded in memory.
+        Larger images (ie: high resolution scans of datasheet pages) are
+        converted strip by strip to a raw grayscale file, which is then
+        memory-mapped: the full grayscale image is never held in memory and
+        extractBins() only reads the strip it works on. The raw file is
+        kept for a while (see GridUtils.prune_raw_images()), so analyzing
+        the same image again does not even decode it.
+        
+        Sets self.image (a PIL image) and self.pixels (the (sy, sx) array
+        of its pixels). Raises IOError if the image cannot be decoded.
+        """
+        image = Image.open(StringIO.StringIO(imageData))
+        sx, sy = image.size
+        
+        if sx * sy > self.MAPPED_IMAGE_PIXELS:
+            rawDir = get_raw_image_dir()
+            rawFilename = os.path.join(rawDir, "%s_%d_%d.gray" % (hashlib.sha256(imageData).hexdigest(), sx, sy))
+            pixels = open_grayscale_map(rawFilename, image.size)
+            if pixels is None:
+                try:
+                    pixels = map_grayscale(image, rawFilename)
+                    prune_raw_images(rawDir)
+                except (IOError, OSError):
+                    # Raw file cannot be written: decode in memory
+                    pixels = None
+            
+            if pixels is not None:
+                self.pixels = pixels
+                self.image = get_mapped_image(pixels)
+                return
+        
+        self.image = image.convert("L")
+        self.pixels = asarray(self.image)
+    
+    def prescaleImage(self):
+        """
+        Downscale the image to analyze if it has at least twice
+        MIN_PIXELS_PER_BIN pixels per bin (ie: a high resolution scan of a
+        small package), by the integer factor leaving it with
+        MIN_PIXELS_PER_BIN to twice as many pixels per bin. This is enough
+        for the analysis, which then handles several times fewer pixels.
+        
+        Blocks of pixels are averaged (see GridUtils.downscale_pixels())
+        before any binarization, so the fraction of dark pixels of every
+        bin is kept.
+        
+        Sets self.scale to the scale factor (1 if the image is not
+        downscaled), and self.image and self.pixels to the downscaled image.
+        Bins found in it are mapped back to the source image with
+        BinGrid.scaled().
+        """
+        sx, sy = self.image.size
+        self.scale = 1
+        if self.prescale:
+            factor = int(min(float(sx) / self.nx, float(sy) / self.ny) // self.MIN_PIXELS_PER_BIN)
+            if factor >= 2:
+                self.scale = factor
+        
+        if self.scale > 1:
+            self.pixels = downscale_pixels(self.pixels, self.scale)
+            self.image = get_mapped_image(self.pixels)
+    
+    def process(self, loadImage = True):
+        """
+        Analyze the image and extract the BGA array.
+        
+        Returns a (success, errorMessage, bgaArray, image, confidence) tuple
+        where image is the grayscale source image and confidence the (ny, nx)
+        array of the confidence of every bin (see extractArrayFromBins()).
+        The image always has its original size: if it was downscaled for
+        the analysis (see prescaleImage()), its bins are scaled back to it.
+        If "loadImage" is False
+        and the results are found in the cache, the image is not decoded at
+        all and None is returned instead.
+        """
+        # Read image file once: its data is used for decoding and as cache key
+        try:
+            with Instrumentation.span("read image file"):
+                imageFile = open(self.filename, "rb")
+                try:
+                    imageData = imageFile.read()
+                finally:
+                    imageFile.close()
+        except IOError, e:
+            return (False, str(e), None, None, None)
+        
+        cached = None
+        if self.cache is not None:
+            with Instrumentation.span("cache lookup"):
+                options = (self.engine, self.autoRegister and "registered" or "uniform",
+                           self.prescale and "prescaled" or "native")
+                cacheKey = self.cache.makeKey(imageData, self.nx, self.ny, self.ANALYSIS_VERSION, options)
+                cached = self.cache.get(cacheKey)
+        
+        # Try to open image and convert it to grayscale
+        self.image = None
+        self.pixels = None
+        if cached is None or loadImage:
+            try:
+                with Instrumentation.span("decode image"):
+                    self.decodeImage(imageData)
+            except IOError, e:
+                return (False, str(e), None, None, None)
+        
+        if cached is not None:
+            # Reuse previous analysis of the same image
+            self.contents = cached["contents"]
+            self.xSpread = cached["xSpread"]
+            self.ySpread = cached["ySpread"]
+            self.bgaArray = cached["bgaArray"]
+            self.confidence = cached["confidence"]
+            if self.image is not None:
+                set_image_bin_grid(self.image, BinGrid(self.image.size, self.nx, self.ny, cached["xEdges"], cached["yEdges"]))
+        else:
+            # Oversized images are analyzed at a lower resolution
+            sourceImage, sourcePixels = self.image, self.pixels
+            with Instrumentation.span("prescale image"):
+                self.prescaleImage()
+            
+            # Find the ball grid
+            with Instrumentation.span("register grid"):
+                grid = self.registerGrid()
+            
+            try:
+                if self.engine == "components":
+                    # Find balls from connected components
+                    with Instrumentation.span("detect components", bins = self.nx * self.ny):
+                        self.extractBallsFromComponents()
+                else:
+                    # Extract bins to internal data structures
+                    with Instrumentation.span("extract bins", bins = self.nx * self.ny):
+                        self.extractBins()
+                    
+                    # Extract BGA array geometry from bins
+                    with Instrumentation.span("threshold"):
+                        self.extractArrayFromBins()
+            except ProcessingCancelled:
+                return (False, "Processing cancelled", None, None, None)
+            
+            # Map the bins back to the source image, so that clicks on it
+            # and overlays drawn on it use the bins of the analysis
+            if self.scale > 1:
+                grid = grid.scaled(self.scale, sourceImage.size)
+                set_image_bin_grid(sourceImage, grid)
+                self.image, self.pixels = sourceImage, sourcePixels
+            
+            if self.cache is not None:
+                with Instrumentation.span("cache store"):
+                    self.cache.put(cacheKey, {"contents" : self.contents, "xSpread" : self.xSpread,
+                                              "ySpread" : self.ySpread, "bgaArray" : self.bgaArray,
+                                              "confidence" : self.confidence,
+                                              "xEdges" : grid.xEdges, "yEdges" : grid.yEdges})
+        
+        return (True, "", self.bgaArray.copy(), self.image, self.confidence)
+
+                #print "Bin (%d, %d): (%d %d)-(%d %d), w=%d, h=%d, n=%d" % (xIdx, yIdx, xmin, ymin, xmax, ymax, width, height, (width * height))
+                #if xIdx == yIdx == 0:
+                    #for py in range(height):
+                        #for px in range(width):
+                            #if binData[py,px] > 127:
+                                #print " ",
+                            #else:
+                                #print "#",
+                        #print
+
+if __name__ == "__main__":
+    loader = GridLoader(45,45,"C:\\Users\\veilleux\\Desktop\\Dossiers Ouverts\\autobga\\bga2.png")
     loader.process()
\ No newline at end of file
@@ -0,0 +1,289 @@
+"""
+Automatic ball grid registration for AutoBGA
+
+Created on: Oct 18, 2026
+Author: Tennessee Carmel-Veilleux (tcv -at- ro.boto.ca)
+Revision: $Rev$
+
+Copyright 2026 Tennessee Carmel-Veilleux
+
+Description:
+Functions finding the ball grid in an image that is not cropped exactly
+to the ball array (ie: a few pixels too wide, or with part of the package
+outline around it).
+
+Dark pixels of the image are projected on the X and Y axis. The ball
+pitch along each axis is the period of its projection, found as the first
+strong peak of its autocorrelation, computed by FFT in O(N log N). The
+phase of the projection's Fourier component at that period gives the
+position of the ball centers, and the energy of the projection over every
+period tells which positions are occupied by balls. From these, the number
+of balls can be inferred and the bin edges of the grid are computed, to be
+used instead of a uniform split of the whole image.
+
+License:
+Copyright (c) 2026, Tennessee Carmel-Veilleux
+All rights reserved.
+
+Redistribution and use in source and binary forms, with or without
+modification, are permitted provided that the following conditions are
+met:
+
+    * Redistributions of source code must retain the above copyright
+notice, this list of conditions and the following disclaimer.
+    * Redistributions in binary form must reproduce the above
+copyright notice, this list of conditions and the following disclaimer
+in the documentation and/or other materials provided with the
+distribution.
+    * Neither the name of SONIA AUV nor the names of its contributors
+may be used to endorse or promote products derived from this software
+without specific prior written permission.
+
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+"AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+(INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+"""
+import numpy
+from GridUtils import BinGrid
+
+# Smallest ball pitch (pixels) that can be registered
+MIN_PITCH = 4
+
+# Smallest normalized autocorrelation peak accepted as the ball pitch
+MIN_PERIODICITY = 0.2
+
+def get_projections(pixels, stripHeight = 256):
+    """
+    Returns (xProjection, yProjection), the number of dark (< 128) pixels
+    in every column and every row of the (sy, sx) array of grayscale
+    "pixels". The image is read "stripHeight" rows at a time, so that
+    memory-mapped images are never fully loaded.
+    """
+    sy, sx = pixels.shape
+    xProjection = numpy.zeros(sx, numpy.int64)
+    yProjection = numpy.zeros(sy, numpy.int64)
+    for ymin in range(0, sy, stripHeight):
+        binaryStrip = pixels[ymin:ymin + stripHeight, :] < 128
+        xProjection += numpy.sum(binaryStrip, axis = 0)
+        yProjection[ymin:ymin + stripHeight] = numpy.sum(binaryStrip, axis = 1)
+
+    return (xProjection, yProjection)
+
+def clip_lines(projection):
+    """
+    Returns a copy of "projection" where the peaks caused by lines along
+    the projection axis (center lines, package outline) are clipped to
+    the level of the balls, so that they don't hide the ball periodicity.
+    """
+    projection = numpy.asarray(projection, dtype = numpy.float64)
+    nonZero = projection[projection > 0]
+    if len(nonZero) == 0:
+        return projection
+
+    return numpy.minimum(projection, 2.0 * numpy.percentile(nonZero, 75))
+
+def autocorrelation(projection):
+    """
+    Returns the normalized (1.0 at lag 0) linear autocorrelation of
+    "projection" minus its mean, for lags 0 to len(projection) - 1,
+    computed by FFT in O(N log N). Returns None for a flat projection.
+    """
+    values = projection - numpy.mean(projection)
+    n = len(values)
+
+    # Zero-padding to 2n avoids circular wrap-around
+    spectrum = numpy.fft.rfft(values, 2 * n)
+    correlation = numpy.fft.irfft(spectrum * numpy.conj(spectrum), 2 * n)[:n]
+    if correlation[0] <= 0:
+        return None
+
+    return correlation / correlation[0]
+
+def _refine_peak(values, idx):
+    """
+    Returns the fractional position of the peak of "values" at integer
+    index "idx", by parabolic interpolation with its neighbors.
+    """
+    if idx <= 0 or idx >= len(values) - 1:
+        return float(idx)
+
+    left, center, right = values[idx - 1], values[idx], values[idx + 1]
+    denom = left - 2.0 * center + right
+    if denom >= 0:
+        return float(idx)
+
+    return idx + 0.5 * (left - right) / denom
+
+def estimate_pitch(projection, minPitch = MIN_PITCH, maxPitch = None):
+    """
+    Estimate the period (ball pitch) of "projection", in pixels, between
+    "minPitch" and "maxPitch" (default: half the projection's length).
+
+    The period is the first autocorrelation peak reaching 70% of the
+    highest peak in range, which avoids picking a multiple of the pitch.
+    It is then refined on the furthest strong multiple of that peak.
+
+    Returns a (pitch, periodicity) tuple, periodicity being the normalized
+    autocorrelation (up to 1.0) at the pitch, or (None, 0.0) if no period
+    is found.
+    """
+    correlation = autocorrelation(projection)
+    n = len(projection)
+    if maxPitch is None:
+        maxPitch = n / 2.0
+    maxLag = min(int(numpy.ceil(maxPitch)) + 1, n - 2)
+    minLag = max(int(numpy.floor(minPitch)), 1)
+    if correlation is None or maxLag <= minLag:
+        return (None, 0.0)
+
+    # Local maxima of the autocorrelation within the pitch range
+    lags = numpy.arange(minLag, maxLag + 1)
+    isPeak = (correlation[lags] >= correlation[lags - 1]) & (correlation[lags] > correlation[lags + 1])
+    peaks = lags[isPeak]
+    if len(peaks) == 0:
+        return (None, 0.0)
+
+    bestValue = numpy.max(correlation[peaks])
+    if bestValue < MIN_PERIODICITY:
+        return (None, 0.0)
+    peak = peaks[numpy.nonzero(correlation[peaks] >= 0.7 * bestValue)[0][0]]
+    pitch = _refine_peak(correlation, peak)
+    periodicity = float(correlation[peak])
+
+    # Refine on multiples of the pitch: the error of the peak position is
+    # divided by the multiple
+    multiple = 2
+    while multiple * pitch < n / 2.0:
+        center = int(round(multiple * pitch))
+        window = max(1, int(pitch / 4))
+        lo, hi = max(center - window, 1), min(center + window, n - 2)
+        idx = lo + int(numpy.argmax(correlation[lo:hi + 1]))
+        if correlation[idx] < 0.5 * periodicity:
+            break
+        pitch = _refine_peak(correlation, idx) / multiple
+        multiple += 1
+
+    return (pitch, periodicity)
+
+def estimate_phase(projection, pitch):
+    """
+    Returns the position (pixels, in [0, pitch)) of the first ball center
+    of a "projection" with period "pitch": the phase of its Fourier
+    component at that period. Pixel i covers positions [i, i + 1).
+    """
+    positions = numpy.arange(len(projection)) + 0.5
+    component = numpy.sum(projection * numpy.exp(-2j * numpy.pi * positions / pitch))
+    return (-numpy.angle(component) / (2.0 * numpy.pi) * pitch) % pitch
+
+def find_extent(projection, pitch, phase, count = None):
+    """
+    Find the balls along a "projection" with ball centers at
+    "phase" + k * "pitch".
+
+    The projection is summed over every period around a ball center. If
+    "count" is given, the "count" consecutive periods with the largest sum
+    are the balls. Otherwise, the balls span from the first to the last
+    period holding at least 20% of the typical (median of the upper half)
+    sum of a period.
+
+    Returns (firstCenter, count), the position of the first ball center and
+    the number of balls, or None if "count" balls don't fit in the image.
+    """
+    n = len(projection)
+    cumulative = numpy.concatenate(([0.0], numpy.cumsum(projection, dtype = numpy.float64)))
+
+    # All ball positions whose period overlaps the image, including balls
+    # cut by the image border
+    kFirst = int(numpy.floor((-pitch / 2.0 - phase) / pitch)) + 1
+    kLast = int(numpy.ceil((n + pitch / 2.0 - phase) / pitch)) - 1
+    centers = phase + numpy.arange(kFirst, kLast + 1) * pitch
+    if len(centers) == 0:
+        return None
+
+    starts = numpy.clip(numpy.round(centers - pitch / 2.0).astype(numpy.intp), 0, n)
+    ends = numpy.clip(numpy.round(centers + pitch / 2.0).astype(numpy.intp), 0, n)
+    energy = cumulative[ends] - cumulative[starts]
+
+    if count is None:
+        upperHalf = numpy.sort(energy)[len(energy) // 2:]
+        occupied = numpy.nonzero(energy >= 0.2 * numpy.median(upperHalf))[0]
+        if len(occupied) == 0:
+            return None
+        first = occupied[0]
+        count = occupied[-1] - first + 1
+    else:
+        if count > len(centers):
+            return None
+        windowEnergy = numpy.convolve(energy, numpy.ones(count), "valid")
+        first = int(numpy.argmax(windowEnergy))
+
+    return (centers[first], int(count))
+
+def register_axis(projection, count = None):
+    """
+    Register the balls along one axis of the image, given the "projection"
+    of its dark pixels on that axis and, optionally, the expected number
+    of balls "count".
+
+    Returns a (edges, periodicity) tuple: "edges" is the integer array of
+    the (count + 1) bin boundaries (within [0, len(projection)]) and
+    periodicity is the confidence of the pitch (see estimate_pitch()).
+    Returns (None, 0.0) if the balls cannot be registered.
+    """
+    n = len(projection)
+    projection = clip_lines(projection)
+
+    # The ball array covers at least half of the image, and "count" balls
+    # need at least (count - 1) pitches
+    minPitch = MIN_PITCH
+    maxPitch = None
+    if count is not None:
+        minPitch = max(minPitch, n / (2.0 * count))
+        if count > 1:
+            maxPitch = n / (count - 1.0)
+
+    pitch, periodicity = estimate_pitch(projection, minPitch, maxPitch)
+    if pitch is None:
+        return (None, 0.0)
+
+    phase = estimate_phase(projection, pitch)
+    extent = find_extent(projection, pitch, phase, count)
+    if extent is None:
+        return (None, 0.0)
+    firstCenter, count = extent
+
+    edges = numpy.round(firstCenter - pitch / 2.0 + numpy.arange(count + 1) * pitch).astype(numpy.intp)
+    edges = numpy.clip(edges, 0, n)
+    if numpy.any(numpy.diff(edges) < 1):
+        return (None, 0.0)
+
+    return (edges, periodicity)
+
+def register_grid(pixels, nx = None, ny = None):
+    """
+    Find the ball grid in the (sy, sx) array of grayscale "pixels" (dark
+    balls on a light background). "nx" and "ny", the number of balls on
+    each axis, are inferred if they are None.
+
+    Returns a (grid, periodicity) tuple: the BinGrid with the registered
+    bin edges, and the lowest confidence of the two axis (see
+    estimate_pitch()). Returns (None, 0.0) if the grid cannot be registered.
+    """
+    sy, sx = pixels.shape
+    xProjection, yProjection = get_projections(pixels)
+
+    xEdges, xPeriodicity = register_axis(xProjection, nx)
+    yEdges, yPeriodicity = register_axis(yProjection, ny)
+    if xEdges is None or yEdges is None:
+        return (None, 0.0)
+
+    grid = BinGrid((sx, sy), len(xEdges) - 1, len(yEdges) - 1, xEdges, yEdges)
+    return (grid, min(xPeriodicity, yPeriodicity))
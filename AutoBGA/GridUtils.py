@@ -1,150 +1,531 @@
-"""
-Miscellaneous utility functions.
-
-Created on: Feb 19, 2011
-Author: Tennessee Carmel-Veilleux (tcv -at- ro.boto.ca)
-Revision: $Rev$
-
-Copyright 2011 Tennessee Carmel-Veilleux
-
-Description: 
-Miscellaneous utility functions. These include functions to get
-a temporary filename for the output image and the function to
-plot the output image with grid overlay.
-
-License:
-Copyright (c) 2011, Tennessee Carmel-Veilleux
-All rights reserved.
-
-Redistribution and use in source and binary forms, with or without 
-modification, are permitted provided that the following conditions are 
-met:
-
-    * Redistributions of source code must retain the above copyright 
-notice, this list of conditions and the following disclaimer.
-    * Redistributions in binary form must reproduce the above 
-copyright notice, this list of conditions and the following disclaimer 
-in the documentation and/or other materials provided with the 
-distribution.
-    * Neither the name of SONIA AUV nor the names of its contributors 
-may be used to endorse or promote products derived from this software 
-without specific prior written permission.
-
-THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS 
-"AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT 
-LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR 
-A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT 
-HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, 
-SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT 
-LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, 
-DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY 
-THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT 
-(INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE 
-OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
-"""
-import math
-import os
-import warnings
-import Image
-import ImageChops
-import ImageDraw
-
-def get_bin_bounds(image, nx, ny, xIdx, yIdx):
-    """
-    Returns (xmin, ymin, xmax, ymax) inclusive coordinates of 
-    a rectangle covering the bounds of a bin.
-    
-    Parameters:
-    * image: source image (for its size)
-    * nx: number of bins on X axis in image
-    * ny: number of bins on Y axis in image
-    * xIdx: x axis index of bin whose bounds we want
-    * yIdx: y axis index of bin whose bounds we want
-    """
-    sx, sy = image.size
-
-    # Get x range for bin
-    xmin = int(math.floor((float(xIdx) * sx) / nx))
-    xmax = int(math.floor((float(xIdx + 1) * sx) / nx)) - 1
-    if xmax >= sx: xmax = (sx - 1)
-
-    # Get y range for bin
-    ymin = int(math.floor((float(yIdx) * sy) / ny))
-    ymax = int(math.floor((float(yIdx + 1) * sy) / ny)) - 1
-    if ymax >= sy: ymax = (sy - 1)
-
-    return (xmin, ymin, xmax, ymax)
-
-def point_to_idx(image, px, py, nx, ny):
-    """
-    Get the ball array (x,y) bin index from a pixel
-    position within the source image.
-    
-    Parameters:
-    * image: source image (for its size)
-    * px: X pixel position to query
-    * py: Y pixel position to query
-    * nx: number of bins on X axis in image
-    * ny: number of bins on Y axis in image
-    """
-    sx, sy = image.size
-    xIdx = int(math.floor((float(px) / float(sx)) * float(nx)))
-    yIdx = int(math.floor((float(py) / float(sy)) * float(ny)))
-    return (xIdx, yIdx)
-    
-def get_temp_filename():
-    """
-    Return a temporary filename to use for drawing grid images
-    """
-    # Disable pesky warnings about os.tempnam()
-    with warnings.catch_warnings():
-        warnings.simplefilter("ignore")
-
-        # Save the bins image in a temporary file
-        filename = os.tempnam("autobga","tmpoutimg") + ".png"
-    
-    return filename
-
-def draw_bins(filename, sourceImage, nx, ny, bgaArray):
-    """
-    Draw an image containing the bins and detected ball positions, for
-    user verification.
-    
-    Parameters:
-    * filename: filename to use for saving processed image
-    * sourceImage: source image that was processed to extract the bga array
-    * nx: number of bins on X axis in image
-    * ny: number of bins on Y axis in image
-    * bgaArray: boolean array of occupied ball positions
-    """
-    # Get a new drawing context
-    newImage = sourceImage.copy()
-    newImage = ImageChops.invert(newImage).convert("RGB")
-    gc = ImageDraw.Draw(newImage)
-    sx, sy = newImage.size
-    
-    # Draw a circle in every detected pad bin
-    for py in range(ny):
-        for px in range(nx):
-            xmin, ymin, xmax, ymax = get_bin_bounds(sourceImage, nx, ny, px, py)
-            gc.line([(0,ymax),(sx,ymax)], fill = "blue")
-            gc.line([(xmax,0),(xmax,sy)], fill = "blue")
-            
-            width = (xmax - xmin) + 1
-            height = (ymax - ymin) + 1
-            
-            xmin2 = xmin + round(float(width) * 0.4)
-            xmax2 = xmin + round(float(width) * 0.6)
-            ymin2 = ymin + round(float(height) * 0.4)
-            ymax2 = ymin + round(float(height) * 0.6)
-            
-            if bgaArray[py,px]:
-                gc.ellipse((xmin2, ymin2, xmax2, ymax2), outline = "red", fill = "red")
-    del gc
-    
-    try:
-        newImage.save(filename)
-    except IOError:
-        return None    
-    
-    return filename
\ No newline at end of file
+"""
+Miscellaneous utility functions.
+
+Created on: Feb 19, 2011
+Author: Tennessee Carmel-Veilleux (tcv -at- ro.boto.ca)
+Revision: $Rev$
+
+Copyright 2011 Tennessee Carmel-Veilleux
+
+Description: 
+Miscellaneous utility functions. These include functions to get
+a temporary filename for the output image and the function to
+plot the output image with grid overlay.
+
+License:
+Copyright (c) 2011, Tennessee Carmel-Veilleux
+All rights reserved.
+
+Redistribution and use in source and binary forms, with or without 
+modification, are permitted provided that the following conditions are 
+met:
+
+    * Redistributions of source code must retain the above copyright 
+notice, this list of conditions and the following disclaimer.
+    * Redistributions in binary form must reproduce the above 
+copyright notice, this list of conditions and the following disclaimer 
+in the documentation and/or other materials provided with the 
+distribution.
+    * Neither the name of SONIA AUV nor the names of its contributors 
+may be used to endorse or promote products derived from this software 
+without specific prior written permission.
+
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS 
+"AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT 
+LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR 
+A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT 
+HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, 
+SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT 
+LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, 
+DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY 
+THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT 
+(INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE 
+OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+"""
+import math
+import os
+import StringIO
+import tempfile
+import numpy
+from collections import OrderedDict
+import Image
+import ImageDraw
+import Instrumentation
+
+# Number of raw grayscale image files kept by prune_raw_images()
+MAX_RAW_IMAGES = 4
+
+# Largest number of bins, and highest confidence, of the bins listed for
+# review by get_ambiguous_bins()
+MAX_REVIEW_BINS = 12
+REVIEW_CONFIDENCE = 1.0
+
+class BinGrid:
+    def __init__(self, size, nx, ny, xEdges = None, yEdges = None):
+        """
+        Precomputed bin boundaries for an image of "size" (sx, sy) pixels
+        split in "nx" x "ny" bins.
+
+        Bin (xIdx, yIdx) covers columns xEdges[xIdx] to xEdges[xIdx + 1] - 1
+        and rows yEdges[yIdx] to yEdges[yIdx + 1] - 1. The edges are computed
+        once, so bounds lookups and pixel to bin mapping are cheap.
+
+        By default, the image is split evenly. Explicit, increasing "xEdges"
+        and "yEdges" (ie: from GridRegistration) of length (nx + 1) and
+        (ny + 1) can be given instead. They may not cover the whole image:
+        pixels outside of them do not belong to any bin.
+
+        Use get_bin_grid() to obtain a shared instance of an evenly split
+        grid instead of building a new one for every call.
+        """
+        self.size = tuple(size)
+        self.nx = nx
+        self.ny = ny
+        sx, sy = self.size
+
+        if xEdges is None:
+            # Edges use the same floating-point formula as the original
+            # per-bin bounds calculation, so they are bit-for-bit identical
+            xEdges = numpy.floor((numpy.arange(nx + 1, dtype = numpy.float64) * sx) / nx)
+        if yEdges is None:
+            yEdges = numpy.floor((numpy.arange(ny + 1, dtype = numpy.float64) * sy) / ny)
+        self.xEdges = numpy.asarray(xEdges).astype(numpy.intp)
+        self.yEdges = numpy.asarray(yEdges).astype(numpy.intp)
+        if len(self.xEdges) != nx + 1 or len(self.yEdges) != ny + 1:
+            raise ValueError("Expected %d x and %d y bin edges, got %d and %d" % (nx + 1, ny + 1, len(self.xEdges), len(self.yEdges)))
+
+        # Keep plain lists of the inclusive bounds for fast scalar lookups
+        self._xmin = [int(x) for x in self.xEdges[:-1]]
+        self._xmax = [min(int(x) - 1, sx - 1) for x in self.xEdges[1:]]
+        self._ymin = [int(y) for y in self.yEdges[:-1]]
+        self._ymax = [min(int(y) - 1, sy - 1) for y in self.yEdges[1:]]
+
+    def bounds(self, xIdx, yIdx):
+        """
+        Returns (xmin, ymin, xmax, ymax) inclusive coordinates of
+        a rectangle covering the bounds of bin (xIdx, yIdx).
+        """
+        return (self._xmin[xIdx], self._ymin[yIdx], self._xmax[xIdx], self._ymax[yIdx])
+
+    def point_to_idx(self, px, py):
+        """
+        Get the ball array (x,y) bin index from a pixel position
+        within the source image, or None if the position is outside of
+        the bins (ie: in the margins around a registered grid).
+        """
+        if not (self.xEdges[0] <= px < self.xEdges[-1] and self.yEdges[0] <= py < self.yEdges[-1]):
+            return None
+        
+        xIdx = int(numpy.searchsorted(self.xEdges, px, side = "right")) - 1
+        yIdx = int(numpy.searchsorted(self.yEdges, py, side = "right")) - 1
+        return (xIdx, yIdx)
+
+    def scaled(self, factor, size):
+        """
+        Returns the BinGrid of the same bins in an image of "size" (sx, sy)
+        pixels, "factor" times larger than this grid's image (ie: the
+        original image of one downscaled by downscale_pixels()). Edges on
+        the border of this grid's image stay on the border of the larger
+        one, so the pixels left out by the downscaling are not lost.
+        """
+        sx, sy = size
+        xEdges = numpy.where(self.xEdges >= self.size[0], sx, self.xEdges * factor)
+        yEdges = numpy.where(self.yEdges >= self.size[1], sy, self.yEdges * factor)
+        return BinGrid(size, self.nx, self.ny, xEdges, yEdges)
+
+# Cache of recently used BinGrid instances, keyed on geometry
+_binGridCache = OrderedDict()
+_BIN_GRID_CACHE_SIZE = 16
+
+def get_bin_grid(size, nx, ny):
+    """
+    Returns the BinGrid for an image of "size" (sx, sy) pixels split
+    in "nx" x "ny" bins. Instances are memoized on their geometry, so
+    repeated calls for the same image (recomputes, clicks on the
+    result image, redraws) share the same precomputed boundaries.
+    """
+    key = (tuple(size), nx, ny)
+    grid = _binGridCache.pop(key, None)
+    if grid is None:
+        grid = BinGrid(size, nx, ny)
+        if len(_binGridCache) >= _BIN_GRID_CACHE_SIZE:
+            _binGridCache.popitem(last = False)
+    _binGridCache[key] = grid
+
+    return grid
+
+def get_image_bin_grid(image, nx, ny):
+    """
+    Returns the BinGrid of "image" split in "nx" x "ny" bins: the grid
+    attached to the image by set_image_bin_grid() (ie: registered by
+    GridLoader) if it has the same number of bins, or else the evenly
+    split grid.
+    """
+    grid = getattr(image, "binGrid", None)
+    if grid is not None and grid.nx == nx and grid.ny == ny and grid.size == tuple(image.size):
+        return grid
+
+    return get_bin_grid(image.size, nx, ny)
+
+def set_image_bin_grid(image, grid):
+    """
+    Attach BinGrid "grid" to "image", so that all functions taking the
+    image (get_bin_bounds(), point_to_idx(), render_bins(), ...) use it.
+    """
+    image.binGrid = grid
+
+def get_bin_bounds(image, nx, ny, xIdx, yIdx):
+    """
+    Returns (xmin, ymin, xmax, ymax) inclusive coordinates of 
+    a rectangle covering the bounds of a bin.
+    
+    Parameters:
+    * image: source image (for its size)
+    * nx: number of bins on X axis in image
+    * ny: number of bins on Y axis in image
+    * xIdx: x axis index of bin whose bounds we want
+    * yIdx: y axis index of bin whose bounds we want
+    """
+    return get_image_bin_grid(image, nx, ny).bounds(xIdx, yIdx)
+
+def get_bin_edges(image, nx, ny):
+    """
+    Returns (xEdges, yEdges), two integer arrays of length (nx + 1) and
+    (ny + 1) holding the pixel boundaries of all bins, such that bin
+    (xIdx, yIdx) covers columns xEdges[xIdx] to xEdges[xIdx + 1] - 1 and
+    rows yEdges[yIdx] to yEdges[yIdx + 1] - 1. The boundaries are the same
+    as those returned by get_bin_bounds().
+
+    Parameters:
+    * image: source image (for its size)
+    * nx: number of bins on X axis in image
+    * ny: number of bins on Y axis in image
+    """
+    grid = get_image_bin_grid(image, nx, ny)
+    return (grid.xEdges, grid.yEdges)
+
+def point_to_idx(image, px, py, nx, ny):
+    """
+    Get the ball array (x,y) bin index from a pixel
+    position within the source image, or None if the position is not
+    in any bin (see BinGrid.point_to_idx()).
+    
+    Parameters:
+    * image: source image (for its size)
+    * px: X pixel position to query
+    * py: Y pixel position to query
+    * nx: number of bins on X axis in image
+    * ny: number of bins on Y axis in image
+    """
+    return get_image_bin_grid(image, nx, ny).point_to_idx(px, py)
+
+def get_ambiguous_bins(confidence, maxBins = MAX_REVIEW_BINS, maxConfidence = REVIEW_CONFIDENCE):
+    """
+    Get the bins whose analysis is the most doubtful, so that only those
+    need to be checked by hand.
+    
+    Parameters:
+    * confidence: (ny, nx) array of the confidence of every bin, as
+      returned by GridLoader.process()
+    * maxBins: largest number of bins returned
+    * maxConfidence: only bins with a lower confidence are returned
+    
+    Returns: a list of (xIdx, yIdx, confidence) tuples, least confident first.
+    """
+    confidence = numpy.asarray(confidence)
+    candidates = numpy.flatnonzero(confidence < maxConfidence)
+    order = numpy.argsort(confidence.flat[candidates], kind = "mergesort")[:maxBins]
+    nx = confidence.shape[1]
+    return [(int(idx % nx), int(idx // nx), float(confidence.flat[idx])) for idx in candidates[order]]
+    
+def get_temp_filename():
+    """
+    Return a new temporary filename to use for drawing grid images.
+    The file is created (empty) to reserve the name safely.
+    """
+    fd, filename = tempfile.mkstemp(suffix = ".png", prefix = "autobga")
+    os.close(fd)
+    
+    return filename
+
+def get_raw_image_dir():
+    """
+    Returns the directory holding the raw grayscale image files created
+    by map_grayscale(), in the system's temporary directory.
+    """
+    return os.path.join(tempfile.gettempdir(), "autobga_raw")
+
+def map_grayscale(image, filename, stripHeight = 256):
+    """
+    Convert PIL "image" to 8-bit grayscale ("L") "stripHeight" rows at a
+    time, writing the pixels to raw file "filename" (one byte per pixel,
+    row after row), and return a memory-map of it (see open_grayscale_map()).
+    No full-size grayscale copy of the image is ever held in memory.
+
+    The file is written under a temporary name and then renamed, so that
+    other processes never see a partial file. Raises IOError or OSError
+    if the file cannot be written.
+    """
+    sx, sy = image.size
+    rawDir = os.path.dirname(filename)
+    if rawDir and not os.path.isdir(rawDir):
+        os.makedirs(rawDir)
+
+    fd, tempFilename = tempfile.mkstemp(suffix = ".tmp", dir = rawDir or None)
+    try:
+        rawFile = os.fdopen(fd, "wb")
+        try:
+            for ymin in range(0, sy, stripHeight):
+                strip = image.crop((0, ymin, sx, min(ymin + stripHeight, sy)))
+                rawFile.write(image_to_bytes(strip.convert("L")))
+        finally:
+            rawFile.close()
+
+        try:
+            os.rename(tempFilename, filename)
+        except OSError:
+            # Already converted by another process (or Windows, where
+            # existing files cannot be replaced)
+            os.remove(tempFilename)
+    except (IOError, OSError):
+        if os.path.exists(tempFilename):
+            os.remove(tempFilename)
+        raise
+
+    pixels = open_grayscale_map(filename, image.size)
+    if pixels is None:
+        raise IOError("Cannot map raw grayscale image file %s" % filename)
+
+    return pixels
+
+def open_grayscale_map(filename, size):
+    """
+    Returns a read-only numpy.memmap of the (sy, sx) pixels of raw
+    grayscale file "filename", for an image of "size" (sx, sy) pixels, or
+    None if the file is missing or does not have the right size.
+    """
+    sx, sy = size
+    try:
+        if os.path.getsize(filename) != sx * sy:
+            return None
+        pixels = numpy.memmap(filename, dtype = numpy.uint8, mode = "r", shape = (sy, sx))
+        # Touch the file so that it is pruned last
+        os.utime(filename, None)
+    except (IOError, OSError, ValueError):
+        return None
+
+    return pixels
+
+def get_mapped_image(pixels):
+    """
+    Returns a grayscale ("L") PIL image sharing the memory of the (sy, sx)
+    uint8 array "pixels" (ie: the memory-map from map_grayscale()), without
+    copying it.
+    """
+    sy, sx = pixels.shape
+    return Image.frombuffer("L", (sx, sy), pixels, "raw", "L", 0, 1)
+
+def downscale_pixels(pixels, factor, stripHeight = 256):
+    """
+    Downscale the (sy, sx) uint8 array "pixels" by an integer "factor",
+    averaging every block of "factor" x "factor" pixels (a box filter).
+    Rows and columns left over at the bottom and right edges are dropped.
+    
+    The mean gray level of every block is kept, but not the fraction of
+    dark pixels once binarized: a block only stays dark if its mean is
+    below the threshold, so strokes thinner than about half a block fade
+    to gray and can vanish.
+    
+    The pixels are read about "stripHeight" rows at a time, so a
+    memory-mapped image (see map_grayscale()) is never loaded at once.
+    
+    Returns the (sy // factor, sx // factor) uint8 array of the averages.
+    """
+    sy, sx = pixels.shape
+    ny, nx = sy // factor, sx // factor
+    blockSize = factor * factor
+    reduced = numpy.empty((ny, nx), numpy.uint8)
+    
+    rowsPerStrip = max(stripHeight // factor, 1)
+    for ymin in range(0, ny, rowsPerStrip):
+        ymax = min(ymin + rowsPerStrip, ny)
+        strip = pixels[ymin * factor:ymax * factor, :nx * factor].reshape(ymax - ymin, factor, nx, factor)
+        sums = numpy.sum(numpy.sum(strip, axis = 3, dtype = numpy.uint32), axis = 1)
+        reduced[ymin:ymax] = (sums + blockSize // 2) // blockSize
+    
+    return reduced
+
+def prune_raw_images(rawDir, maxFiles = MAX_RAW_IMAGES):
+    """
+    Remove all but the "maxFiles" most recently used raw grayscale image
+    files of "rawDir". Files that cannot be removed (ie: still mapped, on
+    Windows) are left alone.
+    """
+    try:
+        filenames = [os.path.join(rawDir, name) for name in os.listdir(rawDir) if name.endswith(".gray")]
+        filenames.sort(key = os.path.getmtime)
+    except OSError:
+        return
+
+    for filename in filenames[:max(len(filenames) - maxFiles, 0)]:
+        try:
+            os.remove(filename)
+        except OSError:
+            pass
+
+def image_to_bytes(image):
+    """
+    Returns the raw pixel data of PIL "image" as a string
+    (ie: RGBRGB... for an RGB image).
+    """
+    if hasattr(image, "tobytes"):
+        return image.tobytes()
+    else:
+        return image.tostring()
+
+def image_to_png(image, compressLevel = 1):
+    """
+    Encode PIL "image" as PNG in memory and return the PNG data string.
+    The default "compressLevel" favors encoding speed over size.
+    """
+    output = StringIO.StringIO()
+    image.save(output, "PNG", compress_level = compressLevel)
+    return output.getvalue()
+
+def _draw_ball(gc, bounds):
+    """
+    Draw the red dot marking a detected ball in the bin with
+    (xmin, ymin, xmax, ymax) inclusive "bounds".
+    """
+    xmin, ymin, xmax, ymax = bounds
+    
+    width = (xmax - xmin) + 1
+    height = (ymax - ymin) + 1
+    
+    xmin2 = xmin + round(float(width) * 0.4)
+    xmax2 = xmin + round(float(width) * 0.6)
+    ymin2 = ymin + round(float(height) * 0.4)
+    ymax2 = ymin + round(float(height) * 0.6)
+    
+    gc.ellipse((xmin2, ymin2, xmax2, ymax2), outline = "red", fill = "red")
+
+def _draw_review(gc, bounds):
+    """
+    Draw the orange frame marking a bin to review in the bin with
+    (xmin, ymin, xmax, ymax) inclusive "bounds", inside its separation lines.
+    """
+    xmin, ymin, xmax, ymax = bounds
+    gc.rectangle((xmin + 1, ymin + 1, max(xmax - 2, xmin + 1), max(ymax - 2, ymin + 1)), outline = "orange")
+
+def render_bins(sourceImage, nx, ny, bgaArray, reviewBins = ()):
+    """
+    Render an image containing the bins and detected ball positions, for
+    user verification.
+    
+    Parameters:
+    * sourceImage: grayscale source image that was processed to extract the
+      bga array
+    * nx: number of bins on X axis in image
+    * ny: number of bins on Y axis in image
+    * bgaArray: boolean array of occupied ball positions
+    * reviewBins: (xIdx, yIdx, ...) tuples of the bins to frame for review,
+      ie: from get_ambiguous_bins()
+    
+    Returns: a new RGB image. Use draw_bin() to update a single bin of it.
+    """
+    with Instrumentation.span("render bins", bins = nx * ny):
+        return _render_bins(sourceImage, nx, ny, bgaArray, reviewBins)
+
+def _render_bins(sourceImage, nx, ny, bgaArray, reviewBins):
+    # Get a new drawing context
+    newImage = sourceImage.convert("RGB")
+    gc = ImageDraw.Draw(newImage)
+    sx, sy = newImage.size
+    grid = get_image_bin_grid(sourceImage, nx, ny)
+    
+    # Draw the bin separation lines, and the top and left edges of the
+    # grid when it does not start at the image border
+    for py in range(ny):
+        xmin, ymin, xmax, ymax = grid.bounds(0, py)
+        gc.line([(0,ymax),(sx,ymax)], fill = "blue")
+        if py == 0 and ymin > 0:
+            gc.line([(0,ymin - 1),(sx,ymin - 1)], fill = "blue")
+
+    for px in range(nx):
+        xmin, ymin, xmax, ymax = grid.bounds(px, 0)
+        gc.line([(xmax,0),(xmax,sy)], fill = "blue")
+        if px == 0 and xmin > 0:
+            gc.line([(xmin - 1,0),(xmin - 1,sy)], fill = "blue")
+    
+    # Draw a circle in every detected pad bin
+    for py in range(ny):
+        for px in range(nx):
+            if bgaArray[py,px]:
+                _draw_ball(gc, grid.bounds(px, py))
+    
+    for reviewBin in reviewBins:
+        _draw_review(gc, grid.bounds(reviewBin[0], reviewBin[1]))
+    del gc
+    
+    return newImage
+
+def draw_bin(image, sourceImage, nx, ny, xIdx, yIdx, isPresent, isReview = False):
+    """
+    Redraw only bin (xIdx, yIdx) of an "image" obtained from
+    render_bins(), after the ball state of that bin changed to "isPresent".
+    The review frame is drawn if "isReview" is True, so it is removed by
+    default once the bin was looked at.
+    The result is the same as rendering the whole image again, but the
+    cost only depends on the size of the bin.
+    
+    Returns: the (xmin, ymin, xmax, ymax) inclusive bounds of the bin.
+    """
+    bounds = get_image_bin_grid(sourceImage, nx, ny).bounds(xIdx, yIdx)
+    xmin, ymin, xmax, ymax = bounds
+    
+    # Restore bin from the source image
+    box = (xmin, ymin, xmax + 1, ymax + 1)
+    image.paste(sourceImage.crop(box).convert("RGB"), box)
+    
+    # Redraw the separation lines on the bottom and right edges of the bin
+    gc = ImageDraw.Draw(image)
+    gc.line([(xmin,ymax),(xmax,ymax)], fill = "blue")
+    gc.line([(xmax,ymin),(xmax,ymax)], fill = "blue")
+    
+    if isPresent:
+        _draw_ball(gc, bounds)
+    if isReview:
+        _draw_review(gc, bounds)
+    del gc
+    
+    return bounds
+
+def render_bins_png(sourceImage, nx, ny, bgaArray, compressLevel = 1, reviewBins = ()):
+    """
+    Same as render_bins(), but returns the image encoded as PNG data
+    (see image_to_png()), without any disk I/O.
+    """
+    return image_to_png(render_bins(sourceImage, nx, ny, bgaArray, reviewBins), compressLevel)
+
+def draw_bins(filename, sourceImage, nx, ny, bgaArray, reviewBins = ()):
+    """
+    Draw an image containing the bins and detected ball positions, for
+    user verification, and save it to a file.
+    
+    Parameters:
+    * filename: filename to use for saving processed image
+    * sourceImage: grayscale source image that was processed to extract the
+      bga array
+    * nx: number of bins on X axis in image
+    * ny: number of bins on Y axis in image
+    * bgaArray: boolean array of occupied ball positions
+    * reviewBins: bins to frame for review (see render_bins())
+    """
+    newImage = render_bins(sourceImage, nx, ny, bgaArray, reviewBins)
+    
+    try:
+        newImage.save(filename)
+    except IOError:
+        return None    
+    
+    return filename
@@ -1,84 +1,228 @@
-#!/bin/env python
-# -*- coding: cp1252 -*-
-"""
-HtmlWindow derived class that adds support for detection of click
-coordinates in the BGA results image.
-
-Created on: Feb 19, 2011
-Author: Tennessee Carmel-Veilleux (tcv -at- ro.boto.ca)
-Revision: $Rev$
-
-Copyright 2011 Tennessee Carmel-Veilleux
-
-Description: 
-HtmlWindow derived class that adds support for detection of click
-coordinates in the BGA results image. Assumes the image is wrapped
-in a link, so that the onLinkClicked() method uses the last clicked
-coordinate from the last onCellClicked() event.
-
-License:
-Copyright (c) 2011, Tennessee Carmel-Veilleux
-All rights reserved.
-
-Redistribution and use in source and binary forms, with or without 
-modification, are permitted provided that the following conditions are 
-met:
-
-    * Redistributions of source code must retain the above copyright 
-notice, this list of conditions and the following disclaimer.
-    * Redistributions in binary form must reproduce the above 
-copyright notice, this list of conditions and the following disclaimer 
-in the documentation and/or other materials provided with the 
-distribution.
-    * Neither the name of SONIA AUV nor the names of its contributors 
-may be used to endorse or promote products derived from this software 
-without specific prior written permission.
-
-THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS 
-"AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT 
-LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR 
-A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT 
-HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, 
-SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT 
-LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, 
-DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY 
-THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT 
-(INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE 
-OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
-"""
-import  wx
-import  wx.html as  html
-
-class ImageHandlingHtmlWindow(html.HtmlWindow):
-    def __init__(self, parent, id, pos, size, style):
-        html.HtmlWindow.__init__(self, parent, id, pos, size, style = style | wx.NO_FULL_REPAINT_ON_RESIZE)
-        if "gtk2" in wx.PlatformInfo:
-            self.SetStandardFonts()
-        
-        self.owner = None
-        
-        # Last clicked coordinate in image
-        self.lastCoord = None
-        # Size of last cell clicked
-        self.lastCellSize = None
-        
-    def SetOwner(self, owner):
-        self.owner = owner
-        
-    def OnLinkClicked(self, linkinfo):
-        href = linkinfo.GetHref() 
-        if href != "resultImage":
-            # Regular link: handle through parent
-            super(ImageHandlingHtmlWindow, self).OnLinkClicked(linkinfo)
-        else:
-            # Image link: Tell parent that image was clicked
-            if self.lastCoord != None and self.lastCellSize != None:
-                self.owner.onImageClicked(self.lastCoord, self.lastCellSize)
-
-    def OnCellClicked(self, cell, x, y, evt):
-        # Record data about the click for the OnLinkClicked() method
-        self.lastCoord = (x, y)
-        self.lastCellSize = (cell.GetWidth(), cell.GetHeight())
-        
-        # Also run default handler in case
-        super(ImageHandlingHtmlWindow, self).OnCellClicked(cell, x, y, evt)
+#!/bin/env python
+# -*- coding: cp1252 -*-
+"""
+HtmlWindow derived class that adds support for detection of click
+coordinates in the BGA results image.
+
+Created on: Feb 19, 2011
+Author: Tennessee Carmel-Veilleux (tcv -at- ro.boto.ca)
+Revision: $Rev$
+
+Copyright 2011 Tennessee Carmel-Veilleux
+
+Description: 
+HtmlWindow derived class that adds support for detection of click
+coordinates in the BGA results image, and for live parts of the page.
+
+Windows can be embedded in a page with a <widget name="..."> tag: the
+window is built by the factory registered under that name with
+SetWidgetFactory(). Such windows (see BitmapWindow and TableWindow) can
+then be updated in place, without setting the whole page again.
+
+License:
+Copyright (c) 2011, Tennessee Carmel-Veilleux
+All rights reserved.
+
+Redistribution and use in source and binary forms, with or without 
+modification, are permitted provided that the following conditions are 
+met:
+
+    * Redistributions of source code must retain the above copyright 
+notice, this list of conditions and the following disclaimer.
+    * Redistributions in binary form must reproduce the above 
+copyright notice, this list of conditions and the following disclaimer 
+in the documentation and/or other materials provided with the 
+distribution.
+    * Neither the name of SONIA AUV nor the names of its contributors 
+may be used to endorse or promote products derived from this software 
+without specific prior written permission.
+
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS 
+"AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT 
+LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR 
+A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT 
+HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, 
+SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT 
+LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, 
+DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY 
+THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT 
+(INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE 
+OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+"""
+import  wx
+import  wx.html as  html
+
+class ImageHandlingHtmlWindow(html.HtmlWindow):
+    def __init__(self, parent, id, pos, size, style):
+        html.HtmlWindow.__init__(self, parent, id, pos, size, style = style | wx.NO_FULL_REPAINT_ON_RESIZE)
+        if "gtk2" in wx.PlatformInfo:
+            self.SetStandardFonts()
+        
+        # Factories of the windows embedded with <widget name="..."> tags
+        self.widgetFactories = {}
+        # Windows embedded in the current page
+        self.widgets = []
+        
+    def SetWidgetFactory(self, name, factory):
+        """
+        Register "factory" for the <widget name="name"> tags. The factory
+        is called with this window as parent and returns the window to
+        embed in the page, or None to embed nothing.
+        """
+        self.widgetFactories[name] = factory
+        
+    def CreateWidget(self, name):
+        """
+        Called by WidgetTagHandler to build the window of a <widget> tag.
+        """
+        factory = self.widgetFactories.get(name)
+        if factory is None:
+            return None
+        
+        widget = factory(self)
+        if widget is not None:
+            self.widgets.append(widget)
+        return widget
+        
+    def SetPage(self, source):
+        # Embedded windows belong to the page they were built for: destroy
+        # those of the previous page once it is replaced
+        oldWidgets = self.widgets
+        self.widgets = []
+        result = html.HtmlWindow.SetPage(self, source)
+        for widget in oldWidgets:
+            if widget:
+                widget.Destroy()
+        
+        return result
+
+class WidgetTagHandler(html.HtmlWinTagHandler):
+    """
+    Handler of the <widget name="..."> tag: embeds the window built by
+    ImageHandlingHtmlWindow.CreateWidget() in the page.
+    """
+    def __init__(self):
+        html.HtmlWinTagHandler.__init__(self)
+        
+    def GetSupportedTags(self):
+        return "WIDGET"
+    
+    def HandleTag(self, tag):
+        parser = self.GetParser()
+        if hasattr(parser, "GetWindowInterface"):
+            htmlWindow = parser.GetWindowInterface().GetHTMLWindow()
+        else:
+            htmlWindow = parser.GetWindow()
+            
+        if isinstance(htmlWindow, ImageHandlingHtmlWindow) and tag.HasParam("NAME"):
+            widget = htmlWindow.CreateWidget(tag.GetParam("NAME"))
+            if widget is not None:
+                parser.GetContainer().InsertCell(html.HtmlWidgetCell(widget))
+                
+        return False
+
+html.HtmlWinParser_AddTagHandler(WidgetTagHandler)
+
+class BitmapWindow(wx.Window):
+    """
+    Window showing "bitmap". Parts of the bitmap can be replaced with
+    SetPart(), which only repaints the replaced area.
+    
+    Left clicks call onClick((x, y)) with the clicked bitmap coordinate.
+    """
+    def __init__(self, parent, bitmap, onClick = None):
+        wx.Window.__init__(self, parent, -1, size = (bitmap.GetWidth(), bitmap.GetHeight()))
+        self.bitmap = bitmap
+        self.onClick = onClick
+        
+        self.Bind(wx.EVT_PAINT, self.OnPaint)
+        self.Bind(wx.EVT_LEFT_DOWN, self.OnLeftDown)
+        
+    def SetPart(self, partBitmap, x, y):
+        """
+        Draw "partBitmap" over the bitmap, with its top-left corner at (x, y),
+        and repaint that area.
+        """
+        dc = wx.MemoryDC()
+        dc.SelectObject(self.bitmap)
+        dc.DrawBitmap(partBitmap, x, y)
+        dc.SelectObject(wx.NullBitmap)
+        
+        self.RefreshRect(wx.Rect(x, y, partBitmap.GetWidth(), partBitmap.GetHeight()), False)
+        
+    def OnPaint(self, evt):
+        # Painting is clipped to the invalidated area
+        dc = wx.PaintDC(self)
+        dc.DrawBitmap(self.bitmap, 0, 0)
+        
+    def OnLeftDown(self, evt):
+        if self.onClick is not None:
+            self.onClick((evt.GetX(), evt.GetY()))
+        evt.Skip()
+
+class TableWindow(wx.Window):
+    """
+    Window drawing a table of "nColumns" by "nRows" cells. "cells" is the
+    row-major list of the (text, colour) of the cells, where "colour" is
+    the background colour name, or None for no background. A cell can be
+    changed with SetCell(), which only repaints that cell.
+    """
+    CELL_MARGIN = 3
+    
+    def __init__(self, parent, cells, nColumns, nRows):
+        wx.Window.__init__(self, parent, -1)
+        self.cells = list(cells)
+        self.nColumns = nColumns
+        self.nRows = nRows
+        
+        font = wx.SystemSettings.GetFont(wx.SYS_DEFAULT_GUI_FONT)
+        font.SetPointSize(max(font.GetPointSize() - 2, 6))
+        self.SetFont(font)
+        
+        # Size the cells after the widest text
+        dc = wx.ClientDC(self)
+        dc.SetFont(font)
+        textWidth, textHeight = dc.GetTextExtent("W99")
+        for text, colour in self.cells:
+            if text:
+                textWidth = max(textWidth, dc.GetTextExtent(text)[0])
+        self.cellWidth = textWidth + 2 * self.CELL_MARGIN
+        self.cellHeight = textHeight + 2 * self.CELL_MARGIN
+        
+        size = (nColumns * self.cellWidth + 1, nRows * self.cellHeight + 1)
+        self.SetSize(size)
+        self.SetMinSize(size)
+        
+        self.Bind(wx.EVT_PAINT, self.OnPaint)
+        
+    def SetCell(self, xIdx, yIdx, text, colour):
+        """
+        Change the (text, colour) of cell (xIdx, yIdx) and repaint it.
+        """
+        self.cells[yIdx * self.nColumns + xIdx] = (text, colour)
+        self.RefreshRect(wx.Rect(xIdx * self.cellWidth, yIdx * self.cellHeight, self.cellWidth + 1, self.cellHeight + 1), False)
+        
+    def OnPaint(self, evt):
+        dc = wx.PaintDC(self)
+        dc.SetFont(self.GetFont())
+        dc.SetPen(wx.GREY_PEN)
+        
+        # Only draw the cells in the invalidated area
+        box = self.GetUpdateRegion().GetBox()
+        x0 = max(box.GetLeft() // self.cellWidth, 0)
+        x1 = min(box.GetRight() // self.cellWidth + 1, self.nColumns)
+        y0 = max(box.GetTop() // self.cellHeight, 0)
+        y1 = min(box.GetBottom() // self.cellHeight + 1, self.nRows)
+        
+        for yIdx in xrange(y0, y1):
+            for xIdx in xrange(x0, x1):
+                text, colour = self.cells[yIdx * self.nColumns + xIdx]
+                if colour is not None:
+                    dc.SetBrush(wx.Brush(colour))
+                else:
+                    dc.SetBrush(wx.WHITE_BRUSH)
+                x = xIdx * self.cellWidth
+                y = yIdx * self.cellHeight
+                dc.DrawRectangle(x, y, self.cellWidth + 1, self.cellHeight + 1)
+                if text:
+                    dc.DrawText(text, x + self.CELL_MARGIN, y + self.CELL_MARGIN)
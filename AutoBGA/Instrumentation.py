@@ -0,0 +1,311 @@
+"""
+Timing and profiling instrumentation for AutoBGA
+
+Created on: Oct 18, 2026
+Author: Tennessee Carmel-Veilleux (tcv -at- ro.boto.ca)
+Revision: $Rev$
+
+Copyright 2026 Tennessee Carmel-Veilleux
+
+Description:
+Lightweight instrumentation of the processing pipeline. Code sections are
+wrapped in named spans:
+
+    with Instrumentation.span("extract bins"):
+        ...
+
+When instrumentation is enabled, every span records its wall-clock time,
+the process CPU time used and the peak memory usage (RSS) of the process.
+The spans are written as a JSON trace that can be loaded in Chrome's
+about:tracing page (or any viewer of the Trace Event format). Spans of the
+pipeline stages can also be profiled with cProfile, one .prof file per
+span, to be read with the pstats module.
+
+When instrumentation is disabled (the default), spans cost a function call.
+
+Instrumentation is enabled with the following environment variables
+(the batch front-end also has --trace and --profile-dir options):
+* AUTOBGA_TRACE: filename of the JSON trace, written at exit
+* AUTOBGA_PROFILE: directory of the cProfile output files
+
+Traces of worker processes are saved next to the trace file (as
+"<trace>.<pid>.part" files) and merged by the main process when it
+writes the trace.
+
+License:
+Copyright (c) 2026, Tennessee Carmel-Veilleux
+All rights reserved.
+
+Redistribution and use in source and binary forms, with or without
+modification, are permitted provided that the following conditions are
+met:
+
+    * Redistributions of source code must retain the above copyright
+notice, this list of conditions and the following disclaimer.
+    * Redistributions in binary form must reproduce the above
+copyright notice, this list of conditions and the following disclaimer
+in the documentation and/or other materials provided with the
+distribution.
+    * Neither the name of SONIA AUV nor the names of its contributors
+may be used to endorse or promote products derived from this software
+without specific prior written permission.
+
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+"AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+(INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+"""
+import atexit
+import cProfile
+import glob
+import json
+import multiprocessing
+import os
+import re
+import sys
+import threading
+import time
+
+try:
+    import resource
+except ImportError:
+    # Not available on Windows
+    resource = None
+
+# Instrumentation state of the current process
+_traceFilename = None
+_profileDir = None
+_events = []
+_workerEvents = []
+_lock = threading.Lock()
+_profiling = False
+_profileCount = 0
+
+def enable(traceFilename = None, profileDir = None):
+    """
+    Enable instrumentation: spans are recorded and written to JSON trace
+    file "traceFilename" at exit (or by write_trace()). If "profileDir" is
+    given, the spans of the pipeline stages are also profiled with cProfile,
+    in files of that directory (created if needed).
+    
+    The settings are also stored in the environment, so that they are
+    inherited by worker processes started afterwards.
+    """
+    global _traceFilename, _profileDir
+    
+    if traceFilename:
+        _traceFilename = os.path.abspath(traceFilename)
+        os.environ["AUTOBGA_TRACE"] = _traceFilename
+    if profileDir:
+        _profileDir = os.path.abspath(profileDir)
+        os.environ["AUTOBGA_PROFILE"] = _profileDir
+        if not os.path.isdir(_profileDir):
+            os.makedirs(_profileDir)
+
+def is_enabled():
+    return _traceFilename is not None or _profileDir is not None
+
+def get_cpu_time():
+    """
+    Returns the user + system CPU time (s) used by the current process.
+    """
+    if sys.platform == "win32":
+        times = os.times()
+        return times[0] + times[1]
+    else:
+        # Better resolution than os.times() outside of Windows
+        return time.clock()
+
+def get_peak_rss():
+    """
+    Returns the peak resident set size (bytes) of the current process,
+    or None if it cannot be obtained.
+    """
+    if resource is not None:
+        maxRss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        if os.uname()[0] == "Darwin":
+            return maxRss
+        else:
+            # Linux reports kilobytes
+            return maxRss * 1024
+    
+    try:
+        import ctypes
+        import ctypes.wintypes
+        
+        class PROCESS_MEMORY_COUNTERS(ctypes.Structure):
+            _fields_ = [("cb", ctypes.wintypes.DWORD),
+                        ("PageFaultCount", ctypes.wintypes.DWORD),
+                        ("PeakWorkingSetSize", ctypes.c_size_t),
+                        ("WorkingSetSize", ctypes.c_size_t),
+                        ("QuotaPeakPagedPoolUsage", ctypes.c_size_t),
+                        ("QuotaPagedPoolUsage", ctypes.c_size_t),
+                        ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t),
+                        ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+                        ("PagefileUsage", ctypes.c_size_t),
+                        ("PeakPagefileUsage", ctypes.c_size_t)]
+        
+        counters = PROCESS_MEMORY_COUNTERS()
+        counters.cb = ctypes.sizeof(counters)
+        if ctypes.windll.psapi.GetProcessMemoryInfo(ctypes.windll.kernel32.GetCurrentProcess(),
+                                                    ctypes.byref(counters), counters.cb):
+            return counters.PeakWorkingSetSize
+    except (ImportError, AttributeError, OSError):
+        pass
+    
+    return None
+
+class Span:
+    def __init__(self, name, category, profile, args):
+        """
+        Recording span, see span().
+        """
+        self.name = name
+        self.category = category
+        self.profile = profile
+        self.args = args
+        self.profiler = None
+        
+    def __enter__(self):
+        global _profiling
+        
+        if self.profile and _profileDir is not None and not _profiling:
+            # Only the outermost profiled span is profiled: cProfile
+            # profilers cannot be nested
+            _profiling = True
+            self.profiler = cProfile.Profile()
+            self.profiler.enable()
+            
+        self.startCpuTime = get_cpu_time()
+        self.startTime = time.time()
+        return self
+    
+    def __exit__(self, excType, excValue, traceback):
+        global _profiling, _profileCount
+        
+        endTime = time.time()
+        endCpuTime = get_cpu_time()
+        
+        if self.profiler is not None:
+            self.profiler.disable()
+            with _lock:
+                _profileCount += 1
+                profileIdx = _profileCount
+            safeName = re.sub(r"[^\w.-]+", "_", self.name)
+            self.profiler.dump_stats(os.path.join(_profileDir, "%s_%d_%d.prof" % (safeName, os.getpid(), profileIdx)))
+            _profiling = False
+        
+        args = dict(self.args)
+        args["cpu_ms"] = (endCpuTime - self.startCpuTime) * 1000.0
+        peakRss = get_peak_rss()
+        if peakRss is not None:
+            args["peak_rss_kb"] = peakRss / 1024
+        if excType is not None:
+            args["exception"] = excType.__name__
+        
+        event = {"name" : self.name,
+                 "cat" : self.category,
+                 "ph" : "X",
+                 "ts" : self.startTime * 1e6,
+                 "dur" : (endTime - self.startTime) * 1e6,
+                 "pid" : os.getpid(),
+                 "tid" : threading.current_thread().ident,
+                 "args" : args}
+        with _lock:
+            _events.append(event)
+        
+        return False
+
+class _NullSpan:
+    """
+    Span doing nothing, used when instrumentation is disabled.
+    """
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, excType, excValue, traceback):
+        return False
+    
+_nullSpan = _NullSpan()
+
+def span(name, category = "autobga", profile = False, **args):
+    """
+    Returns a context manager measuring the code it wraps as span "name"
+    of "category". Extra keyword "args" are saved with the span (ie:
+    image size, number of balls). If "profile" is True and profiling is
+    enabled, the span is also profiled with cProfile.
+    
+    Returns a shared do-nothing context manager if instrumentation is
+    disabled.
+    """
+    if _traceFilename is None and _profileDir is None:
+        return _nullSpan
+    
+    return Span(name, category, profile, args)
+
+def get_events():
+    """
+    Returns a copy of the list of trace events recorded by this process.
+    """
+    with _lock:
+        return list(_events)
+
+def write_trace(filename = None):
+    """
+    Write the trace events recorded by this process to "filename" (default:
+    the trace file given to enable()).
+    
+    In worker processes, the events are written to a part file next to the
+    trace file instead, to be merged by the main process: this function
+    should be called by workers after each job. In the main process, the
+    part files are merged in the trace and removed.
+    """
+    if filename is None:
+        filename = _traceFilename
+    if filename is None:
+        return
+    
+    # Forked processes inherit the events of their parent: only keep ours
+    pid = os.getpid()
+    events = [event for event in get_events() if event["pid"] == pid]
+    
+    if multiprocessing.current_process().name != "MainProcess":
+        _write_json("%s.%d.part" % (filename, pid), events)
+        return
+    
+    for partFilename in glob.glob(filename + ".*.part"):
+        try:
+            with open(partFilename, "r") as partFile:
+                partEvents = json.load(partFile)["traceEvents"]
+            os.remove(partFilename)
+        except (IOError, OSError, ValueError, KeyError):
+            continue
+        with _lock:
+            _workerEvents.extend(partEvents)
+    
+    with _lock:
+        events.extend(_workerEvents)
+    events.sort(key = lambda event: event["ts"])
+    _write_json(filename, events)
+
+def _write_json(filename, events):
+    with open(filename, "w") as traceFile:
+        json.dump({"traceEvents" : events, "displayTimeUnit" : "ms"}, traceFile)
+
+def _write_trace_at_exit():
+    if _traceFilename is not None:
+        try:
+            write_trace()
+        except (IOError, OSError):
+            pass
+
+# Enable instrumentation from the environment
+enable(os.environ.get("AUTOBGA_TRACE"), os.environ.get("AUTOBGA_PROFILE"))
+atexit.register(_write_trace_at_exit)
@@ -0,0 +1,229 @@
+"""
+Analysis result cache for AutoBGA
+
+Created on: Oct 18, 2026
+Author: Tennessee Carmel-Veilleux (tcv -at- ro.boto.ca)
+Revision: $Rev$
+
+Copyright 2026 Tennessee Carmel-Veilleux
+
+Description:
+ResultCache class keeping the results of the image analysis done by
+GridLoader (bin contents and spreads, the detected ball array and the bin
+edges), so that processing the same image again with the same ball array
+size skips the image analysis. Only the pitch, pad diameter, corner, view
+or format changed: only naming, geometry and plotting are done again.
+
+Entries are keyed on the SHA-256 hash of the image file's data, the
+number of balls on each axis and GridLoader.ANALYSIS_VERSION. Recently
+used entries are kept in memory and, optionally, all entries are saved
+as .npz files in a cache directory, to be shared between runs and
+processes.
+
+License:
+Copyright (c) 2026, Tennessee Carmel-Veilleux
+All rights reserved.
+
+Redistribution and use in source and binary forms, with or without
+modification, are permitted provided that the following conditions are
+met:
+
+    * Redistributions of source code must retain the above copyright
+notice, this list of conditions and the following disclaimer.
+    * Redistributions in binary form must reproduce the above
+copyright notice, this list of conditions and the following disclaimer
+in the documentation and/or other materials provided with the
+distribution.
+    * Neither the name of SONIA AUV nor the names of its contributors
+may be used to endorse or promote products derived from this software
+without specific prior written permission.
+
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+"AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+(INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+"""
+import hashlib
+import os
+import tempfile
+import threading
+import zipfile
+from collections import OrderedDict
+import numpy
+
+def get_default_cache_dir():
+    """
+    Returns the default cache directory, in the system's temporary directory.
+    """
+    return os.path.join(tempfile.gettempdir(), "autobga_cache")
+
+class ResultCache:
+    # Arrays stored for every entry
+    fields = ("contents", "xSpread", "ySpread", "bgaArray", "confidence", "xEdges", "yEdges")
+    
+    def __init__(self, cacheDir = None, maxEntries = 32, maxDiskEntries = 512):
+        """
+        Initializes a cache holding up to "maxEntries" entries in memory
+        and, if "cacheDir" is not None, up to "maxDiskEntries" entries
+        in "cacheDir" (created if needed). Least recently used entries are
+        dropped first.
+        
+        The cache is thread-safe. Disk problems are never reported: the
+        cache then simply acts as if the entries were missing.
+        """
+        self.cacheDir = cacheDir
+        self.maxEntries = maxEntries
+        self.maxDiskEntries = maxDiskEntries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        
+        if self.cacheDir is not None and not os.path.isdir(self.cacheDir):
+            try:
+                os.makedirs(self.cacheDir)
+            except OSError:
+                self.cacheDir = None
+    
+    @staticmethod
+    def makeKey(imageData, nx, ny, version, options = ()):
+        """
+        Returns the cache key for the analysis of image file data string
+        "imageData" split in "nx" x "ny" bins, with version "version" of
+        the analysis. "options" is a sequence of short strings naming the
+        analysis options that change its results (ie: the engine used).
+        """
+        key = "%s_%d_%d_v%d" % (hashlib.sha256(imageData).hexdigest(), nx, ny, version)
+        return "_".join((key,) + tuple(options))
+    
+    def get(self, key):
+        """
+        Returns the dict of arrays (see ResultCache.fields) stored for "key",
+        or None if there is no such entry. The arrays are read-only: copy
+        them before modifying them.
+        """
+        with self._lock:
+            arrays = self._entries.pop(key, None)
+            if arrays is not None:
+                self._entries[key] = arrays
+                return arrays
+        
+        arrays = self._load(key)
+        if arrays is not None:
+            self._remember(key, arrays)
+            
+        return arrays
+    
+    def put(self, key, arrays):
+        """
+        Store the dict of "arrays" (see ResultCache.fields) for "key".
+        """
+        arrays = dict((name, numpy.array(arrays[name])) for name in self.fields)
+        for array in arrays.values():
+            array.flags.writeable = False
+        
+        self._remember(key, arrays)
+        self._save(key, arrays)
+    
+    def clear(self):
+        """
+        Drop all entries, in memory and on disk.
+        """
+        with self._lock:
+            self._entries.clear()
+        
+        for filename in self._getDiskFilenames():
+            try:
+                os.remove(filename)
+            except OSError:
+                pass
+    
+    def __len__(self):
+        return len(self._entries)
+    
+    def _remember(self, key, arrays):
+        with self._lock:
+            self._entries.pop(key, None)
+            if len(self._entries) >= self.maxEntries:
+                self._entries.popitem(last = False)
+            self._entries[key] = arrays
+    
+    def _getFilename(self, key):
+        return os.path.join(self.cacheDir, key + ".npz")
+    
+    def _getDiskFilenames(self):
+        if self.cacheDir is None:
+            return []
+        
+        try:
+            return [os.path.join(self.cacheDir, name) for name in os.listdir(self.cacheDir) if name.endswith(".npz")]
+        except OSError:
+            return []
+    
+    def _load(self, key):
+        """
+        Returns the arrays stored on disk for "key", or None.
+        """
+        if self.cacheDir is None:
+            return None
+        
+        filename = self._getFilename(key)
+        if not os.path.isfile(filename):
+            return None
+        
+        try:
+            npzFile = numpy.load(filename)
+            try:
+                arrays = dict((name, npzFile[name]) for name in self.fields)
+            finally:
+                npzFile.close()
+                
+            # Touch the file so that it is pruned last
+            os.utime(filename, None)
+        except (IOError, OSError, ValueError, KeyError, zipfile.BadZipfile):
+            # Damaged or concurrently removed entry
+            return None
+        
+        for array in arrays.values():
+            array.flags.writeable = False
+        
+        return arrays
+        
+    def _save(self, key, arrays):
+        """
+        Save "arrays" on disk for "key" and prune the oldest entries.
+        """
+        if self.cacheDir is None:
+            return
+        
+        try:
+            # Write to a temporary file first, so other processes never see
+            # a partial entry
+            fd, tempFilename = tempfile.mkstemp(suffix = ".tmp", dir = self.cacheDir)
+            tempFile = os.fdopen(fd, "wb")
+            try:
+                numpy.savez(tempFile, **arrays)
+            finally:
+                tempFile.close()
+            
+            try:
+                os.rename(tempFilename, self._getFilename(key))
+            except OSError:
+                # Entry already saved by another process
+                os.remove(tempFilename)
+        except (IOError, OSError):
+            return
+        
+        filenames = self._getDiskFilenames()
+        if len(filenames) > self.maxDiskEntries:
+            try:
+                filenames.sort(key = os.path.getmtime)
+                for filename in filenames[:len(filenames) - self.maxDiskEntries]:
+                    os.remove(filename)
+            except OSError:
+                pass
@@ -0,0 +1,254 @@
+"""
+Synthetic BGA image generator for AutoBGA
+
+Created on: Oct 18, 2026
+Author: Tennessee Carmel-Veilleux (tcv -at- ro.boto.ca)
+Revision: $Rev$
+
+Copyright 2026 Tennessee Carmel-Veilleux
+
+Description:
+SyntheticBga class rendering images of BGA ball maps similar to the
+drawings found in datasheets, along with the ground truth array of
+occupied ball positions (the bgaArray GridLoader should find). This allows
+checking the accuracy of the image analysis and benchmarking it on large
+ball arrays, without needing real datasheets.
+
+The number of balls, resolution (pixels per ball pitch), ball shape,
+missing balls pattern, alignment crosses, center lines, gaussian noise and
+JPEG compression artefacts can all be configured. Images are rendered
+black on white, in grayscale.
+
+Usage: python SyntheticBga.py [options] NX NY output.png
+
+License:
+Copyright (c) 2026, Tennessee Carmel-Veilleux
+All rights reserved.
+
+Redistribution and use in source and binary forms, with or without
+modification, are permitted provided that the following conditions are
+met:
+
+    * Redistributions of source code must retain the above copyright
+notice, this list of conditions and the following disclaimer.
+    * Redistributions in binary form must reproduce the above
+copyright notice, this list of conditions and the following disclaimer
+in the documentation and/or other materials provided with the
+distribution.
+    * Neither the name of SONIA AUV nor the names of its contributors
+may be used to endorse or promote products derived from this software
+without specific prior written permission.
+
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+"AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+(INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+"""
+import optparse
+import StringIO
+import sys
+import numpy
+import Image
+import ImageDraw
+from autobga_core import fieldRanges
+
+# Ball shapes: filled disc, outlined ring, filled square or ring with a
+# cross (often used to mark pin A1 or special balls)
+BALL_SHAPES = ("disc", "ring", "square", "crossed")
+
+# Missing ball patterns: no missing balls, randomly missing balls, a
+# depopulated center area or every other ball missing (checkerboard)
+MISSING_PATTERNS = ("none", "random", "center", "checker")
+
+class SyntheticBga:
+    def __init__(self, nx, ny, pxPerBall = 16, ballShape = "ring", ballDiameter = 0.6,
+                 missingPattern = "random", missingFraction = 0.2, crosses = False,
+                 centerLines = False, noise = 0.0, jpegQuality = None, margins = (0, 0, 0, 0),
+                 seed = 0):
+        """
+        Synthetic image of a "nx" x "ny" BGA ball array.
+
+        Parameters:
+        * pxPerBall: resolution, in pixels per ball pitch (may be fractional)
+        * ballShape: one of BALL_SHAPES
+        * ballDiameter: ball diameter, as a fraction of the pitch
+        * missingPattern: one of MISSING_PATTERNS
+        * missingFraction: fraction of missing balls for the "random"
+          pattern, or of the array area depopulated for the "center" pattern
+        * crosses: if True, draw alignment crosses in the empty ball positions
+        * centerLines: if True, draw horizontal and vertical lines across
+          the whole image through its center
+        * noise: standard deviation of the gaussian noise added, in gray levels
+        * jpegQuality: if not None, the image goes through JPEG compression
+          at that quality (1-95), to add compression artefacts
+        * margins: (left, top, right, bottom) pixels added around the ball
+          array, to simulate an imprecise crop. Negative margins crop the
+          outer balls.
+        * seed: random seed, so that images can be reproduced
+
+        The ground truth is available as the "groundTruth" attribute: a
+        boolean [y, x] array, True where a ball is drawn.
+
+        Raises ValueError for invalid parameters.
+        """
+        for name, value in (("width", nx), ("height", ny)):
+            minValue, maxValue = fieldRanges[name]
+            if not (minValue <= value <= maxValue):
+                raise ValueError("Number of balls must be between %d and %d, got %d" % (minValue, maxValue, value))
+        if pxPerBall < 4:
+            raise ValueError("Resolution must be at least 4 pixels per ball, got %g" % pxPerBall)
+        if ballShape not in BALL_SHAPES:
+            raise ValueError("Unknown ball shape '%s'" % ballShape)
+        if missingPattern not in MISSING_PATTERNS:
+            raise ValueError("Unknown missing balls pattern '%s'" % missingPattern)
+
+        self.nx = nx
+        self.ny = ny
+        self.pxPerBall = pxPerBall
+        self.ballShape = ballShape
+        self.ballDiameter = ballDiameter
+        self.missingPattern = missingPattern
+        self.missingFraction = missingFraction
+        self.crosses = crosses
+        self.centerLines = centerLines
+        self.noise = noise
+        self.jpegQuality = jpegQuality
+        self.margins = tuple(margins)
+        self.seed = seed
+
+        left, top, right, bottom = self.margins
+        self.size = (int(round(nx * pxPerBall)) + left + right, int(round(ny * pxPerBall)) + top + bottom)
+        self.groundTruth = self._getGroundTruth()
+
+    def _getGroundTruth(self):
+        """
+        Returns the boolean [y, x] array of present balls for the
+        missing balls pattern.
+        """
+        nx, ny = self.nx, self.ny
+        if self.missingPattern == "random":
+            random = numpy.random.RandomState(self.seed)
+            return random.random_sample((ny, nx)) >= self.missingFraction
+        elif self.missingPattern == "center":
+            # Depopulated rectangle, centered, covering missingFraction of the area
+            scale = numpy.sqrt(self.missingFraction)
+            holeX = int(round(nx * scale))
+            holeY = int(round(ny * scale))
+            groundTruth = numpy.ones((ny, nx), bool)
+            groundTruth[(ny - holeY) // 2:(ny - holeY) // 2 + holeY, (nx - holeX) // 2:(nx - holeX) // 2 + holeX] = False
+            return groundTruth
+        elif self.missingPattern == "checker":
+            yIdx, xIdx = numpy.indices((ny, nx))
+            return ((xIdx + yIdx) % 2) == 0
+        else:
+            return numpy.ones((ny, nx), bool)
+
+    def render(self):
+        """
+        Render the image. Returns a new grayscale ("L") PIL image of
+        "size" pixels, with black balls on a white background.
+        """
+        image = Image.new("L", self.size, 255)
+        gc = ImageDraw.Draw(image)
+        pitch = float(self.pxPerBall)
+        radius = pitch * self.ballDiameter / 2.0
+        lineWidth = max(1, int(round(pitch / 16.0)))
+        left, top, right, bottom = self.margins
+
+        for yIdx in range(self.ny):
+            cy = top + (yIdx + 0.5) * pitch
+            for xIdx in range(self.nx):
+                cx = left + (xIdx + 0.5) * pitch
+                if self.groundTruth[yIdx, xIdx]:
+                    self._drawBall(gc, cx, cy, radius, lineWidth)
+                elif self.crosses:
+                    self._drawCross(gc, cx, cy, radius, lineWidth)
+
+        if self.centerLines:
+            sx, sy = self.size
+            self._drawCross(gc, sx / 2.0, sy / 2.0, max(sx, sy), lineWidth)
+        del gc
+
+        if self.noise > 0:
+            random = numpy.random.RandomState(self.seed + 1)
+            pixels = numpy.asarray(image, dtype = numpy.float32)
+            pixels = pixels + random.normal(0.0, self.noise, pixels.shape)
+            image = Image.fromarray(numpy.clip(pixels, 0, 255).astype(numpy.uint8), "L")
+
+        if self.jpegQuality is not None:
+            jpegData = StringIO.StringIO()
+            image.save(jpegData, "JPEG", quality = self.jpegQuality)
+            jpegData.seek(0)
+            image = Image.open(jpegData).convert("L")
+
+        return image
+
+    def save(self, filename):
+        """
+        Render the image and save it to "filename", in the format given
+        by its extension. Use a lossless format (ie: PNG) to keep exactly
+        the noise and JPEG artefacts of render().
+        """
+        self.render().save(filename)
+
+    def _drawBall(self, gc, cx, cy, radius, lineWidth):
+        box = (cx - radius, cy - radius, cx + radius, cy + radius)
+        if self.ballShape == "square":
+            gc.rectangle(box, fill = 0)
+        else:
+            gc.ellipse(box, fill = 0)
+            if self.ballShape in ("ring", "crossed"):
+                inner = radius - lineWidth
+                gc.ellipse((cx - inner, cy - inner, cx + inner, cy + inner), fill = 255)
+            if self.ballShape == "crossed":
+                self._drawCross(gc, cx, cy, radius, lineWidth)
+
+    def _drawCross(self, gc, cx, cy, halfLength, lineWidth):
+        gc.line([(cx - halfLength, cy), (cx + halfLength, cy)], fill = 0, width = lineWidth)
+        gc.line([(cx, cy - halfLength), (cx, cy + halfLength)], fill = 0, width = lineWidth)
+
+def main(argv):
+    parser = optparse.OptionParser(usage = "%prog [options] NX NY output.png")
+    parser.add_option("-r", "--resolution", dest = "pxPerBall", type = "float", default = 16,
+                      help = "pixels per ball pitch (default: 16)")
+    parser.add_option("-s", "--shape", dest = "ballShape", choices = BALL_SHAPES, default = "ring",
+                      help = "ball shape: %s (default: ring)" % ", ".join(BALL_SHAPES))
+    parser.add_option("-m", "--missing", dest = "missingPattern", choices = MISSING_PATTERNS, default = "random",
+                      help = "missing balls pattern: %s (default: random)" % ", ".join(MISSING_PATTERNS))
+    parser.add_option("-f", "--missing-fraction", dest = "missingFraction", type = "float", default = 0.2,
+                      help = "fraction of missing balls or depopulated area (default: 0.2)")
+    parser.add_option("--crosses", dest = "crosses", action = "store_true", default = False,
+                      help = "draw alignment crosses in empty ball positions")
+    parser.add_option("--center-lines", dest = "centerLines", action = "store_true", default = False,
+                      help = "draw center lines across the image")
+    parser.add_option("-n", "--noise", dest = "noise", type = "float", default = 0.0,
+                      help = "gaussian noise standard deviation, in gray levels (default: 0)")
+    parser.add_option("-q", "--jpeg-quality", dest = "jpegQuality", type = "int", default = None,
+                      help = "add JPEG artefacts at this quality (default: none)")
+    parser.add_option("--margins", dest = "margins", type = "int", nargs = 4, default = (0, 0, 0, 0),
+                      help = "LEFT TOP RIGHT BOTTOM pixels added around the array, negative to crop (default: 0 0 0 0)")
+    parser.add_option("--seed", dest = "seed", type = "int", default = 0,
+                      help = "random seed (default: 0)")
+    (options, args) = parser.parse_args(argv)
+
+    if len(args) != 3:
+        parser.error("NX, NY and an output filename are needed")
+
+    try:
+        synthetic = SyntheticBga(int(args[0]), int(args[1]), **options.__dict__)
+        synthetic.save(args[2])
+    except (ValueError, IOError), e:
+        parser.error(str(e))
+
+    print("%s: %d x %d balls, %d present" % (args[2], synthetic.nx, synthetic.ny, numpy.count_nonzero(synthetic.groundTruth)))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,469 @@
+"""
+Histogram thresholding functions for AutoBGA
+
+Created on: Oct 18, 2026
+Author: Tennessee Carmel-Veilleux (tcv -at- ro.boto.ca)
+Revision: $Rev$
+
+Copyright 2026 Tennessee Carmel-Veilleux
+
+Description:
+Optimal thresholding functions used by GridLoader to split bins into
+"ball" and "no ball" classes. Otsu's method is implemented with cumulative
+sums, so that it runs in O(L) for a histogram of L bins, and a multi-level
+variant is provided for images with both faint and strong pad shading.
+
+All thresholds can be computed for a whole stack of arrays at once (ie: the
+bins of thousands of images in batch mode): histograms, Otsu's method and
+the iterative mean thresholding of Gonzalez and Woods run on (K, n) arrays,
+without any Python loop over the arrays of the stack. The confidence of
+every classification is its distance from the threshold, relative to the
+spread of its class, so that doubtful bins can be reviewed by hand.
+
+Algorithms described in Gonzalez and Woods, "Digital Image Processing, 3rd ed",
+Prentice Hall, p742-747 (Otsu's method) and 2nd ed, p599-600 (iterative
+mean thresholding).
+
+License:
+Copyright (c) 2026, Tennessee Carmel-Veilleux
+All rights reserved.
+
+Redistribution and use in source and binary forms, with or without
+modification, are permitted provided that the following conditions are
+met:
+
+    * Redistributions of source code must retain the above copyright
+notice, this list of conditions and the following disclaimer.
+    * Redistributions in binary form must reproduce the above
+copyright notice, this list of conditions and the following disclaimer
+in the documentation and/or other materials provided with the
+distribution.
+    * Neither the name of SONIA AUV nor the names of its contributors
+may be used to endorse or promote products derived from this software
+without specific prior written permission.
+
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+"AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+(INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+"""
+import itertools
+import numpy
+
+def _stack_values(stack, padding = 0.0):
+    """
+    Flatten the K arrays of "stack" (a sequence of arrays, or an array
+    whose first axis indexes the arrays) to a (K, n) array.
+
+    Returns (values, valid, counts): the (K, n) array of values, padded
+    with "padding", a (K, n) boolean mask of the actual values (None if
+    all arrays have the same size, so there is no padding), and the number
+    of values of every array. Values are float32 if all arrays are float32,
+    float64 otherwise.
+    """
+    arrays = [numpy.ravel(array) for array in stack]
+    counts = numpy.array([len(array) for array in arrays], dtype = numpy.intp)
+    if all(array.dtype == numpy.float32 for array in arrays):
+        dtype = numpy.float32
+    else:
+        dtype = numpy.float64
+
+    if len(arrays) == 0 or numpy.all(counts == counts[0]):
+        values = numpy.array(arrays, dtype = dtype).reshape(len(arrays), -1)
+        return (values, None, counts)
+
+    values = numpy.empty((len(arrays), numpy.max(counts)), dtype)
+    values.fill(padding)
+    valid = numpy.arange(values.shape[1])[numpy.newaxis, :] < counts[:, numpy.newaxis]
+    values[valid] = numpy.concatenate(arrays)
+    return (values, valid, counts)
+
+def histograms(stack, nBins = 64):
+    """
+    Histograms of "nBins" bins of all the arrays of "stack" (a sequence of
+    arrays, or an array whose first axis indexes the arrays), computed
+    together.
+
+    Every histogram spans the range of its own array, with the same bins
+    (and the same rounding, for float32 and float64 values) as
+    numpy.histogram(array, nBins). The arrays are concatenated, and their
+    ranges are found with segmented reductions, so no padding is needed.
+
+    Returns (hists, edges): the (K, nBins) counts and (K, nBins + 1) bin
+    edges of the K arrays.
+    """
+    arrays = [numpy.ravel(array) for array in stack]
+    K = len(arrays)
+    counts = numpy.array([len(array) for array in arrays], dtype = numpy.intp)
+    if all(array.dtype == numpy.float32 for array in arrays):
+        dtype = numpy.float32
+    else:
+        dtype = numpy.float64
+    values = numpy.concatenate(arrays + [numpy.zeros(0, dtype)]).astype(dtype, copy = False)
+    groups = numpy.repeat(numpy.arange(K), counts)
+
+    # Empty arrays span [0, 1], constant arrays [value - 0.5, value + 0.5]
+    first = numpy.zeros(K, dtype)
+    last = numpy.ones(K, dtype)
+    nonEmpty = counts > 0
+    if numpy.any(nonEmpty):
+        offsets = (numpy.cumsum(counts) - counts)[nonEmpty]
+        first[nonEmpty] = numpy.minimum.reduceat(values, offsets)
+        last[nonEmpty] = numpy.maximum.reduceat(values, offsets)
+    equal = first == last
+    firstEdge = numpy.where(equal, first.astype(numpy.float64) - 0.5, first.astype(numpy.float64))
+    lastEdge = numpy.where(equal, last.astype(numpy.float64) + 0.5, last.astype(numpy.float64))
+
+    # As numpy.linspace() and numpy.histogram() do: edges are computed in
+    # float64, and indices in the precision of the values
+    step = (lastEdge - firstEdge) / nBins
+    edges = numpy.arange(nBins + 1)[numpy.newaxis, :] * step[:, numpy.newaxis] + firstEdge[:, numpy.newaxis]
+    edges[:, -1] = lastEdge
+    edges = edges.astype(dtype)
+    norm = (nBins / numpy.where(equal, lastEdge - firstEdge, (last - first).astype(dtype))).astype(dtype)
+
+    indices = ((values - firstEdge.astype(dtype)[groups]) * norm[groups]).astype(numpy.intp)
+    numpy.minimum(indices, nBins - 1, out = indices)
+
+    # Fix the indices of values within rounding errors of their bin edges
+    flatEdges = numpy.ravel(edges)
+    keys = indices + groups * (nBins + 1)
+    keys[values < flatEdges[keys]] -= 1
+    keys[(values >= flatEdges[keys + 1]) & (keys - groups * (nBins + 1) != nBins - 1)] += 1
+    hists = numpy.bincount(keys - groups, minlength = K * nBins).reshape(K, nBins)
+
+    return (hists, edges)
+
+def otsu_histograms(hists):
+    """
+    Otsu's method on all the histograms of the (K, L) array "hists" at
+    once, in O(K * L). See otsu_histogram().
+
+    Returns (kStar, varB): arrays of the K optimal histogram indices and
+    maximum between-class variances.
+    """
+    H = numpy.asarray(hists, dtype = numpy.float64)
+    L = H.shape[1]
+
+    # Step 1: normalized histograms
+    hist_pi = H / numpy.sum(H, axis = 1)[:, numpy.newaxis]
+    levels = numpy.arange(L)
+
+    # Step 4: global means m_g (eq 10.3-9)
+    m_g = numpy.sum(levels * hist_pi, axis = 1)
+
+    # Steps 2 and 3: cumulative sums p1(k) (eq 10.3-4) and m(k) (eq 10.3-8)
+    p1_k = numpy.zeros(H.shape, numpy.float32)
+    m_k = numpy.zeros(H.shape, numpy.float32)
+    p1_k[:, 1:] = numpy.cumsum(hist_pi, axis = 1)[:, :-1]
+    m_k[:, 1:] = numpy.cumsum(levels * hist_pi, axis = 1)[:, :-1]
+
+    # Step 5: var_B(k) (eq 10.3-17)
+    denom = (p1_k * (1 - p1_k))
+    denom[denom == 0] = 1 # Eliminate null denominators
+    var_B = ((m_g.astype(numpy.float32)[:, numpy.newaxis] * p1_k - m_k) ** 2.0) / denom
+
+    # Step 6: k* from the maxima of var_B
+    maxval = numpy.max(var_B, axis = 1).astype(numpy.float64)
+    low = (maxval * 0.99999).astype(numpy.float32)[:, numpy.newaxis]
+    high = (maxval * 1.00001).astype(numpy.float32)[:, numpy.newaxis]
+    isMax = numpy.logical_and(var_B >= low, var_B <= high)
+
+    return (numpy.sum(isMax * levels, axis = 1) / numpy.sum(isMax, axis = 1).astype(numpy.float64), maxval)
+
+def otsu_histogram(hist):
+    """
+    Otsu's method on histogram "hist" of L bins, in O(L).
+
+    p1(k) and m(k) (eq 10.3-4 and 10.3-8) are obtained with cumulative
+    sums instead of re-summing the histogram for every k. As in the
+    original implementation, p1(k) and m(k) cover the bins before k,
+    and all maxima of var_B within 0.001% of the global maximum are
+    averaged to find k*.
+
+    Returns (kStar, varB): the (possibly fractional) optimal histogram
+    index and the maximum between-class variance, in squared bin units.
+    """
+    kStar, varB = otsu_histograms(numpy.asarray(hist)[numpy.newaxis, :])
+    return (kStar[0], float(varB[0]))
+
+def otsu_thresholds(stack, nBins = 64):
+    """
+    Otsu's method on all the arrays of "stack" (see _stack_values()) at
+    once, using histograms of "nBins" bins. See otsu_threshold().
+
+    Returns (thresholds, varB): arrays of the K thresholds and between-class
+    variances.
+    """
+    hists, edges = histograms(stack, nBins)
+    kStar, varB = otsu_histograms(hists)
+
+    binWidths = (edges[:, 1] - edges[:, 0]).astype(numpy.float64)
+    thresholds = edges[numpy.arange(len(edges)), numpy.round(kStar).astype(numpy.intp)]
+    return (thresholds, varB * binWidths * binWidths)
+
+def otsu_threshold(values, nBins = 64):
+    """
+    Otsu's method on an array of "values", using a histogram of
+    "nBins" bins.
+
+    Returns (threshold, varB): values >= threshold belong to the upper
+    class, and varB is the between-class variance obtained with that
+    split, in the units of "values" squared. Dividing varB by the variance
+    of "values" gives the separability (between 0 and 1) of the two classes,
+    which can be used to judge how trustworthy the threshold is.
+    """
+    thresholds, varB = otsu_thresholds([values], nBins)
+    return (thresholds[0], varB[0])
+
+def iterative_mean_thresholds(stack, initial = 0.5, tolerance = 0.01, maxIterations = 100):
+    """
+    Basic global thresholding (Gonzalez and Woods, 2nd ed, p599-600) of
+    all the arrays of "stack" (see _stack_values()) at once.
+
+    Starting from threshold "initial", every array is split in the values
+    above the threshold (G1) and the others (G2), and the next threshold is
+    the average of the means of both groups (an empty group has a mean of
+    0). An array is done once its threshold moves by "tolerance" or less,
+    or after "maxIterations" iterations.
+
+    The iterations only run array operations on the whole stack, in
+    buffers allocated once. No masked copy of the values is needed: with
+    t the threshold, the sum of min(value, t) is the sum of G2 plus t for
+    every value of G1. Shorter arrays are padded with +inf, which is
+    always in G1 and cancels out of the sum of G2.
+
+    Returns an array of the K thresholds.
+    """
+    values, valid, counts = _stack_values(stack, numpy.inf)
+    K, n = values.shape
+    nPadding = n - counts
+    if valid is not None:
+        totals = numpy.sum(numpy.where(valid, values, 0), axis = 1, dtype = numpy.float64)
+    else:
+        totals = numpy.sum(values, axis = 1, dtype = numpy.float64)
+
+    # Thresholds, and their value in the precision of the values, which
+    # is used to compare them
+    thresholds = numpy.empty(K)
+    thresholds.fill(initial)
+    compared = numpy.empty((K, 1), values.dtype)
+    active = numpy.ones(K, bool)
+
+    above = numpy.empty((K, n), bool)
+    work = numpy.empty((K, n), values.dtype)
+    nAbove = numpy.empty(K, numpy.intp)
+    sumMin = numpy.empty(K, numpy.float64)
+
+    for iteration in range(maxIterations):
+        compared[:, 0] = thresholds
+        t = compared[:, 0].astype(numpy.float64)
+
+        # Segment every array in G1 and G2, and sum G2
+        numpy.greater(values, compared, out = above)
+        numpy.sum(above, axis = 1, out = nAbove)
+        numpy.minimum(values, compared, out = work)
+        numpy.sum(work, axis = 1, dtype = numpy.float64, out = sumMin)
+        count1 = nAbove - nPadding
+        count2 = counts - count1
+        sum2 = sumMin - t * nAbove
+
+        # Average levels mu1 and mu2, and new thresholds
+        mu1 = numpy.where(count1 > 0, (totals - sum2) / numpy.maximum(count1, 1), 0.0)
+        mu2 = numpy.where(count2 > 0, sum2 / numpy.maximum(count2, 1), 0.0)
+        newThresholds = 0.5 * (mu1 + mu2)
+
+        delta = numpy.abs(newThresholds - thresholds)
+        thresholds[active] = newThresholds[active]
+        active &= delta > tolerance
+        if not numpy.any(active):
+            break
+
+    return thresholds
+
+def otsu_multilevel(values, nLevels = 3, nBins = 64):
+    """
+    Multi-level Otsu's method (Gonzalez and Woods, p746-747): split
+    "values" in "nLevels" classes by maximizing the between-class variance
+    over all combinations of (nLevels - 1) thresholds on a histogram of
+    "nBins" bins.
+
+    Class weights and means are looked-up from cumulative sums of the
+    histogram, so each combination costs O(nLevels). This is useful for
+    images where some pads are faintly shaded and others strongly shaded:
+    with nLevels = 3, the first threshold separates empty bins from faint
+    pads.
+
+    Returns (thresholds, varB): a list of (nLevels - 1) increasing
+    thresholds (class i contains values in [thresholds[i - 1], thresholds[i]))
+    and the between-class variance, in the units of "values" squared.
+    """
+    if nLevels < 2:
+        raise ValueError("Multi-level Otsu needs at least 2 levels, got %d" % nLevels)
+
+    (H, edges) = numpy.histogram(numpy.ravel(values), nBins)
+    hist_pi = H / float(numpy.sum(H))
+    levels = numpy.arange(nBins)
+
+    # Cumulative weight and first moment, with a leading 0 so that the
+    # class covering bins [a, b) has weight P[b] - P[a]
+    P = numpy.concatenate(([0.0], numpy.cumsum(hist_pi)))
+    S = numpy.concatenate(([0.0], numpy.cumsum(levels * hist_pi)))
+    m_g = S[-1]
+
+    # All candidate threshold combinations, bounded by the histogram ends
+    splits = numpy.array(list(itertools.combinations(range(1, nBins), nLevels - 1)), dtype = numpy.intp)
+    nCombinations = splits.shape[0]
+    bounds = numpy.hstack((numpy.zeros((nCombinations, 1), numpy.intp), splits,
+                           numpy.empty((nCombinations, 1), numpy.intp)))
+    bounds[:, -1] = nBins
+
+    # Between-class variance: sum over classes of w * (m - m_g) ** 2
+    w = P[bounds[:, 1:]] - P[bounds[:, :-1]]
+    s = S[bounds[:, 1:]] - S[bounds[:, :-1]]
+    nonEmpty = w > 0
+    safeW = numpy.where(nonEmpty, w, 1.0)
+    var_B = numpy.sum(numpy.where(nonEmpty, (s - m_g * w) ** 2 / safeW, 0.0), axis = 1)
+
+    best = numpy.argmax(var_B)
+    binWidth = edges[1] - edges[0]
+    thresholds = [edges[k] for k in splits[best]]
+    return (thresholds, var_B[best] * binWidth * binWidth)
+
+def threshold_confidence(values, threshold, minSpread = 0.1):
+    """
+    Confidence of the classification of every element of "values" by
+    "threshold": values at or above the threshold are one class, the others
+    the second class. The confidence of a value is its distance from the
+    threshold, divided by the standard deviation of its class. A value more
+    than one class spread away from the threshold can hardly be on the
+    wrong side of it, whereas a confidence near 0 means the value could as
+    well belong to the other class.
+
+    Spreads are at least "minSpread" times the distance between the means
+    of both classes, so that a class of a few identical values does not
+    give infinite confidence. If all values are in one class, its spread is
+    used for both (or 1.0 if all values are equal).
+
+    Returns a float32 array of the shape of "values".
+    """
+    values = numpy.asarray(values, numpy.float64)
+    above = values >= threshold
+    nAbove = numpy.count_nonzero(above)
+    nBelow = values.size - nAbove
+
+    if nAbove == 0 or nBelow == 0:
+        spread = numpy.std(values) if values.size else 0.0
+        spreadAbove = spreadBelow = spread if spread > 0.0 else 1.0
+    else:
+        valuesAbove = values[above]
+        valuesBelow = values[~above]
+        floor = minSpread * (numpy.mean(valuesAbove) - numpy.mean(valuesBelow))
+        spreadAbove = max(numpy.std(valuesAbove), floor)
+        spreadBelow = max(numpy.std(valuesBelow), floor)
+
+    confidence = numpy.abs(values - threshold) / numpy.where(above, spreadAbove, spreadBelow)
+    return confidence.astype(numpy.float32)
+
+def _reference_iterative_mean_threshold(values):
+    """
+    Original loop implementation of the iterative mean thresholding of a
+    single array, used to check and benchmark iterative_mean_thresholds().
+    """
+    flatValues = numpy.ravel(values)
+    threshold = 0.5
+    delta = 1000000.0
+    nTrials = 0
+    while delta > 0.01 and nTrials < 100:
+        G1 = flatValues[numpy.nonzero(flatValues > threshold)]
+        G2 = flatValues[numpy.nonzero(flatValues <= threshold)]
+        mu1 = numpy.mean(G1) if len(G1) else 0.0
+        mu2 = numpy.mean(G2) if len(G2) else 0.0
+
+        newThreshold = 0.5 * (mu1 + mu2)
+        nTrials += 1
+        delta = abs(newThreshold - threshold)
+        threshold = newThreshold
+
+    return newThreshold
+
+def _reference_otsu_histogram(hist):
+    """
+    Original O(L^2) loop implementation of otsu_histogram(), used to
+    check the closed-form version.
+    """
+    L = len(hist)
+    H = numpy.asarray(hist) * 1.0
+    hist_pi = H / numpy.sum(H)
+    m_g = numpy.sum(numpy.arange(L) * hist_pi)
+
+    p1_k = numpy.zeros((1, L), numpy.float32)
+    m_k = numpy.zeros((1, L), numpy.float32)
+    for k in range(L):
+        p1_k[0, k] = numpy.sum(hist_pi[0:k])
+        m_k[0, k] = numpy.sum(numpy.arange(k) * hist_pi[0:k])
+
+    denom = (p1_k * (1 - p1_k))
+    denom[numpy.nonzero(denom == 0)] = 1
+    var_B = ((m_g * p1_k - m_k) ** 2.0) / denom
+
+    maxval = numpy.max(var_B)
+    maxidx = numpy.nonzero(numpy.logical_and(var_B >= (maxval * 0.99999), var_B <= (maxval * 1.00001)))[1]
+    return (numpy.mean(maxidx), float(maxval))
+
+if __name__ == "__main__":
+    # Self-check: closed-form Otsu must match the original loop implementation
+    random = numpy.random.RandomState(1234)
+    nChecked = 0
+    for nBins in (2, 16, 64, 256):
+        for trial in range(200):
+            # Bimodal data similar to bin contents: empty bins near 0, balls higher
+            values = numpy.concatenate((random.beta(1.0, 20.0, random.randint(1, 500)),
+                                        random.normal(random.uniform(0.2, 0.8), 0.05, random.randint(1, 500))))
+            H, edges = numpy.histogram(values, nBins)
+            fast = otsu_histogram(H)
+            reference = _reference_otsu_histogram(H)
+            assert fast[0] == reference[0], (nBins, trial, fast, reference)
+            assert abs(fast[1] - reference[1]) <= 1e-5 * max(1.0, reference[1]), (nBins, trial, fast, reference)
+            nChecked += 1
+
+    # Two-level multi-level Otsu must agree with the regular method
+    values = numpy.concatenate((random.normal(0.1, 0.02, 300), random.normal(0.6, 0.05, 200)))
+    threshold, varB = otsu_threshold(values)
+    thresholds, varBMulti = otsu_multilevel(values, 2)
+    assert 0.1 < threshold < 0.6 and 0.1 < thresholds[0] < 0.6
+
+    # Three-level multi-level Otsu must find both faint and strong pads
+    values = numpy.concatenate((random.normal(0.05, 0.01, 300), random.normal(0.3, 0.02, 100), random.normal(0.7, 0.02, 100)))
+    thresholds, varB = otsu_multilevel(values, 3)
+    assert 0.05 < thresholds[0] < 0.3 < thresholds[1] < 0.7, thresholds
+
+    # Batch functions must match numpy.histogram() and the original
+    # iterative mean thresholding loop on every array of a ragged stack
+    for dtype in (numpy.float32, numpy.float64):
+        stack = [random.beta(1.0, 20.0, random.randint(1, 500)).astype(dtype) for i in range(20)]
+        stack += [random.randint(0, 20, 300).astype(dtype) / dtype(19.0), numpy.ones(10, dtype)]
+        hists, edges = histograms(stack, 64)
+        thresholds = iterative_mean_thresholds(stack)
+        for values, hist, edge, threshold in zip(stack, hists, edges, thresholds):
+            H, E = numpy.histogram(values, 64)
+            assert numpy.array_equal(H, hist) and numpy.array_equal(E, edge), (dtype, values)
+            reference = _reference_iterative_mean_threshold(values)
+            assert numpy.array_equal(values > threshold, values > reference), (dtype, threshold, reference)
+            nChecked += 1
+
+    # Confidence must be lowest close to the threshold, and finite for
+    # degenerate classes
+    values = numpy.concatenate((numpy.zeros(50), random.normal(0.6, 0.05, 50), [0.32]))
+    confidence = threshold_confidence(values, 0.3)
+    assert numpy.argmin(confidence) == 100 and numpy.all(numpy.isfinite(confidence)), confidence
+    assert numpy.all(numpy.isfinite(threshold_confidence(numpy.ones(10), 0.5)))
+
+    print("OK: %d histograms checked" % nChecked)
@@ -0,0 +1,519 @@
+#!/bin/env python
+"""
+AutoBGA batch processing front-end
+
+Created on: Oct 18, 2026
+Author: Tennessee Carmel-Veilleux (tcv -at- ro.boto.ca)
+Revision: $Rev$
+
+Copyright 2026 Tennessee Carmel-Veilleux
+
+Description:
+Headless batch front-end for AutoBGA. Converts a whole manifest of BGA
+ball map images to footprints, without the GUI, using all processor cores.
+
+The manifest is either a CSV file with a header row, or a JSON file
+containing a list of objects, with the following columns/keys:
+* filename: input image (relative to the manifest's directory)
+* nx, ny: number of balls on X and Y axis
+* pitch: ball pitch (mm)
+* padDiameter: pad diameter (mm)
+* pinA1Corner: pin A1 corner (NW, NE, SW, SE). Default: SE
+* view: "Top" or "Bottom" picture view. Default: Bottom
+* format: "EAGLE SCR", "XML" or "TSV (Excel)". Default: EAGLE SCR
+* packageWidth, packageHeight: body size (mm). Default: ball array size
+* output: output filename (optional, relative to the output directory).
+  Default: input image name with the format's extension, plus the row
+  index if several rows have the same input image name
+* name: footprint/package name (optional)
+* engine: image analysis engine, "bins" or "components". Default: bins
+
+With the --library option, all footprints are written to a single
+library file instead: an XML footprint library (.xml) or an EAGLE script
+creating one package per footprint (.scr), depending on the library's
+file extension. Footprints are generated in parallel and merged in
+manifest order. Footprint names default to the input image names, plus
+the row index if several rows have the same input image name. Rows
+repeating the name of an earlier footprint are invalid.
+
+With the --cache-dir option, image analysis results are kept in a cache
+directory, so that running a manifest again with other pitches, pad
+sizes, corners or formats for the same images skips the image analysis.
+
+The --trace and --profile-dir options enable the instrumentation of the
+processing (see the Instrumentation module): a JSON trace of all jobs,
+for Chrome's about:tracing page, and cProfile files of the pipeline stages.
+
+The balls whose detection is doubtful (see autobga_core.get_review_bins())
+are listed after the outcome of every job, so that only those need to be
+checked on the input images.
+
+Usage: autobga_batch.py [options] manifest
+
+License:
+Copyright (c) 2026, Tennessee Carmel-Veilleux
+All rights reserved.
+
+Redistribution and use in source and binary forms, with or without
+modification, are permitted provided that the following conditions are
+met:
+
+    * Redistributions of source code must retain the above copyright
+notice, this list of conditions and the following disclaimer.
+    * Redistributions in binary form must reproduce the above
+copyright notice, this list of conditions and the following disclaimer
+in the documentation and/or other materials provided with the
+distribution.
+    * Neither the name of SONIA AUV nor the names of its contributors
+may be used to endorse or promote products derived from this software
+without specific prior written permission.
+
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+"AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+(INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+"""
+import collections
+import csv
+import json
+import multiprocessing
+import optparse
+import os
+import StringIO
+import sys
+import time
+import autobga_core
+import GridLoader
+import Instrumentation
+import ResultCache
+from autobga_core import VERSION
+
+# Analysis results cache of the current process, see getCache()
+_cache = None
+
+class BatchJob:
+    def __init__(self, index, row, baseDir, outputDir, cacheDir = None):
+        """
+        A single conversion job, built from manifest row "row" (a dict).
+        Relative input filenames are resolved against "baseDir" and
+        relative output filenames against "outputDir". Analysis results
+        are cached in "cacheDir", if given.
+
+        Raises ValueError if the row is missing fields or has invalid values.
+        """
+        self.index = index
+        self.cacheDir = cacheDir
+
+        # Rows of JSON manifests can hold values of any type (ie: "nx": null),
+        # so conversion errors of all kinds are reported as invalid rows
+        try:
+            if not row["filename"]:
+                raise ValueError("Empty filename")
+            self.filename = os.path.join(baseDir, row["filename"])
+            width = int(row["nx"])
+            height = int(row["ny"])
+            pitch = float(row["pitch"])
+            padDiameter = float(row["padDiameter"])
+            
+            pinA1Corner = str(row.get("pinA1Corner") or "SE").upper()
+            pictureView = str(row.get("view") or "Bottom")
+            outputFormat = str(row.get("format") or "EAGLE SCR")
+            analysisEngine = str(row.get("engine") or "bins")
+            packageWidth = float(row.get("packageWidth") or (width * pitch))
+            packageHeight = float(row.get("packageHeight") or (height * pitch))
+            footprintName = str(row.get("name") or "")
+            output = row.get("output")
+            if output:
+                output = str(output)
+        except KeyError, e:
+            raise ValueError("Missing field %s" % str(e))
+        except (TypeError, ValueError, AttributeError), e:
+            raise ValueError("Invalid value: %s" % str(e))
+
+        if outputFormat not in autobga_core.fileFormatExtensions:
+            raise ValueError("Unknown output format '%s'" % outputFormat)
+
+        if analysisEngine not in GridLoader.GridLoader.ENGINES:
+            raise ValueError("Unknown analysis engine '%s'" % analysisEngine)
+
+        # Default output and footprint names may collide, see readManifest()
+        self.isDefaultOutput = not output
+        self.isDefaultName = not footprintName
+        if not output:
+            output = os.path.splitext(os.path.basename(self.filename))[0] + autobga_core.fileFormatExtensions[outputFormat]
+        self.outFilename = os.path.join(outputDir, output)
+
+        self.job = autobga_core.FootprintJob(width = width,
+                                             height = height,
+                                             packageWidth = packageWidth,
+                                             packageHeight = packageHeight,
+                                             pitch = pitch,
+                                             padDiameter = padDiameter,
+                                             pinA1Corner = pinA1Corner,
+                                             pictureView = pictureView,
+                                             outputFormat = outputFormat,
+                                             inFilename = self.filename,
+                                             footprintName = footprintName,
+                                             analysisEngine = analysisEngine)
+
+def readManifest(manifestFilename, outputDir, cacheDir = None, library = False):
+    """
+    Read a CSV or JSON manifest (by file extension). The jobs use analysis
+    results cache directory "cacheDir", if given.
+    
+    Rows are checked not to overwrite each other's output file (see
+    checkOutputFilenames()) or, if "library" is True, each other's
+    footprint in the library (see checkFootprintNames()).
+
+    Returns a (jobs, errors) tuple where "jobs" is a list of BatchJob and
+    "errors" is a list of (index, message) for invalid rows.
+    """
+    baseDir = os.path.dirname(os.path.abspath(manifestFilename))
+
+    if os.path.splitext(manifestFilename)[1].lower() == ".json":
+        with open(manifestFilename, "r") as manifestFile:
+            rows = json.load(manifestFile)
+    else:
+        with open(manifestFilename, "rb") as manifestFile:
+            rows = [row for row in csv.DictReader(manifestFile)]
+
+    jobs = []
+    errors = []
+    for index, row in enumerate(rows):
+        try:
+            jobs.append(BatchJob(index, row, baseDir, outputDir, cacheDir))
+        except ValueError, e:
+            errors.append((index, str(e)))
+            
+    if library:
+        jobs, nameErrors = checkFootprintNames(jobs)
+    else:
+        jobs, nameErrors = checkOutputFilenames(jobs)
+    errors = sorted(errors + nameErrors)
+
+    return (jobs, errors)
+
+def checkOutputFilenames(jobs):
+    """
+    Make sure no two "jobs" write the same output file. Default output
+    names come from the input basename, so "a/x.png" and "b/x.png" would
+    collide: the row index is added to such names. Other duplicates are
+    invalid rows.
+    
+    Returns a (jobs, errors) tuple like readManifest().
+    """
+    def getName(job):
+        return job.outFilename
+    
+    def setName(job, name):
+        job.outFilename = name
+        
+    def getKey(filename):
+        return os.path.normcase(os.path.abspath(filename))
+    
+    return _checkUniqueNames(jobs, getName, setName, lambda job: job.isDefaultOutput, getKey,
+                             "Output %s already written by row %d")
+
+def checkFootprintNames(jobs):
+    """
+    Make sure no two "jobs" write the same footprint to a library.
+    Footprint names default to the input basename, so variants of an image
+    (ie: other pitch or corner) or "a/x.png" and "b/x.png" would collide:
+    the row index is added to such names. Other duplicates are invalid
+    rows. Names are compared regardless of case, as EAGLE does.
+    
+    Returns a (jobs, errors) tuple like readManifest().
+    """
+    for job in jobs:
+        if job.isDefaultName:
+            job.job.footprintName = os.path.splitext(os.path.basename(job.filename))[0]
+            
+    def getName(job):
+        return job.job.footprintName
+    
+    def setName(job, name):
+        job.job.footprintName = name
+        
+    return _checkUniqueNames(jobs, getName, setName, lambda job: job.isDefaultName, lambda name: name.upper(),
+                             "Footprint %s already written by row %d")
+
+def _checkUniqueNames(jobs, getName, setName, isDefault, getKey, errorFormat):
+    """
+    Common part of checkOutputFilenames() and checkFootprintNames(): the
+    names (getName(job)) of "jobs" that collide, once compared with
+    getKey(name), get the row index added if isDefault(job). Rows whose
+    name is still used by an earlier row are invalid, and are reported
+    with "errorFormat" % (name, earlierIndex).
+    
+    Returns a (jobs, errors) tuple like readManifest().
+    """
+    nameCounts = collections.Counter([getKey(getName(job)) for job in jobs])
+    for job in jobs:
+        if isDefault(job) and nameCounts[getKey(getName(job))] > 1:
+            base, extension = os.path.splitext(getName(job))
+            setName(job, "%s_%d%s" % (base, job.index, extension))
+    
+    usedNames = {}
+    validJobs = []
+    errors = []
+    for job in jobs:
+        key = getKey(getName(job))
+        if key in usedNames:
+            errors.append((job.index, errorFormat % (getName(job), usedNames[key])))
+        else:
+            usedNames[key] = job.index
+            validJobs.append(job)
+            
+    return (validJobs, errors)
+
+def getCache(cacheDir):
+    """
+    Returns the analysis results cache of the current process for
+    directory "cacheDir", or None if "cacheDir" is None. The cache is
+    created on first use in each worker process.
+    """
+    global _cache
+
+    if cacheDir is None:
+        return None
+
+    if _cache is None or _cache.cacheDir != cacheDir:
+        _cache = ResultCache.ResultCache(cacheDir)
+
+    return _cache
+
+def runJob(job):
+    """
+    Run a single BatchJob: image analysis, naming, plotting and output.
+
+    Runs in a worker process. Never raises: returns a tuple
+    (index, success, message, nBalls, elapsed, reviewBins) describing the
+    outcome, where "reviewBins" lists the balls to check by hand (see
+    autobga_core.get_review_bins()).
+    """
+    with Instrumentation.span("job #%d" % job.index, "job", image = os.path.basename(job.filename)):
+        result = _runJob(job)
+
+    Instrumentation.write_trace()
+    return result
+
+def _runJob(job):
+    startTime = time.time()
+
+    try:
+        error = autobga_core.validate_job(job.job)
+        if error:
+            fieldName, errorMessage = error
+            return (job.index, False, errorMessage, 0, time.time() - startTime, [])
+
+        pipeline = autobga_core.FootprintPipeline(getCache(job.cacheDir))
+        result = pipeline.run(job.job, plot = False, loadImage = False)
+        if not result.success:
+            return (job.index, False, result.errorMessage, 0, time.time() - startTime, [])
+
+        pipeline.savePlot(job.job, result.resultList, result.pinA1Point, job.outFilename)
+    except Exception, e:
+        return (job.index, False, "%s: %s" % (e.__class__.__name__, str(e)), 0, time.time() - startTime, [])
+
+    return (job.index, True, job.outFilename, len(result.resultList), time.time() - startTime, result.reviewBins)
+
+def logResult(result, jobsByIndex, log):
+    """
+    Log the outcome of a job from its (index, success, message, nBalls,
+    elapsed, reviewBins) "result" tuple, with the balls to review.
+    """
+    index, success, message, nBalls, elapsed, reviewBins = result
+    inName = os.path.basename(jobsByIndex[index].filename)
+    if success:
+        log.write("OK    #%d %s -> %s (%d balls, %.3f s)\n" % (index, inName, message, nBalls, elapsed))
+        if reviewBins:
+            log.write("      review: %s\n" % ", ".join(["%s (%.2f)" % (padName, confidence)
+                                                     for padName, xIdx, yIdx, confidence in reviewBins]))
+    else:
+        log.write("FAIL  #%d %s: %s (%.3f s)\n" % (index, inName, message, elapsed))
+
+def runBatch(jobs, nProcesses = None, log = sys.stdout):
+    """
+    Run all "jobs" on a pool of "nProcesses" worker processes (default:
+    one per core). Results are logged as they complete.
+
+    Returns a list of (index, success, message, nBalls, elapsed, reviewBins)
+    tuples, in job order.
+    """
+    jobsByIndex = dict((job.index, job) for job in jobs)
+    results = []
+
+    pool = multiprocessing.Pool(nProcesses)
+    try:
+        for result in pool.imap_unordered(runJob, jobs):
+            logResult(result, jobsByIndex, log)
+            results.append(result)
+        pool.close()
+    except KeyboardInterrupt:
+        pool.terminate()
+        raise
+    pool.join()
+
+    results.sort()
+    return results
+
+def runLibraryJob(job):
+    """
+    Run a single BatchJob as a member of a library: image analysis, naming
+    and plotting of the footprint, without the library's header and footer.
+
+    Runs in a worker process. Never raises: returns a tuple
+    (index, success, message, nBalls, elapsed, reviewBins, output) where
+    "output" is the footprint's plot data (empty on failure).
+    """
+    with Instrumentation.span("job #%d" % job.index, "job", image = os.path.basename(job.filename)):
+        result = _runLibraryJob(job)
+
+    Instrumentation.write_trace()
+    return result
+
+def _runLibraryJob(job):
+    startTime = time.time()
+
+    try:
+        error = autobga_core.validate_job(job.job)
+        if error:
+            fieldName, errorMessage = error
+            return (job.index, False, errorMessage, 0, time.time() - startTime, [], "")
+
+        output = StringIO.StringIO()
+        result = autobga_core.plot_library_member(job.job, output, getCache(job.cacheDir))
+        if not result.success:
+            return (job.index, False, result.errorMessage, 0, time.time() - startTime, [], "")
+    except Exception, e:
+        return (job.index, False, "%s: %s" % (e.__class__.__name__, str(e)), 0, time.time() - startTime, [], "")
+
+    return (job.index, True, job.job.footprintName, len(result.resultList), time.time() - startTime, result.reviewBins,
+            output.getvalue())
+
+def runLibrary(jobs, libraryFilename, outputFormat, nProcesses = None, log = sys.stdout):
+    """
+    Run all "jobs" on a pool of "nProcesses" worker processes (default:
+    one per core) and write the footprints to a single library file
+    "libraryFilename" in "outputFormat", in job order.
+
+    Footprints are written as soon as all previous ones are done, and only
+    a few jobs are queued ahead of the one being written, so the library
+    is never held in memory. Failed jobs are left out of the library.
+    The footprint names of "jobs" must be set and unique (see
+    checkFootprintNames(), run by readManifest() for libraries).
+
+    Returns a list of (index, success, message, nBalls, elapsed, reviewBins)
+    tuples, in job order. Throws a RuntimeError if "outputFormat" does not support
+    libraries.
+    """
+    if not nProcesses:
+        nProcesses = multiprocessing.cpu_count()
+    maxPending = 2 * nProcesses
+
+    for job in jobs:
+        job.job.outputFormat = outputFormat
+
+    jobsByIndex = dict((job.index, job) for job in jobs)
+    results = []
+    libraryFile = open(libraryFilename, "w+")
+    try:
+        autobga_core.write_library_header(outputFormat, libraryFile)
+
+        pool = multiprocessing.Pool(nProcesses)
+        try:
+            pending = collections.deque()
+            for job in jobs:
+                pending.append(pool.apply_async(runLibraryJob, (job,)))
+                if len(pending) >= maxPending:
+                    results.append(_writeLibraryMember(pending.popleft().get(), libraryFile, jobsByIndex, log))
+
+            while pending:
+                results.append(_writeLibraryMember(pending.popleft().get(), libraryFile, jobsByIndex, log))
+            pool.close()
+        except KeyboardInterrupt:
+            pool.terminate()
+            raise
+        pool.join()
+
+        autobga_core.write_library_footer(outputFormat, libraryFile)
+    finally:
+        libraryFile.close()
+
+    return results
+
+def _writeLibraryMember(result, libraryFile, jobsByIndex, log):
+    """
+    Write the output of a runLibraryJob() "result" to "libraryFile" and log
+    the outcome. Returns the result without its output.
+    """
+    index, success, message, nBalls, elapsed, reviewBins, output = result
+    if success:
+        libraryFile.write(output)
+    result = (index, success, message, nBalls, elapsed, reviewBins)
+    logResult(result, jobsByIndex, log)
+
+    return result
+
+def main(argv):
+    parser = optparse.OptionParser(usage = "%prog [options] manifest.(csv|json)", version = "%prog " + VERSION)
+    parser.add_option("-o", "--output-dir", dest = "outputDir", default = ".",
+                      help = "directory for output files (default: current directory)")
+    parser.add_option("-j", "--jobs", dest = "nProcesses", type = "int", default = None,
+                      help = "number of worker processes (default: number of cores)")
+    parser.add_option("-l", "--library", dest = "libraryFilename", default = None,
+                      help = "write all footprints to a single library file (.xml or .scr)")
+    parser.add_option("-c", "--cache-dir", dest = "cacheDir", default = None,
+                      help = "directory for the image analysis results cache (default: no cache)")
+    parser.add_option("--trace", dest = "traceFilename", default = None,
+                      help = "write a JSON timing trace (Chrome about:tracing format) of the processing")
+    parser.add_option("--profile-dir", dest = "profileDir", default = None,
+                      help = "write cProfile data of every pipeline stage in this directory")
+    (options, args) = parser.parse_args(argv)
+
+    if len(args) != 1:
+        parser.error("exactly one manifest file is needed")
+
+    if options.libraryFilename:
+        extension = os.path.splitext(options.libraryFilename)[1].lower()
+        libraryFormats = [outputFormat for outputFormat, formatExtension in autobga_core.fileFormatExtensions.items()
+                          if formatExtension == extension and outputFormat != "TSV (Excel)"]
+        if not libraryFormats:
+            parser.error("library filename must end with .xml or .scr")
+    elif not os.path.isdir(options.outputDir):
+        os.makedirs(options.outputDir)
+
+    # Enable instrumentation before starting worker processes, so they inherit it
+    Instrumentation.enable(options.traceFilename, options.profileDir)
+
+    jobs, manifestErrors = readManifest(args[0], options.outputDir, options.cacheDir, bool(options.libraryFilename))
+    for index, message in manifestErrors:
+        sys.stdout.write("FAIL  #%d: invalid manifest row: %s\n" % (index, message))
+
+    startTime = time.time()
+    if options.libraryFilename:
+        results = runLibrary(jobs, options.libraryFilename, libraryFormats[0], options.nProcesses)
+    else:
+        results = runBatch(jobs, options.nProcesses)
+    elapsed = time.time() - startTime
+
+    nFailed = len(manifestErrors) + len([result for result in results if not result[1]])
+    nJobs = len(manifestErrors) + len(results)
+    sys.stdout.write("%d jobs, %d succeeded, %d failed in %.3f s\n" % (nJobs, nJobs - nFailed, nFailed, elapsed))
+
+    if options.traceFilename:
+        Instrumentation.write_trace()
+        sys.stdout.write("Trace written to %s\n" % options.traceFilename)
+
+    return (nFailed == 0) and 0 or 1
+
+if __name__ == "__main__":
+    multiprocessing.freeze_support()
+    sys.exit(main(sys.argv[1:]))
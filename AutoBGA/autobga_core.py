@@ -0,0 +1,677 @@
+"""
+AutoBGA processing core
+
+Created on: Oct 18, 2026
+Author: Tennessee Carmel-Veilleux (tcv -at- ro.boto.ca)
+Revision: $Rev$
+
+Copyright 2026 Tennessee Carmel-Veilleux
+
+Description:
+GUI-independent processing pipeline of AutoBGA: image analysis, pad
+naming, ball positions and plotting in the output formats. This module
+does not import wx, so it can be used by the batch front-end, servers
+and worker processes with a fast startup.
+
+A footprint is described by a FootprintJob and run_job() runs the whole
+pipeline on it. The individual stages are also available for front-ends
+that need to rerun only part of the pipeline (ie: the GUI, when a ball
+is toggled by the user).
+
+License:
+Copyright (c) 2026, Tennessee Carmel-Veilleux
+All rights reserved.
+
+Redistribution and use in source and binary forms, with or without
+modification, are permitted provided that the following conditions are
+met:
+
+    * Redistributions of source code must retain the above copyright
+notice, this list of conditions and the following disclaimer.
+    * Redistributions in binary form must reproduce the above
+copyright notice, this list of conditions and the following disclaimer
+in the documentation and/or other materials provided with the
+distribution.
+    * Neither the name of SONIA AUV nor the names of its contributors
+may be used to endorse or promote products derived from this software
+without specific prior written permission.
+
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+"AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+(INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+"""
+import os
+import threading
+import time
+import numpy
+from numpy import count_nonzero
+import GridLoader
+import GridUtils
+import Instrumentation
+import BgaPadNameGenerator
+import EagleBgaPlotter
+import TSVBgaPlotter
+import XMLBgaPlotter
+from BallArray import BallArray
+
+VERSION = "1.2"
+
+# Output formats and their file extension
+fileFormatExtensions = {"EAGLE SCR" : ".scr", "XML" : ".xml", "TSV (Excel)" : ".tsv"}
+
+# Valid (min, max) range of numeric job parameters
+fieldRanges = {"width" : (1, 200),
+               "height" : (1, 200),
+               "packageWidth" : (0.5, 100.0),
+               "packageHeight" : (0.5, 100.0),
+               "pitch" : (0.1, 2.0),
+               "padDiameter" : (0.05, 2.0)}
+
+class FootprintJob:
+    # Job fields and their default values
+    fields = (("width", 0),
+              ("height", 0),
+              ("packageWidth", 0.0),
+              ("packageHeight", 0.0),
+              ("pitch", 0.0),
+              ("padDiameter", 0.0),
+              ("pinA1Corner", "SE"),
+              ("pictureView", "Bottom"),
+              ("outputFormat", "EAGLE SCR"),
+              ("inFilename", ""),
+              ("footprintName", ""),
+              ("analysisEngine", "bins"))
+
+    def __init__(self, **kwargs):
+        """
+        Description of a footprint to generate. All fields are keyword
+        arguments, with the same names (and meaning) as the GUI's fields:
+        * width, height: number of balls on X and Y axis
+        * packageWidth, packageHeight: package body size (mm)
+        * pitch: ball pitch (mm)
+        * padDiameter: pad diameter (mm)
+        * pinA1Corner: pin A1 corner ("NW", "NE", "SW", "SE")
+        * pictureView: "Top" or "Bottom" view of the input image
+        * outputFormat: one of the keys of fileFormatExtensions
+        * inFilename: input image filename
+        * footprintName: name of the footprint/package, for the formats
+          that name it (default: "bga_<width>_<height>")
+        * analysisEngine: image analysis engine, one of GridLoader.ENGINES
+
+        Raises TypeError for unknown fields.
+        """
+        for name, default in self.fields:
+            setattr(self, name, kwargs.pop(name, default))
+
+        if kwargs:
+            raise TypeError("Unknown FootprintJob field(s): %s" % ", ".join(sorted(kwargs.keys())))
+
+    def asDict(self):
+        """
+        Returns the job fields as a new dict, in the "localValues" format
+        expected by the plotters.
+        """
+        return dict((name, getattr(self, name)) for name, default in self.fields)
+
+    def __repr__(self):
+        return "FootprintJob(%s)" % ", ".join(["%s=%r" % (name, getattr(self, name)) for name, default in self.fields])
+
+class FootprintResult:
+    def __init__(self, success, errorMessage = ""):
+        """
+        Results of run_job(). When "success" is False, "errorMessage"
+        describes the problem and the other attributes are None.
+        """
+        self.success = success
+        self.errorMessage = errorMessage
+
+        # Analysis stage
+        self.bgaArray = None
+        self.sourceImage = None
+        self.confidence = None
+
+        # Naming and geometry stage
+        self.resultList = None
+        self.padNames = None
+        self.flippedGrid = None
+        self.pinA1Point = None
+
+        # Bins to review by hand (see get_review_bins())
+        self.reviewBins = None
+
+        # Plotting stage
+        self.output = None
+
+        # Duration (s) of each stage of the FootprintPipeline
+        self.timings = {}
+
+def validate_job(job):
+    """
+    Validate that all parameters of "job" are within valid ranges.
+
+    Returns None if the job is valid, otherwise a (fieldName, message)
+    tuple describing the first problem found.
+    """
+    for name, default in job.fields:
+        if name in fieldRanges:
+            minValue, maxValue = fieldRanges[name]
+            value = getattr(job, name)
+            if value < minValue or value > maxValue:
+                return (name, "Value of field '%s' must be between %s and %s !" % (name, minValue, maxValue))
+
+    error = get_dimensions_error(job)
+    if error:
+        return error
+
+    if job.pinA1Corner.upper() not in ("NW", "NE", "SW", "SE"):
+        return ("pinA1Corner", "Unknown corner designator: '%s'" % job.pinA1Corner)
+
+    if job.outputFormat not in fileFormatExtensions:
+        return ("outputFormat", "Unknown output format: '%s'" % job.outputFormat)
+
+    if job.analysisEngine not in GridLoader.GridLoader.ENGINES:
+        return ("analysisEngine", "Unknown analysis engine: '%s'" % job.analysisEngine)
+
+    return None
+
+def get_dimensions_error(job):
+    """
+    Make sure package dimensions are not too small compared to
+    ball array size.
+
+    Returns None if they are fine, otherwise a (fieldName, message) tuple.
+    """
+    minPackageWidth = job.width * job.pitch
+    minPackageHeight = job.height * job.pitch
+
+    if job.packageWidth < minPackageWidth:
+        return ("packageWidth", "Value of field Width (A) must be at least %.3f mm,\notherwise package outline will overlap balls." % (minPackageWidth))
+
+    if job.packageHeight < minPackageHeight:
+        return ("packageHeight", "Value of field Height (B) must be at least %.3f mm,\notherwise package outline will overlap balls." % (minPackageHeight))
+
+    return None
+
+def get_ball_position(x, y, width, height, pitch):
+    """
+    Ball position generator.
+
+    Determine the (x, y) position of a ball (in mm) from an
+    x,y ball index (0...width-1, 0...height-1) and the pad
+    pitch.
+
+    Returns (x,y), a ball position center point.
+    """
+    minX, minY = _get_first_ball_position(width, height, pitch)
+
+    xPos = (minX + (float(x) * pitch))
+    yPos = (minY - (float(y) * pitch))
+    return (xPos, yPos)
+
+def get_ball_positions(width, height, pitch):
+    """
+    Vectorized ball position generator.
+
+    Returns (xPos, yPos), two (height, width) arrays holding the
+    position (in mm) of every ball of the array, indexed [y, x], with
+    the same values as get_ball_position().
+    """
+    minX, minY = _get_first_ball_position(width, height, pitch)
+
+    xIdx, yIdx = numpy.meshgrid(numpy.arange(width, dtype = numpy.float64), numpy.arange(height, dtype = numpy.float64))
+    xPos = minX + (xIdx * pitch)
+    yPos = minY - (yIdx * pitch)
+    return (xPos, yPos)
+
+def _get_first_ball_position(width, height, pitch):
+    """
+    Returns the (x, y) position (in mm) of the NW ball of a ball array
+    of "width" x "height" balls centered on the origin.
+    """
+    # The array spans (n - 1) pitches on each axis, whatever the parity of n
+    minX = -(float(width - 1) / 2.0) * pitch
+    minY = (float(height - 1) / 2.0) * pitch
+    return (minX, minY)
+
+def analyze_image(job, progressCallback = None, cancelEvent = None, cache = None, loadImage = True):
+    """
+    Analysis stage: extract the grid of balls from the job's input image.
+
+    "progressCallback" and "cancelEvent" are passed to the GridLoader, to
+    follow progress and cancel the analysis from another thread. If "cache"
+    (a ResultCache) is given, the analysis is skipped when the same image
+    was already analyzed with the same number of balls.
+
+    Returns a (success, errorMessage, bgaArray, sourceImage, confidence)
+    tuple, as GridLoader.process() does. sourceImage is None if the analysis was found
+    in the cache and "loadImage" is False.
+    """
+    gridLoader = GridLoader.GridLoader(job.width, job.height, job.inFilename, progressCallback, cancelEvent, cache,
+                                       engine = job.analysisEngine)
+    return gridLoader.process(loadImage)
+
+def process_grid(job, grid):
+    """
+    Naming and geometry stage: get the processed grid ready for
+    further output.
+
+    Returns a (resultList, padNames, flippedGrid, pinA1Point) tuple where
+    resultList is the BallArray of the processed grid items with all
+    ball names, positions and diameters, in row-major order, padNames is the [x][y] array of pad names,
+    flippedGrid is the ball array as seen from the top and pinA1Point is
+    the position of pin A1, even if that ball is absent.
+    """
+    # Generate pad names now
+    nameGenerator = BgaPadNameGenerator.BgaPadNameGenerator(grid.shape[1], grid.shape[0], job.pinA1Corner)
+    padNames = nameGenerator.generatePadNames()
+
+    flippedGrid = get_flipped_grid(job, grid)
+
+    # Positions and names of all grid cells, indexed [y, x]
+    height, width = grid.shape
+    xPos, yPos = get_ball_positions(width, height, job.pitch)
+    names = padNames.T
+
+    # Save pin A1 position even if it does not exist, for corner line drawing
+    a1Idx = numpy.nonzero(numpy.char.upper(names) == "A1")
+    if len(a1Idx[0]):
+        pinA1Point = (float(xPos[a1Idx][0]), float(yPos[a1Idx][0]))
+    else:
+        pinA1Point = (0.0, 0.0)
+
+    # Create list of pads to be drawn based on positions detected in grid
+    mask = flippedGrid.astype(bool)
+    resultList = BallArray(names[mask], xPos[mask], yPos[mask], job.padDiameter)
+
+    return (resultList, padNames, flippedGrid, pinA1Point)
+
+def get_flipped_grid(job, grid):
+    """
+    Returns the detected "grid" as seen from the top: mirrored along the
+    vertical axis (flipped horizontally) if the picture was a bottom view.
+    The result is a view of "grid", so it follows changes made to "grid".
+    """
+    if job.pictureView.upper() == "BOTTOM":
+        return grid[:,::-1]
+    else:
+        return grid
+
+def toggle_ball(job, grid, padNames, resultList, xIdx, yIdx):
+    """
+    Toggle the ball at (xIdx, yIdx) of the detected "grid" (in the input
+    image's orientation) in place, and patch the "resultList" obtained
+    from process_grid() accordingly, instead of processing the whole grid
+    again.
+
+    Returns (resultList, flippedX, isPresent): the patched ball list, the
+    column of the ball in the flipped grid (as seen from the top) and its
+    new state. The BallArray given as "resultList" is not modified.
+    """
+    height, width = grid.shape
+    grid[yIdx, xIdx] = not grid[yIdx, xIdx]
+    isPresent = bool(grid[yIdx, xIdx])
+
+    flippedGrid = get_flipped_grid(job, grid)
+    if flippedGrid is grid:
+        flippedX = xIdx
+    else:
+        flippedX = (width - 1) - xIdx
+
+    # Balls are listed in row-major order of the flipped grid: find the
+    # position of the toggled ball among the balls present
+    listIdx = int(count_nonzero(flippedGrid[:yIdx, :])) + int(count_nonzero(flippedGrid[yIdx, :flippedX]))
+
+    if isPresent:
+        xPos, yPos = get_ball_position(flippedX, yIdx, width, height, job.pitch)
+        resultList = resultList.inserted(listIdx, padNames[flippedX][yIdx], xPos, yPos, job.padDiameter)
+    else:
+        resultList = resultList.deleted(listIdx)
+
+    return (resultList, flippedX, isPresent)
+
+def get_review_bins(job, confidence, padNames):
+    """
+    Get the balls whose detection is the most doubtful, from the
+    "confidence" array of the analysis stage and the "padNames" of the
+    naming stage, so that only those need to be checked by hand (see
+    GridUtils.get_ambiguous_bins()).
+
+    Returns a list of (padName, xIdx, yIdx, confidence) tuples, least
+    confident first, where (xIdx, yIdx) is the bin in the input image's
+    orientation, as for toggle_ball().
+    """
+    height, width = confidence.shape
+    reviewBins = []
+    for xIdx, yIdx, binConfidence in GridUtils.get_ambiguous_bins(confidence):
+        if job.pictureView.upper() == "BOTTOM":
+            flippedX = (width - 1) - xIdx
+        else:
+            flippedX = xIdx
+        reviewBins.append((padNames[flippedX][yIdx], xIdx, yIdx, binConfidence))
+
+    return reviewBins
+
+def get_plotter_class(outputFormat):
+    """
+    Returns the BgaPlotter class for "outputFormat".
+    """
+    if outputFormat == "EAGLE SCR":
+        return EagleBgaPlotter.EagleBgaPlotter
+    elif outputFormat == "XML":
+        return XMLBgaPlotter.XMLBgaPlotter
+    elif outputFormat == "TSV (Excel)":
+        return TSVBgaPlotter.TSVBgaPlotter
+    else:
+        raise RuntimeError("Unknown output format '%s'" % outputFormat)
+
+def get_plotter(job, resultList, pinA1Point):
+    """
+    Returns the BgaPlotter for the job's output format.
+    """
+    localValues = job.asDict()
+    localValues["pinA1Point"] = pinA1Point
+
+    plotterClass = get_plotter_class(job.outputFormat)
+    if plotterClass is XMLBgaPlotter.XMLBgaPlotter:
+        return plotterClass(resultList, localValues, VERSION)
+    else:
+        return plotterClass(resultList, localValues)
+
+def plot_grid(job, resultList, pinA1Point):
+    """
+    Plotting stage: generate plot data in the job's output format.
+
+    Returns the plotted data string. Throws a RuntimeError if something
+    fishy happens during plotting. Use write_plot() or save_plot() to
+    avoid holding the whole output in memory.
+    """
+    resultString = get_plotter(job, resultList, pinA1Point).process()
+    if not resultString:
+        raise RuntimeError("No %s data generated" % job.outputFormat)
+
+    return resultString
+
+def write_plot(job, resultList, pinA1Point, stream):
+    """
+    Plotting stage: write plot data in the job's output format to
+    file-like "stream", as it is generated.
+
+    Returns the number of lines written. Throws a RuntimeError if something
+    fishy happens during plotting.
+    """
+    nLines = get_plotter(job, resultList, pinA1Point).plot(stream)
+    if not nLines:
+        raise RuntimeError("No %s data generated" % job.outputFormat)
+
+    return nLines
+
+def save_plot(job, resultList, pinA1Point, filename):
+    """
+    Plotting stage: write plot data in the job's output format to
+    file "filename".
+
+    Throws an IOError if the file cannot be written and a RuntimeError
+    if something fishy happens during plotting.
+    """
+    outFile = open(filename, "w+")
+    try:
+        write_plot(job, resultList, pinA1Point, outFile)
+    finally:
+        outFile.close()
+
+def write_library_header(outputFormat, stream):
+    """
+    Write the header of a library of footprints in "outputFormat" to
+    file-like "stream". Footprints are then added with plot_library_member()
+    and the library is closed with write_library_footer().
+
+    Throws a RuntimeError if the format does not support libraries.
+    """
+    get_plotter_class(outputFormat).write_library_header(stream, VERSION)
+
+def write_library_footer(outputFormat, stream):
+    """
+    Write the footer of a library of footprints in "outputFormat" to
+    file-like "stream".
+    """
+    get_plotter_class(outputFormat).write_library_footer(stream)
+
+def plot_library_member(job, stream, cache = None):
+    """
+    Run the whole pipeline on FootprintJob "job" and write the footprint
+    to file-like "stream", as a member of a library (see
+    write_library_header()). The analysis results are looked-up in
+    "cache", if given.
+
+    Returns a FootprintResult. Analysis problems are reported through the
+    result, but plotting problems raise a RuntimeError.
+    """
+    result = run_job(job, plot = False, cache = cache, loadImage = False)
+    if result.success:
+        get_plotter(job, result.resultList, result.pinA1Point).plot(stream, True)
+
+    return result
+
+def run_job(job, bgaArray = None, plot = True, cache = None, loadImage = True):
+    """
+    Run the whole pipeline on FootprintJob "job": image analysis, naming
+    and geometry, and plotting (if "plot" is True).
+
+    If "bgaArray" is given, it is used instead of analyzing the image (ie:
+    after the user edited the detected array). Otherwise, "cache" and
+    "loadImage" are passed to analyze_image().
+
+    Returns a FootprintResult. Analysis problems are reported through the
+    result, but plotting problems raise a RuntimeError.
+    """
+    return FootprintPipeline(cache).run(job, bgaArray, plot, loadImage)
+
+class FootprintPipeline:
+    # Pipeline stages, in order
+    stages = ("analysis", "geometry", "plotting")
+
+    def __init__(self, cache = None):
+        """
+        Staged processing pipeline: analysis -> naming/geometry -> plotting.
+
+        Each stage remembers the inputs and result of its last run, and
+        returns that result again without any processing when called with
+        the same inputs. Changing only the output format reruns the plotter
+        only, and changing the pitch, pad size, corner or view also reruns
+        the naming/geometry stage, but not the image analysis. Analysis
+        results are also looked-up in ResultCache "cache", if given.
+
+        After every stage, timings[stage] holds its duration (s) and
+        cached[stage] tells if the result was remembered. The methods may
+        be called from any thread.
+        """
+        self.cache = cache
+        self.timings = dict((stage, None) for stage in self.stages)
+        self.cached = dict((stage, False) for stage in self.stages)
+        self._lastRuns = {}
+        self._lock = threading.Lock()
+
+    def analyze(self, job, progressCallback = None, cancelEvent = None, loadImage = True):
+        """
+        Analysis stage, remembered on the input file (name, size and
+        modification time), the number of balls and the analysis engine. See analyze_image()
+        for the parameters and return value. The returned bgaArray can be
+        modified by the caller.
+        """
+        startTime = time.time()
+        try:
+            fileStat = os.stat(job.inFilename)
+            key = (os.path.abspath(job.inFilename), fileStat.st_size, fileStat.st_mtime, job.width, job.height,
+                   job.analysisEngine)
+        except OSError:
+            key = None
+
+        lastRun = self._getLastRun("analysis", key)
+        if lastRun is not None and (lastRun[3] is not None or not loadImage):
+            (success, errorMessage, bgaArray, sourceImage, confidence) = lastRun
+            self._setTiming("analysis", startTime, True)
+            return (success, errorMessage, bgaArray.copy(), sourceImage, confidence)
+
+        with Instrumentation.span("analysis", "stage", True, image = os.path.basename(job.inFilename)):
+            result = analyze_image(job, progressCallback, cancelEvent, self.cache, loadImage)
+        (success, errorMessage, bgaArray, sourceImage, confidence) = result
+        if success and key is not None:
+            self._setLastRun("analysis", key, (success, errorMessage, bgaArray.copy(), sourceImage, confidence))
+        self._setTiming("analysis", startTime, False)
+
+        return result
+
+    def processGrid(self, job, grid):
+        """
+        Naming and geometry stage, remembered on the job's geometry and the
+        contents of "grid". See process_grid() for the return value.
+        """
+        startTime = time.time()
+        key = self._getGeometryKey(job, grid)
+
+        lastRun = self._getLastRun("geometry", key)
+        if lastRun is not None:
+            (resultList, padNames, flippedGrid, pinA1Point) = lastRun
+            self._setTiming("geometry", startTime, True)
+
+            # The flipped grid must be a view of the caller's grid
+            return (resultList, padNames, get_flipped_grid(job, grid), pinA1Point)
+
+        with Instrumentation.span("geometry", "stage", True, balls = grid.size):
+            result = process_grid(job, grid)
+        self._setLastRun("geometry", key, result)
+        self._setTiming("geometry", startTime, False)
+
+        return result
+
+    def toggleBall(self, job, grid, padNames, resultList, xIdx, yIdx):
+        """
+        Toggle a ball with toggle_ball() (same parameters and return value),
+        remembering the patched ball list for the new contents of "grid".
+        """
+        startTime = time.time()
+        lastRun = self._getLastRun("geometry", self._getGeometryKey(job, grid))
+        with Instrumentation.span("toggle ball", "stage"):
+            (resultList, flippedX, isPresent) = toggle_ball(job, grid, padNames, resultList, xIdx, yIdx)
+
+        if lastRun is not None:
+            (oldResultList, padNames, flippedGrid, pinA1Point) = lastRun
+            self._setLastRun("geometry", self._getGeometryKey(job, grid), (resultList, padNames, flippedGrid, pinA1Point))
+        self._setTiming("geometry", startTime, False)
+
+        return (resultList, flippedX, isPresent)
+
+    def plotGrid(self, job, resultList, pinA1Point):
+        """
+        Plotting stage returning the plotted data string, remembered on the
+        ball list and the job's plotting parameters. See plot_grid().
+        """
+        startTime = time.time()
+        key = (id(resultList), pinA1Point, job.outputFormat, job.packageWidth, job.packageHeight,
+               job.padDiameter, job.pinA1Corner, job.footprintName, job.width, job.height, job.pitch)
+
+        lastRun = self._getLastRun("plotting", key)
+        if lastRun is not None and lastRun[0] is resultList:
+            self._setTiming("plotting", startTime, True)
+            return lastRun[1]
+
+        with Instrumentation.span("plotting", "stage", True, format = job.outputFormat):
+            output = plot_grid(job, resultList, pinA1Point)
+        self._setLastRun("plotting", key, (resultList, output))
+        self._setTiming("plotting", startTime, False)
+
+        return output
+
+    def savePlot(self, job, resultList, pinA1Point, filename):
+        """
+        Plotting stage writing to file "filename". See save_plot().
+        """
+        startTime = time.time()
+        with Instrumentation.span("plotting", "stage", True, format = job.outputFormat):
+            save_plot(job, resultList, pinA1Point, filename)
+        self._setTiming("plotting", startTime, False)
+
+    def run(self, job, bgaArray = None, plot = True, loadImage = True):
+        """
+        Run all stages on FootprintJob "job". See run_job() for the
+        parameters and return value. The result's timings are those of
+        this run.
+        """
+        for stage in self.stages:
+            self.timings[stage] = None
+            self.cached[stage] = False
+
+        if bgaArray is None:
+            (success, errorMessage, bgaArray, sourceImage, confidence) = self.analyze(job, loadImage = loadImage)
+            if not success:
+                return FootprintResult(False, errorMessage)
+        else:
+            sourceImage = None
+            confidence = None
+
+        result = FootprintResult(True)
+        result.bgaArray = bgaArray
+        result.sourceImage = sourceImage
+        result.confidence = confidence
+
+        (result.resultList, result.padNames, result.flippedGrid, result.pinA1Point) = self.processGrid(job, bgaArray)
+        if confidence is not None:
+            result.reviewBins = get_review_bins(job, confidence, result.padNames)
+        else:
+            result.reviewBins = []
+
+        if plot:
+            result.output = self.plotGrid(job, result.resultList, result.pinA1Point)
+
+        result.timings = dict(self.timings)
+        return result
+
+    def formatTimings(self):
+        """
+        Returns a short description of the timings of the last run of
+        each stage (ie: "analysis 0.052 s, geometry 0.003 s, plotting
+        (cached)").
+        """
+        descriptions = []
+        for stage in self.stages:
+            if self.timings[stage] is None:
+                continue
+            elif self.cached[stage]:
+                descriptions.append("%s (cached)" % stage)
+            else:
+                descriptions.append("%s %.3f s" % (stage, self.timings[stage]))
+
+        return ", ".join(descriptions)
+
+    def _getGeometryKey(self, job, grid):
+        return (job.pitch, job.padDiameter, job.pinA1Corner.upper(), job.pictureView.upper(),
+                grid.shape, grid.astype(bool).tostring())
+
+    def _getLastRun(self, stage, key):
+        """
+        Returns the result of the last run of "stage" if it had the same
+        "key", or None.
+        """
+        with self._lock:
+            lastRun = self._lastRuns.get(stage)
+
+        if lastRun is not None and key is not None and lastRun[0] == key:
+            return lastRun[1]
+        else:
+            return None
+
+    def _setLastRun(self, stage, key, result):
+        with self._lock:
+            self._lastRuns[stage] = (key, result)
+
+    def _setTiming(self, stage, startTime, isCached):
+        self.timings[stage] = time.time() - startTime
+        self.cached[stage] = isCached
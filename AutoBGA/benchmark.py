@@ -0,0 +1,676 @@
+#!/usr/bin/python
+"""
+AutoBGA benchmarks
+
+Created on: Oct 18, 2026
+Author: Tennessee Carmel-Veilleux (tcv -at- ro.boto.ca)
+Revision: $Rev$
+
+Copyright 2026 Tennessee Carmel-Veilleux
+
+Description:
+Benchmark suite for AutoBGA. The reference BGA images in the sample_bgas
+directory are run through the image analysis (GridLoader) and every
+plotter. Synthetic ball maps (see SyntheticBga) of up to 200 x 200 balls
+are analyzed to measure how processing scales with the array size and
+image resolution, and synthetic images with various ball shapes, lines,
+noise, JPEG artefacts and missing balls patterns are analyzed to check the
+detection accuracy against their ground truth. The connected components
+analysis engine is run on the same sample and accuracy images, and
+compared with the default bin engine for speed and detections.
+
+Throughput (bins/s for the analysis, balls/s for the plotters), peak
+memory usage and detection results are recorded in a JSON results file
+and compared against a stored baseline (benchmark_baseline.json), to
+catch both speed and detection regressions. The exit status is 1 if
+regressions are found. Timings are the median of several runs (--repeat):
+throughput is only compared when both the results and the baseline were
+timed over at least MIN_RATE_REPEAT runs, as single runs are too noisy.
+
+The timings of the vectorized GridLoader.extractBins() are also compared
+with the reference bin-by-bin implementation, and the batch thresholding of
+many bin contents arrays (GridLoader.thresholdBins()) with thresholding
+them one at a time.
+
+Sample image filenames end with "_NX_NY" (ie: "bga1_25_25.png"), which
+gives the size of the ball array to use.
+
+Usage: python benchmark.py [options] [sampleDir]
+
+License:
+Copyright (c) 2026, Tennessee Carmel-Veilleux
+All rights reserved.
+
+Redistribution and use in source and binary forms, with or without
+modification, are permitted provided that the following conditions are
+met:
+
+    * Redistributions of source code must retain the above copyright
+notice, this list of conditions and the following disclaimer.
+    * Redistributions in binary form must reproduce the above
+copyright notice, this list of conditions and the following disclaimer
+in the documentation and/or other materials provided with the
+distribution.
+    * Neither the name of SONIA AUV nor the names of its contributors
+may be used to endorse or promote products derived from this software
+without specific prior written permission.
+
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+"AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+(INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+"""
+import glob
+import hashlib
+import json
+import optparse
+import os
+import re
+import StringIO
+import sys
+import time
+import numpy
+import Image
+from numpy import array_equal, count_nonzero
+import GridLoader
+import GridUtils
+import GridRegistration
+import Instrumentation
+import SyntheticBga
+import Thresholding
+import autobga_core
+
+# Version of the results file format
+RESULTS_VERSION = 1
+
+# Default baseline and results files
+DEFAULT_BASELINE_FILENAME = os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmark_baseline.json")
+DEFAULT_RESULTS_FILENAME = "benchmark_results.json"
+
+# Fraction of the baseline throughput below which a result is a regression
+DEFAULT_TOLERANCE = 0.5
+
+# Default number of runs of each measurement, and the least number of runs
+# for throughput to be compared with the baseline
+DEFAULT_REPEAT = 5
+MIN_RATE_REPEAT = 3
+
+# How the time of the runs of a measurement is summarized (see timeCall())
+TIMING = "median"
+
+# Synthetic scaling run: ball array sizes and image resolutions (pixels per ball)
+SCALING_SIZES = (25, 50, 100, 200)
+SCALING_RESOLUTIONS = (8, 16, 32)
+
+# Largest synthetic image generated, in pixels per side. The largest images
+# exceed GridLoader.MAPPED_IMAGE_PIXELS, to measure memory-mapped loading.
+MAX_SYNTHETIC_PIXELS = 6400
+
+# Number of bin contents arrays thresholded together
+THRESHOLD_BATCH_SIZES = (1, 100, 1000)
+
+# Synthetic accuracy run: ball array size, default resolution and the
+# SyntheticBga parameters of every case
+ACCURACY_SIZE = 30
+ACCURACY_RESOLUTION = 16
+ACCURACY_CASES = (("ring", {}),
+                  ("disc", {"ballShape" : "disc"}),
+                  ("square", {"ballShape" : "square"}),
+                  ("crossed", {"ballShape" : "crossed"}),
+                  ("crosses", {"crosses" : True}),
+                  ("center-lines", {"centerLines" : True}),
+                  ("noise", {"noise" : 40.0}),
+                  ("heavy-noise", {"noise" : 120.0}),
+                  ("jpeg", {"jpegQuality" : 25}),
+                  ("depopulated", {"missingPattern" : "center", "missingFraction" : 0.4}),
+                  ("checker", {"missingPattern" : "checker"}),
+                  ("full", {"missingPattern" : "none"}),
+                  ("low-res", {"pxPerBall" : 6}),
+                  ("high-res", {"pxPerBall" : 40}),
+                  ("offset-crop", {"margins" : (11, -3, 0, 7)}),
+                  ("wide-margins", {"margins" : (40, 25, 40, 25), "centerLines" : True}),
+                  ("disc-high-res", {"ballShape" : "disc", "pxPerBall" : 32}),
+                  ("scan", {"pxPerBall" : 96}))
+
+# Footprint geometry used to exercise the plotters (mm)
+BENCHMARK_PITCH = 0.8
+BENCHMARK_PAD_DIAMETER = 0.4
+
+def getSampleImages(sampleDir):
+    """
+    Returns a sorted list of (filename, nx, ny) tuples for all the
+    sample images found in "sampleDir".
+    """
+    samples = []
+    for filename in sorted(glob.glob(os.path.join(sampleDir, "*.png"))):
+        match = re.search(r"_(\d+)_(\d+)(_\w+)?\.png$", filename)
+        if match:
+            samples.append((filename, int(match.group(1)), int(match.group(2))))
+
+    return samples
+
+def timeCall(function, repeat):
+    """
+    Returns the median wall-clock time, in seconds, of "repeat" calls
+    to "function". The median is not thrown off by a single slow (or
+    lucky) run.
+    """
+    times = []
+    for i in range(repeat):
+        startTime = time.time()
+        function()
+        times.append(time.time() - startTime)
+
+    return float(numpy.median(times))
+
+def benchmarkExtractBins(sampleDir, repeat = 3):
+    """
+    Time GridLoader.extractBins() against the reference bin-by-bin
+    implementation (GridLoader.extractBinsPerBin()) on every sample image
+    and check that both produce the same contents/xSpread/ySpread matrices.
+
+    Returns a list of (basename, nBins, perBinTime, vectorizedTime, isSame)
+    tuples.
+    """
+    results = []
+    for filename, nx, ny in getSampleImages(sampleDir):
+        image = Image.open(filename).convert("L")
+
+        reference = GridLoader.GridLoader(nx, ny, filename)
+        reference.image = image
+        perBinTime = timeCall(reference.extractBinsPerBin, repeat)
+
+        loader = GridLoader.GridLoader(nx, ny, filename)
+        loader.image = image
+        vectorizedTime = timeCall(loader.extractBins, repeat)
+
+        isSame = (array_equal(reference.contents, loader.contents) and
+                  array_equal(reference.xSpread, loader.xSpread) and
+                  array_equal(reference.ySpread, loader.ySpread))
+
+        results.append((os.path.basename(filename), nx * ny, perBinTime, vectorizedTime, isSame))
+
+    return results
+
+def printExtractBinsResults(results):
+    print("%-24s %6s %12s %12s %8s %6s" % ("Image", "Bins", "Per-bin (s)", "Vector (s)", "Speedup", "Same"))
+    for name, nBins, perBinTime, vectorizedTime, isSame in results:
+        print("%-24s %6d %12.4f %12.4f %7.1fx %6s" % (name, nBins, perBinTime, vectorizedTime,
+                                                      perBinTime / vectorizedTime, isSame and "yes" or "NO"))
+
+def getSampleContents(sampleDir):
+    """
+    Returns a list of (contents, binSize) tuples: the bin contents array
+    (see GridLoader.extractBins()) and average (width, height) bin size of
+    every sample image of "sampleDir".
+    """
+    samples = []
+    for filename, nx, ny in getSampleImages(sampleDir):
+        loader = GridLoader.GridLoader(nx, ny, filename)
+        success, errorMessage, bgaArray, image, confidence = loader.process()
+        if not success:
+            raise RuntimeError("Analysis of %s failed: %s" % (filename, errorMessage))
+        xEdges, yEdges = GridUtils.get_bin_edges(image, nx, ny)
+        samples.append((loader.contents, (float(xEdges[-1] - xEdges[0]) / nx, float(yEdges[-1] - yEdges[0]) / ny)))
+
+    return samples
+
+def thresholdPerGrid(contentsList, binSizes):
+    """
+    Threshold the bin contents arrays of "contentsList" one at a time,
+    with the same heuristic as GridLoader.thresholdBins(), using
+    numpy.histogram() and the original iterative mean thresholding loop.
+
+    Returns the list of boolean BGA arrays.
+    """
+    bgaArrays = []
+    for contents, (width, height) in zip(contentsList, binSizes):
+        if width <= 10 or height <= 10:
+            H, edges = numpy.histogram(contents, 64)
+            kStar, varB = Thresholding.otsu_histogram(H)
+            threshold = numpy.round(kStar - 1) / contents.size
+        else:
+            threshold = Thresholding._reference_iterative_mean_threshold(contents)
+        bgaArrays.append(contents >= threshold)
+
+    return bgaArrays
+
+def benchmarkThresholds(sampleDir, repeat = 3):
+    """
+    Time the batch thresholding of THRESHOLD_BATCH_SIZES bin contents
+    arrays (the sample images' contents, repeated) with
+    GridLoader.thresholdBins() against thresholding them one at a time,
+    and check that both produce the same BGA arrays.
+
+    Returns a list of (nGrids, perGridTime, batchTime, isSame) tuples.
+    """
+    samples = getSampleContents(sampleDir)
+    results = []
+    for nGrids in THRESHOLD_BATCH_SIZES:
+        contentsList = [samples[idx % len(samples)][0] for idx in range(nGrids)]
+        binSizes = [samples[idx % len(samples)][1] for idx in range(nGrids)]
+
+        perGrid = []
+        perGridTime = timeCall(lambda: perGrid.append(thresholdPerGrid(contentsList, binSizes)), repeat)
+        batch = []
+        batchTime = timeCall(lambda: batch.append(GridLoader.GridLoader.thresholdBins(contentsList, binSizes)), repeat)
+
+        isSame = all([array_equal(a, b) for a, b in zip(perGrid[-1], batch[-1])])
+        results.append((nGrids, perGridTime, batchTime, isSame))
+
+    return results
+
+def printThresholdResults(results):
+    print("%-24s %12s %12s %8s %6s" % ("Thresholded grids", "Per-grid (s)", "Batch (s)", "Speedup", "Same"))
+    for nGrids, perGridTime, batchTime, isSame in results:
+        print("%-24d %12.4f %12.4f %7.1fx %6s" % (nGrids, perGridTime, batchTime, perGridTime / batchTime, isSame and "yes" or "NO"))
+
+def getFingerprint(bgaArray):
+    """
+    Returns a detection fingerprint of "bgaArray": the SHA-1 digest of its
+    shape and contents. Any change in the detected balls changes it.
+    """
+    bgaArray = numpy.ascontiguousarray(bgaArray, dtype = numpy.uint8)
+    digest = hashlib.sha1("%dx%d:" % bgaArray.shape)
+    digest.update(bgaArray.tostring())
+    return digest.hexdigest()
+
+def getPeakRssKb():
+    """
+    Returns the peak RSS of the benchmark process in kilobytes, or None
+    if it cannot be obtained.
+    """
+    peakRss = Instrumentation.get_peak_rss()
+    if peakRss is None:
+        return None
+    return peakRss / 1024
+
+def timeAnalysis(filename, nx, ny, repeat, engine = "bins"):
+    """
+    Time the full image analysis (GridLoader.process()) of "filename"
+    split in "nx" x "ny" bins, with analysis engine "engine".
+
+    Returns a (medianTime, bgaArray) tuple (see timeCall()). Raises a
+    RuntimeError if the analysis fails.
+    """
+    results = []
+    def analyze():
+        success, errorMessage, bgaArray, image, confidence = GridLoader.GridLoader(nx, ny, filename, engine = engine).process()
+        if not success:
+            raise RuntimeError("Analysis of %s failed: %s" % (filename, errorMessage))
+        results.append(bgaArray)
+
+    medianTime = timeCall(analyze, repeat)
+    return (medianTime, results[-1])
+
+def getRate(count, elapsed):
+    """
+    Returns "count" per second for an "elapsed" time in seconds.
+    """
+    return float(count) / max(elapsed, 1e-9)
+
+def benchmarkPlotters(bgaArray, repeat):
+    """
+    Time the geometry stage and every plotter on a detected "bgaArray".
+
+    Returns a dict of {stage : {"time" : seconds, "ballsPerSecond" : rate}}
+    with the "geometry" stage and one entry per output format.
+    """
+    ny, nx = bgaArray.shape
+    nBalls = max(count_nonzero(bgaArray), 1)
+    baseJob = dict(width = nx, height = ny, packageWidth = (nx + 1) * BENCHMARK_PITCH,
+                   packageHeight = (ny + 1) * BENCHMARK_PITCH, pitch = BENCHMARK_PITCH,
+                   padDiameter = BENCHMARK_PAD_DIAMETER, footprintName = "benchmark")
+
+    job = autobga_core.FootprintJob(**baseJob)
+    results = {}
+    geometry = []
+    elapsed = timeCall(lambda: geometry.append(autobga_core.process_grid(job, bgaArray)), repeat)
+    results["geometry"] = {"time" : elapsed, "ballsPerSecond" : getRate(nBalls, elapsed)}
+    resultList, padNames, flippedGrid, pinA1Point = geometry[-1]
+
+    for outputFormat in sorted(autobga_core.fileFormatExtensions.keys()):
+        job = autobga_core.FootprintJob(outputFormat = outputFormat, **baseJob)
+        elapsed = timeCall(lambda: autobga_core.write_plot(job, resultList, pinA1Point, StringIO.StringIO()), repeat)
+        results[outputFormat] = {"time" : elapsed, "ballsPerSecond" : getRate(nBalls, elapsed)}
+
+    return results
+
+def benchmarkSamples(sampleDir, repeat = 3):
+    """
+    Run every sample image of "sampleDir" through the analysis and every
+    plotter.
+
+    Returns a dict of results keyed on the sample's basename.
+    """
+    results = {}
+    for filename, nx, ny in getSampleImages(sampleDir):
+        analysisTime, bgaArray = timeAnalysis(filename, nx, ny, repeat)
+        results[os.path.basename(filename)] = {"nx" : nx,
+                                               "ny" : ny,
+                                               "bins" : nx * ny,
+                                               "balls" : int(count_nonzero(bgaArray)),
+                                               "fingerprint" : getFingerprint(bgaArray),
+                                               "analysisTime" : analysisTime,
+                                               "binsPerSecond" : getRate(nx * ny, analysisTime),
+                                               "plotters" : benchmarkPlotters(bgaArray, repeat),
+                                               "peakRssKb" : getPeakRssKb()}
+
+    return results
+
+def analyzeSynthetic(synthetic, repeat, inferSize = False, engine = "bins"):
+    """
+    Analyze the image of SyntheticBga "synthetic" with analysis engine
+    "engine" and check the detected balls against its ground truth. If "inferSize" is True, also check
+    that GridRegistration infers the right number of balls from the
+    image alone.
+
+    Returns a dict of results.
+    """
+    filename = GridUtils.get_temp_filename()
+    try:
+        synthetic.save(filename)
+        analysisTime, bgaArray = timeAnalysis(filename, synthetic.nx, synthetic.ny, repeat, engine)
+        if inferSize:
+            grid, periodicity = GridRegistration.register_grid(numpy.asarray(Image.open(filename).convert("L")))
+    finally:
+        os.remove(filename)
+
+    nBins = synthetic.nx * synthetic.ny
+    nErrors = int(count_nonzero(bgaArray != synthetic.groundTruth))
+    results = {"nx" : synthetic.nx,
+               "ny" : synthetic.ny,
+               "pxPerBall" : synthetic.pxPerBall,
+               "bins" : nBins,
+               "pixels" : synthetic.size[0] * synthetic.size[1],
+               "analysisTime" : analysisTime,
+               "binsPerSecond" : getRate(nBins, analysisTime),
+               "errors" : nErrors,
+               "accuracy" : 1.0 - float(nErrors) / nBins,
+               "peakRssKb" : getPeakRssKb()}
+    if inferSize:
+        results["sizeInferred"] = grid is not None and (grid.nx, grid.ny) == (synthetic.nx, synthetic.ny)
+
+    return results
+
+def benchmarkScaling(maxSize = max(SCALING_SIZES), repeat = 1):
+    """
+    Analyze synthetic images of up to "maxSize" x "maxSize" balls at
+    several resolutions, and check the detected balls against the
+    ground truth.
+
+    Returns a dict of results keyed on "<nx>x<ny>@<pxPerBall>".
+    """
+    results = {}
+    for size in SCALING_SIZES:
+        if size > maxSize:
+            continue
+        for pxPerBall in SCALING_RESOLUTIONS:
+            if size * pxPerBall > MAX_SYNTHETIC_PIXELS:
+                continue
+
+            synthetic = SyntheticBga.SyntheticBga(size, size, pxPerBall, seed = size)
+            results["%dx%d@%d" % (size, size, pxPerBall)] = analyzeSynthetic(synthetic, repeat)
+
+    return results
+
+def benchmarkAccuracy(repeat = 1, engine = "bins"):
+    """
+    Analyze synthetic images for every case of ACCURACY_CASES (ball
+    shapes, crosses and lines, noise, JPEG artefacts, missing balls
+    patterns, imprecise crops) with analysis engine "engine", and check
+    the detected balls against the ground truth and the number of balls
+    inferred by GridRegistration.
+
+    Returns a dict of results keyed on the case name.
+    """
+    results = {}
+    for name, parameters in ACCURACY_CASES:
+        parameters = dict(parameters)
+        pxPerBall = parameters.pop("pxPerBall", ACCURACY_RESOLUTION)
+        synthetic = SyntheticBga.SyntheticBga(ACCURACY_SIZE, ACCURACY_SIZE, pxPerBall, **parameters)
+        results[name] = analyzeSynthetic(synthetic, repeat, inferSize = True, engine = engine)
+
+    return results
+
+def benchmarkEngines(sampleDir, repeat = 3):
+    """
+    Analyze every sample image of "sampleDir" with all the analysis
+    engines of GridLoader.ENGINES, and compare their detections with the
+    default "bins" engine.
+
+    Returns a dict of results keyed on the sample's basename, holding a
+    dict of results per engine. The "agreement" of an engine is the
+    fraction of bins detected the same way as the "bins" engine.
+    """
+    results = {}
+    for filename, nx, ny in getSampleImages(sampleDir):
+        sampleResults = {}
+        bgaArrays = {}
+        for engine in GridLoader.GridLoader.ENGINES:
+            analysisTime, bgaArrays[engine] = timeAnalysis(filename, nx, ny, repeat, engine)
+            sampleResults[engine] = {"balls" : int(count_nonzero(bgaArrays[engine])),
+                                     "fingerprint" : getFingerprint(bgaArrays[engine]),
+                                     "analysisTime" : analysisTime,
+                                     "binsPerSecond" : getRate(nx * ny, analysisTime)}
+
+        for engine in GridLoader.GridLoader.ENGINES:
+            nDifferent = int(count_nonzero(bgaArrays[engine] != bgaArrays["bins"]))
+            sampleResults[engine]["agreement"] = 1.0 - float(nDifferent) / (nx * ny)
+        results[os.path.basename(filename)] = sampleResults
+
+    return results
+
+def canCompareRates(results, baseline):
+    """
+    Returns True if the throughput of "results" can be compared with the
+    "baseline": both must be timed the same way (see TIMING) over at least
+    MIN_RATE_REPEAT runs.
+    """
+    for timed in (results, baseline):
+        if timed.get("timing") != TIMING or timed.get("repeat", 1) < MIN_RATE_REPEAT:
+            return False
+
+    return True
+
+def compareResults(results, baseline, tolerance = DEFAULT_TOLERANCE, compareRates = True):
+    """
+    Compare benchmark "results" against a "baseline" obtained the same
+    way. Detection results must be identical (sample fingerprints) or at
+    least as accurate (synthetic images), throughput must not fall below
+    (1 - tolerance) times the baseline and peak memory must not exceed
+    (1 + tolerance) times the baseline. Entries missing from either side
+    are not compared. If "compareRates" is False, throughput is not
+    compared (see canCompareRates()).
+
+    Returns a list of regression description strings, empty if there are
+    no regressions.
+    """
+    regressions = []
+
+    def checkRate(name, value, baseValue):
+        if compareRates and value < baseValue * (1.0 - tolerance):
+            regressions.append("%s: %.0f/s, baseline %.0f/s (%.0f%%)" % (name, value, baseValue, 100.0 * value / baseValue))
+
+    samples = results.get("samples", {})
+    for name, base in sorted(baseline.get("samples", {}).items()):
+        if name not in samples:
+            continue
+        current = samples[name]
+        if current["fingerprint"] != base["fingerprint"]:
+            regressions.append("%s: detection changed (%d balls, baseline %d balls)" % (name, current["balls"], base["balls"]))
+        checkRate("%s analysis bins" % name, current["binsPerSecond"], base["binsPerSecond"])
+        for stage, basePlot in sorted(base["plotters"].items()):
+            if stage in current["plotters"]:
+                checkRate("%s %s balls" % (name, stage), current["plotters"][stage]["ballsPerSecond"], basePlot["ballsPerSecond"])
+
+    engines = results.get("engines", {})
+    for name, baseEngines in sorted(baseline.get("engines", {}).items()):
+        for engine, base in sorted(baseEngines.items()):
+            if engine not in engines.get(name, {}):
+                continue
+            current = engines[name][engine]
+            if current["fingerprint"] != base["fingerprint"]:
+                regressions.append("%s %s engine: detection changed (%d balls, baseline %d balls)" % (name, engine, current["balls"], base["balls"]))
+            checkRate("%s %s engine bins" % (name, engine), current["binsPerSecond"], base["binsPerSecond"])
+
+    for section in ("scaling", "accuracy", "componentsAccuracy"):
+        synthetic = results.get(section, {})
+        for name, base in sorted(baseline.get(section, {}).items()):
+            if name not in synthetic:
+                continue
+            current = synthetic[name]
+            if current["accuracy"] < base["accuracy"]:
+                regressions.append("%s %s: accuracy %.4f, baseline %.4f" % (section, name, current["accuracy"], base["accuracy"]))
+            if base.get("sizeInferred") and not current.get("sizeInferred"):
+                regressions.append("%s %s: number of balls no longer inferred" % (section, name))
+            checkRate("%s %s analysis bins" % (section, name), current["binsPerSecond"], base["binsPerSecond"])
+
+    if results.get("peakRssKb") and baseline.get("peakRssKb"):
+        if results["peakRssKb"] > baseline["peakRssKb"] * (1.0 + tolerance):
+            regressions.append("peak RSS: %d kB, baseline %d kB" % (results["peakRssKb"], baseline["peakRssKb"]))
+
+    return regressions
+
+def printSampleResults(samples):
+    stages = ["geometry"] + sorted(autobga_core.fileFormatExtensions.keys())
+    print("%-24s %6s %6s %12s" % ("Image", "Bins", "Balls", "Bins/s") + "".join([" %12s" % stage[:12] for stage in stages]))
+    for name, result in sorted(samples.items()):
+        line = "%-24s %6d %6d %12.0f" % (name, result["bins"], result["balls"], result["binsPerSecond"])
+        print(line + "".join([" %12.0f" % result["plotters"][stage]["ballsPerSecond"] for stage in stages]))
+    print("(plotter columns in balls/s)")
+
+def printEngineResults(engines):
+    names = GridLoader.GridLoader.ENGINES
+    print("%-24s" % "Engines" + "".join([" %12s %6s %9s" % (engine[:12] + " bins/s", "Balls", "Agreement") for engine in names]))
+    for name, result in sorted(engines.items()):
+        print("%-24s" % name + "".join([" %12.0f %6d %9.4f" % (result[engine]["binsPerSecond"], result[engine]["balls"],
+                                                               result[engine]["agreement"]) for engine in names]))
+
+def printSyntheticResults(synthetic, order):
+    print("%-16s %10s %12s %10s %8s %10s %8s" % ("Synthetic", "Pixels", "Bins/s", "Accuracy", "Errors", "Peak kB", "Size"))
+    for name, result in sorted(synthetic.items(), key = lambda item: order.index(item[0])):
+        sizeInferred = {True : "found", False : "WRONG"}.get(result.get("sizeInferred"), "")
+        print("%-16s %10d %12.0f %10.4f %8d %10s %8s" % (name, result["pixels"], result["binsPerSecond"], result["accuracy"],
+                                                         result["errors"], result["peakRssKb"], sizeInferred))
+
+def main(argv):
+    parser = optparse.OptionParser(usage = "%prog [options] [sampleDir]")
+    parser.add_option("-o", "--output", dest = "outputFilename", default = DEFAULT_RESULTS_FILENAME,
+                      help = "JSON results file (default: %s)" % DEFAULT_RESULTS_FILENAME)
+    parser.add_option("-b", "--baseline", dest = "baselineFilename", default = DEFAULT_BASELINE_FILENAME,
+                      help = "JSON baseline to compare results against (default: benchmark_baseline.json)")
+    parser.add_option("--save-baseline", dest = "saveBaseline", action = "store_true", default = False,
+                      help = "save the results as the new baseline instead of comparing them")
+    parser.add_option("-r", "--repeat", dest = "repeat", type = "int", default = DEFAULT_REPEAT,
+                      help = "number of runs of each measurement, the median time is kept (default: %d)" % DEFAULT_REPEAT)
+    parser.add_option("-t", "--tolerance", dest = "tolerance", type = "float", default = DEFAULT_TOLERANCE,
+                      help = "allowed throughput drop, as a fraction of the baseline (default: %.2f)" % DEFAULT_TOLERANCE)
+    parser.add_option("--max-size", dest = "maxSize", type = "int", default = max(SCALING_SIZES),
+                      help = "largest synthetic ball array size (default: %d)" % max(SCALING_SIZES))
+    parser.add_option("--no-scaling", dest = "scaling", action = "store_false", default = True,
+                      help = "skip the synthetic image scaling run")
+    parser.add_option("--no-accuracy", dest = "accuracy", action = "store_false", default = True,
+                      help = "skip the synthetic image accuracy run")
+    parser.add_option("--no-engines", dest = "engines", action = "store_false", default = True,
+                      help = "skip the comparison of the analysis engines")
+    parser.add_option("--no-extract-bins", dest = "extractBins", action = "store_false", default = True,
+                      help = "skip the comparison with the bin-by-bin extractBins() implementation")
+    parser.add_option("--no-thresholds", dest = "thresholds", action = "store_false", default = True,
+                      help = "skip the comparison of batch and per-grid thresholding")
+    (options, args) = parser.parse_args(argv)
+
+    if len(args) > 1:
+        parser.error("at most one sample directory can be given")
+    elif args:
+        sampleDir = args[0]
+    else:
+        sampleDir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "sample_bgas")
+        
+    if options.saveBaseline and options.repeat < MIN_RATE_REPEAT:
+        parser.error("a baseline needs at least %d runs of each measurement" % MIN_RATE_REPEAT)
+
+    results = {"version" : RESULTS_VERSION,
+               "python" : sys.version.split()[0],
+               "platform" : sys.platform,
+               "repeat" : options.repeat,
+               "timing" : TIMING}
+
+    results["samples"] = benchmarkSamples(sampleDir, options.repeat)
+    printSampleResults(results["samples"])
+
+    if options.scaling:
+        print("")
+        results["scaling"] = benchmarkScaling(options.maxSize, options.repeat)
+        printSyntheticResults(results["scaling"], sorted(results["scaling"].keys(), key = lambda name: (results["scaling"][name]["nx"],
+                                                                                                         results["scaling"][name]["pxPerBall"])))
+
+    if options.accuracy:
+        print("")
+        results["accuracy"] = benchmarkAccuracy(options.repeat)
+        printSyntheticResults(results["accuracy"], [name for name, parameters in ACCURACY_CASES])
+
+    if options.engines:
+        print("")
+        results["engines"] = benchmarkEngines(sampleDir, options.repeat)
+        printEngineResults(results["engines"])
+        if options.accuracy:
+            print("")
+            results["componentsAccuracy"] = benchmarkAccuracy(options.repeat, "components")
+            printSyntheticResults(results["componentsAccuracy"], [name for name, parameters in ACCURACY_CASES])
+
+    results["peakRssKb"] = getPeakRssKb()
+
+    if options.extractBins:
+        print("")
+        printExtractBinsResults(benchmarkExtractBins(sampleDir, options.repeat))
+
+    if options.thresholds:
+        print("")
+        printThresholdResults(benchmarkThresholds(sampleDir, options.repeat))
+
+    if options.saveBaseline:
+        outputFilename = options.baselineFilename
+    else:
+        outputFilename = options.outputFilename
+    outFile = open(outputFilename, "w")
+    try:
+        json.dump(results, outFile, indent = 1, separators = (",", ": "), sort_keys = True)
+    finally:
+        outFile.close()
+    print("\nResults written to %s" % outputFilename)
+
+    if options.saveBaseline or not os.path.exists(options.baselineFilename):
+        return 0
+
+    baselineFile = open(options.baselineFilename, "r")
+    try:
+        baseline = json.load(baselineFile)
+    finally:
+        baselineFile.close()
+
+    compareRates = canCompareRates(results, baseline)
+    if not compareRates:
+        print("\nWarning: throughput not compared, it needs the %s of at least %d runs (results: %s of %d, baseline: %s of %d)"
+              % (TIMING, MIN_RATE_REPEAT, results.get("timing"), results.get("repeat", 1),
+                 baseline.get("timing", "best"), baseline.get("repeat", 1)))
+        
+    regressions = compareResults(results, baseline, options.tolerance, compareRates)
+    if regressions:
+        print("\n%d regression(s) against %s:" % (len(regressions), options.baselineFilename))
+        for regression in regressions:
+            print("  " + regression)
+        return 1
+
+    print("No regressions against %s" % options.baselineFilename)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
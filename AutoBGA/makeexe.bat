@@ -1,2 +1,3 @@
 python setup.py py2exe
-copy /Y dist\autobga.exe .
\ No newline at end of file
+copy /Y dist\autobga.exe .
+copy /Y dist\autobga-batch.exe .
\ No newline at end of file